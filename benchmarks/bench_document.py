@@ -0,0 +1,52 @@
+"""Compare building a message from the post body with building it from a parsed document.
+
+The ``parse`` mode builds every message from the post body like before the
+parsed document existed: bbcode is rendered and all parsers run each time.
+The ``document`` mode builds the message from the post's
+:class:`cs2posts.parser.ParsedDocument` out of a
+:class:`cs2posts.parser.DocumentCache`, like ``create_message`` does, so
+only the first build parses the body. The posts are the ones in
+``tests/data``.
+
+Usage: python -m benchmarks.bench_document [--data tests/data] [--rounds 200]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+from pathlib import Path
+
+from cs2posts.dto.post import Post
+from cs2posts.msg.factory import build_message
+from cs2posts.parser import DocumentCache
+
+SOURCE_URL = 'https://store.steampowered.com/news/app/730'
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', type=Path, default=Path('tests/data'))
+    parser.add_argument('--rounds', type=int, default=200)
+    args = parser.parse_args()
+
+    for filepath in sorted(args.data.glob('*.json')):
+        post = Post.from_dict(json.loads(filepath.read_text(encoding='utf-8')))
+        documents = DocumentCache(maxsize=1)
+        expected = build_message(post, SOURCE_URL).to_dict()
+        assert build_message(post, SOURCE_URL, documents.get(post.gid, post.contents)).to_dict() == expected
+
+        timings = {
+            name: min(timeit.repeat(func, number=args.rounds, repeat=5)) / args.rounds
+            for name, func in (
+                ('parse', lambda: build_message(post, SOURCE_URL)),
+                ('document', lambda: build_message(post, SOURCE_URL, documents.get(post.gid, post.contents))),
+            )
+        }
+        results = ', '.join(f'{name} {seconds * 1e6:8.1f}us' for name, seconds in timings.items())
+        print(f'{filepath.name:>24} {len(post.contents):6d} chars: {results}, '
+              f'{timings["parse"] / timings["document"]:5.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""Compare the per-type ContentExtractor scans with the single tokenizer scan.
+
+The ``per-type`` mode reproduces the old extractor, which scanned the whole
+text once for every content type (twice for images), merged the results by
+sorting on the position and then scanned again for the text blocks. The
+``scan`` mode uses :class:`cs2posts.content.ContentExtractor` as is. The
+input is each post in ``tests/data`` rendered like in the message pipeline
+and repeated to the given size.
+
+Usage: python -m benchmarks.bench_extractor [--data tests/data] [--size 100000] [--rounds 20]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+from pathlib import Path
+
+from cs2posts.content import ContentExtractor
+from cs2posts.content.content import Content
+from cs2posts.content.content import TextBlock
+from cs2posts.content.extractor_carousel import CarouselExtractor
+from cs2posts.content.extractor_image import ImageExtractor
+from cs2posts.content.extractor_video import VideoExtractor
+from cs2posts.content.extractor_youtube import YoutubeExtractor
+from cs2posts.parser import Steam2TelegramHTML
+from cs2posts.parser import SteamListParser
+from cs2posts.parser import SteamNewsTableParser
+
+
+def per_type_text_blocks(text: str, content: list[Content]) -> list[TextBlock]:
+    """The old TextBlockExtractor: the text between the sorted content."""
+    if len(content) == 0:
+        return [TextBlock(0, len(text), False, text)]
+
+    blocks = []
+    text_pos = 0
+    for c in sorted(content, key=lambda c: c.text_pos_start):
+        if c.text_pos_start == 0 or text_pos == c.text_pos_start:
+            text_pos = c.text_pos_end
+            continue
+        block = TextBlock.from_span(text, text_pos, c.text_pos_start)
+        if not block.is_empty():
+            blocks.append(block)
+        text_pos = c.text_pos_end
+    blocks.append(TextBlock.from_span(text, text_pos, len(text)))
+
+    # A clickable image leaves its closing </a> as a block of its own
+    combined = []
+    i = 0
+    while i < len(blocks):
+        left = blocks[i]
+        if i + 1 < len(blocks) and left.endswith('>') and blocks[i + 1].startswith('</a>'):
+            right = blocks[i + 1]
+            block = TextBlock(
+                text_pos_start=left.text_pos_start,
+                text_pos_end=right.text_pos_end,
+                is_heading=left.is_heading)
+            block.extend(left)
+            block.append("\nImage Link")
+            block.extend(right)
+            combined.append(block)
+            i += 2
+            continue
+        combined.append(left)
+        i += 1
+    return combined
+
+
+def per_type_extract(text: str) -> list[Content]:
+    youtube = YoutubeExtractor(text).extract()
+    videos = VideoExtractor(text).extract()
+    carousel = CarouselExtractor(text).extract()
+    images = ImageExtractor(text).extract()
+    if len(carousel) > 0:
+        all_img_urls = {img.url for c in carousel for img in c.images}
+        images = [img for img in images if img.url not in all_img_urls]
+    texts = per_type_text_blocks(text, [*videos, *carousel, *images, *youtube])
+    content: list[Content] = sorted(
+        [*youtube, *videos, *carousel, *images, *texts], key=lambda c: c.text_pos_start)
+    content[0].is_heading = True
+    return content
+
+
+def render(contents: str) -> str:
+    parser = Steam2TelegramHTML(contents)
+    parser.add_parser(parser=SteamListParser, priority=1)
+    parser.add_parser(parser=SteamNewsTableParser, priority=2)
+    return parser.parse()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', type=Path, default=Path('tests/data'))
+    parser.add_argument('--size', type=int, default=100_000)
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    for filepath in sorted(args.data.glob('*.json')):
+        html = render(json.loads(filepath.read_text(encoding='utf-8'))['contents'])
+        text = html * max(args.size // len(html), 1)
+        assert ContentExtractor(text).extract() == per_type_extract(text)
+
+        timings = {
+            name: min(timeit.repeat(lambda: func(text), number=args.rounds, repeat=5)) / args.rounds
+            for name, func in (
+                ('per-type', per_type_extract),
+                ('scan', lambda text: ContentExtractor(text).extract()),
+            )
+        }
+        results = ', '.join(f'{name} {seconds * 1e3:7.2f}ms' for name, seconds in timings.items())
+        print(f'{filepath.name:>24} {len(text):7d} chars: {results}, '
+              f'{timings["per-type"] / timings["scan"]:4.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Compare preparing every content block per chat with replaying a delivery plan.
+
+The ``per-chat`` mode prepares the API calls of every block again for each
+chat, like the news message did before it had a plan: media URLs are
+extracted and looked up, text is split and captions are built. The
+``plan`` mode replays :meth:`cs2posts.msg.CounterStrikeNewsMessage.plan`,
+which is prepared once. The bot does nothing and the media URLs are
+already checked, so only the per chat work of the message is measured.
+The posts are the ones in ``tests/data``.
+
+Usage: python -m benchmarks.bench_plan [--data tests/data] [--chats 1000]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+from cs2posts.dto.post import Post
+from cs2posts.msg import CounterStrikeNewsMessage
+from cs2posts.msg.plan import ApiCall
+
+SOURCE_URL = 'https://store.steampowered.com/news/app/730'
+
+
+class NullBot:
+    """Accepts every API call and sends nothing."""
+
+    calls = 0
+
+    def __getattr__(self, name: str) -> Any:
+        async def call(**kwargs: Any) -> None:
+            self.calls += 1
+        return call
+
+
+async def send(calls: list[ApiCall] | tuple[ApiCall, ...], bot: NullBot, chat_id: int) -> None:
+    for call in calls:
+        await call.send(bot, chat_id)
+
+
+async def per_chat(msg: CounterStrikeNewsMessage, bot: NullBot, chats: int) -> None:
+    for chat_id in range(chats):
+        for content in msg.content:
+            await send(await msg.plan_content(content), bot, chat_id)
+
+
+async def replay_plan(msg: CounterStrikeNewsMessage, bot: NullBot, chats: int) -> None:
+    plan = await msg.plan()
+    for chat_id in range(chats):
+        for block in plan:
+            await send(block, bot, chat_id)
+
+
+async def run(args: argparse.Namespace) -> None:
+    for filepath in sorted(args.data.glob('*.json')):
+        post = Post.from_dict(json.loads(filepath.read_text(encoding='utf-8')))
+        msg = CounterStrikeNewsMessage(post, SOURCE_URL)
+        # Restore the message with every media URL already checked
+        restored = CounterStrikeNewsMessage.from_dict({
+            **msg.to_dict(),
+            'valid_media_urls': {url: True for c in msg.content for url in msg._media_urls(c) if url},
+        }, post)
+        assert isinstance(restored, CounterStrikeNewsMessage)
+
+        timings = {}
+        calls = {}
+        for name, func in (('per-chat', per_chat), ('plan', replay_plan)):
+            bot = NullBot()
+            start = time.perf_counter()
+            await func(restored, bot, args.chats)
+            timings[name] = time.perf_counter() - start
+            calls[name] = bot.calls
+        assert calls['per-chat'] == calls['plan']
+
+        results = ', '.join(f'{name} {seconds * 1e6 / args.chats:7.1f}us' for name, seconds in timings.items())
+        print(f'{filepath.name:>24} {calls["plan"] // args.chats:3d} calls per chat: {results}, '
+              f'{timings["per-chat"] / timings["plan"]:5.1f}x')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', type=Path, default=Path('tests/data'))
+    parser.add_argument('--chats', type=int, default=1000)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""Compare the slotted Post with the plain dataclass it replaced.
+
+The ``dataclass`` mode reproduces the old Post, whose ``__eq__`` and
+``__getitem__`` went through ``dataclasses.asdict`` and whose type was
+classified on every call, the ``slotted`` mode uses
+:class:`cs2posts.dto.Post` as is. Posts are built from a crawled feed, then
+compared with each other, looked up by key and classified.
+
+The posts are the crawled news items stored in ``tests/data``.
+
+Usage: python -m benchmarks.bench_post [--data tests/data] [--rounds 2000]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import timeit
+from dataclasses import asdict
+from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import fields
+from pathlib import Path
+from typing import Any
+
+from cs2posts.dto.post import FeedType
+from cs2posts.dto.post import Post
+from cs2posts.dto.post import PostType
+
+
+@dataclass
+class DataclassPost:
+    """Post as it was before it was slotted."""
+
+    gid: str
+    title: str
+    url: str
+    is_external_url: bool
+    author: str
+    contents: str
+    feedlabel: str
+    date: int
+    feedname: str
+    feed_type: int
+    appid: int
+    tags: list[str] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, json: dict[str, Any]) -> DataclassPost:
+        field_names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in json.items() if k in field_names})
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    def is_update(self) -> bool:
+        return "patchnotes" in self.tags or "Release Notes" in self.title
+
+    def is_external(self) -> bool:
+        return FeedType(self.feed_type) == FeedType.EXTERN
+
+    def get_type(self) -> PostType:
+        if self.is_update():
+            return PostType.UPDATE
+        if self.is_external():
+            return PostType.EXTERNAL
+        return PostType.NEWS
+
+    def __getitem__(self, key: str) -> Any:
+        return self.to_dict()[key]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, self.__class__):
+            return self.to_dict() == other.to_dict()
+        return False
+
+
+def _bench(cls: Any, newsitems: list[dict[str, Any]], rounds: int) -> dict[str, float]:
+    posts = [cls.from_dict(item) for item in newsitems]
+    copies = [cls.from_dict(item) for item in newsitems]
+
+    def construct() -> None:
+        for item in newsitems:
+            cls.from_dict(item)
+
+    def compare() -> None:
+        for post, copy in zip(posts, copies):
+            assert post == copy
+
+    def getitem() -> None:
+        for post in posts:
+            post['date']
+
+    def get_type() -> None:
+        for post in posts:
+            post.get_type()
+
+    return {
+        name: min(timeit.repeat(func, number=rounds, repeat=5)) / (rounds * len(newsitems))
+        for name, func in (
+            ('construct', construct),
+            ('compare', compare),
+            ('getitem', getitem),
+            ('get_type', get_type),
+        )
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', type=Path, default=Path('tests/data'))
+    parser.add_argument('--rounds', type=int, default=2000)
+    args = parser.parse_args()
+
+    newsitems = [json.loads(path.read_text()) for path in sorted(args.data.glob('*.json'))]
+    print(f'{len(newsitems)} posts, {args.rounds} rounds')
+    for name, cls in (('dataclass', DataclassPost), ('slotted', Post)):
+        timings = _bench(cls, newsitems, args.rounds)
+        post = cls.from_dict(newsitems[0])
+        # Without slots the attributes live in a separate __dict__.
+        size = sys.getsizeof(post)
+        if hasattr(post, '__dict__'):
+            size += sys.getsizeof(post.__dict__)
+        print(f'{name:>9}: ' + ', '.join(
+            f'{op} {seconds * 1e6:6.2f}us' for op, seconds in timings.items()) + f', {size} bytes')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""Compare the previous Steam2TelegramHTML passes with the precompiled ones.
+
+The ``legacy`` mode reproduces the rendering before the patterns were
+compiled once: STEAM_FORMAT went through ``re.sub`` with pattern strings,
+every paragraph and heading rule was its own pass, SteamListParser collected the text between the tags match by match,
+SteamUpdateHeadingParser used a pattern the regex engine could not skip
+ahead in and the cleanup ran two regex passes. The ``current`` mode renders
+with :class:`cs2posts.parser.Steam2TelegramHTML` as is. Both use the parsers
+of an update message. The posts in ``tests/data`` are repeated to the given
+size. bbcode rendering is the same in both, it is timed on its own and
+patched out while the passes are timed.
+
+bbcode.render_html takes most of the total render time. ``--profile``
+prints where it goes: the tokenizer scans every tag and its options
+character by character in Python (``_tag_extent``, ``_parse_opts``). This
+is inside the bbcode dependency, so the total speedup stays well below the
+speedup of the passes.
+
+Usage: python -m benchmarks.bench_render [--data tests/data] [--size 100000] [--rounds 5] [--profile]
+"""
+from __future__ import annotations
+
+import argparse
+import cProfile
+import json
+import pstats
+import re
+import timeit
+from pathlib import Path
+from unittest.mock import patch
+
+import bbcode
+
+from cs2posts.parser import Steam2TelegramHTML
+from cs2posts.parser import SteamListParser
+from cs2posts.parser import SteamNewsTableParser
+from cs2posts.parser import SteamUpdateHeadingParser
+from cs2posts.parser.steam2telegram_html import NEWLINE_FORMAT
+
+
+LEGACY_PRE_PARSER_FORMAT = [
+    re.compile(r'\[strike\](.*?)\[/strike\]', re.IGNORECASE | re.DOTALL),
+    re.compile(r'\[p\]\[/p\]', re.IGNORECASE),
+    re.compile(r'\[p\](.*?)\[/p\]', re.IGNORECASE | re.DOTALL),
+]
+LEGACY_PRE_PARSER_REPLACE = [r'\1', '\n', r'\1']
+
+LEGACY_STEAM_FORMAT = [
+    (r'\[h2\](.*?)\[/h2\]', r'\n\n<b>\1</b>\n\n'),
+    (r'\[h3\](.*?)\[/h3\]', r'\n\n<b>\1</b>\n\n'),
+    (r'\[h4\](.*?)\[/h4\]', r'\n\n<b>\1</b>\n\n'),
+    (r'\[h5\](.*?)\[/h5\]', r'\n\n<b>\1</b>\n\n'),
+    (r'&ndash;', r'—'),
+]
+
+
+class LegacyListParser(SteamListParser):
+    """SteamListParser copying the text between the tags match by match."""
+
+    def parse(self) -> str:
+        parts = []
+        nested_lvl = 0
+        end = 0
+        for match in re.finditer(r'<li></li>|<ul>|</ul>|<li>|</li>', self.text):
+            parts.append(self.text[end:match.start()])
+            end = match.end()
+            tag = match.group()
+            if tag == '<ul>':
+                parts.append('\n' if nested_lvl <= 0 else '')
+                nested_lvl += 1
+            elif tag == '</ul>':
+                parts.append('\n' if nested_lvl <= 1 else '')
+                nested_lvl -= 1
+            elif tag == '</li>':
+                parts.append('\n')
+            elif nested_lvl > 1:
+                parts.append(f"{' ' * (nested_lvl - 1) * 4}◦ ")
+            else:
+                parts.append('• ')
+        parts.append(self.text[end:])
+        self.text = ''.join(parts)
+        return self.text
+
+
+class LegacyHeadingParser(SteamUpdateHeadingParser):
+    """SteamUpdateHeadingParser with the optional escape group in front."""
+
+    LEGACY_HEADING_REGEX = re.compile(r"(?P<escape>\\)?\[(?P<heading>[a-zA-Z0-9&/'\-\s]+)\]")
+
+    def parse(self) -> str:
+        self.text = self.LEGACY_HEADING_REGEX.sub(
+            lambda match: self.format_heading(match.group('heading'), *match.span()), self.text)
+        return self.text
+
+
+def legacy_render(text: str) -> str:
+    text = bbcode.render_html(text)
+    for value in NEWLINE_FORMAT.values():
+        text = text.replace(value['pattern'], value['replace'])
+    for pattern, replace in zip(LEGACY_PRE_PARSER_FORMAT, LEGACY_PRE_PARSER_REPLACE):
+        text = pattern.sub(replace, text)
+    text = text.replace('\xa0', ' ')
+    for parser in (LegacyListParser, SteamNewsTableParser, LegacyHeadingParser):
+        text = parser(text).parse()
+    for pattern, replace in LEGACY_STEAM_FORMAT:
+        text = re.sub(pattern, replace, text, flags=re.IGNORECASE | re.DOTALL)
+    text = re.sub(r'[^\S\n]+\n', '\n', text)
+    return re.sub(r'\n{3,}', '\n\n', text)
+
+
+def render(text: str) -> str:
+    parser = Steam2TelegramHTML(text)
+    parser.add_parser(parser=SteamListParser, priority=1)
+    parser.add_parser(parser=SteamNewsTableParser, priority=2)
+    parser.add_parser(parser=SteamUpdateHeadingParser, priority=3)
+    return parser.parse()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', type=Path, default=Path('tests/data'))
+    parser.add_argument('--size', type=int, default=100_000)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--profile', action='store_true', help='profile bbcode.render_html')
+    args = parser.parse_args()
+
+    for filepath in sorted(args.data.glob('*.json')):
+        contents = json.loads(filepath.read_text(encoding='utf-8'))['contents']
+        text = contents * max(args.size // len(contents), 1)
+        assert render(text) == legacy_render(text)
+
+        def bench(func, text: str) -> float:
+            return min(timeit.repeat(lambda: func(text), number=args.rounds, repeat=5)) / args.rounds
+
+        bbcode_time = bench(bbcode.render_html, text)
+        html = bbcode.render_html(text)
+        with patch('bbcode.render_html', side_effect=lambda text: text):
+            legacy = bench(legacy_render, html)
+            current = bench(render, html)
+        print(
+            f'{filepath.name:>24} {len(text):7d} chars: bbcode {bbcode_time * 1e3:7.2f}ms, '
+            f'passes legacy {legacy * 1e3:6.2f}ms current {current * 1e3:6.2f}ms '
+            f'({legacy / current:4.1f}x), '
+            f'total {(bbcode_time + legacy) / (bbcode_time + current):4.2f}x')
+
+        if args.profile:
+            profiler = cProfile.Profile()
+            profiler.runcall(bbcode.render_html, text)
+            pstats.Stats(profiler).sort_stats('tottime').print_stats(5)
+
+
+if __name__ == '__main__':
+    main()
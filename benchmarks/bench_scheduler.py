@@ -0,0 +1,90 @@
+"""Compare the fixed crawl interval with the adaptive CrawlScheduler.
+
+A synthetic post history is generated: updates on Tuesday and Wednesday
+evenings (Pacific time, i.e. around 00:00-03:00 UTC) and news spread over
+the working hours. The scheduler learns the first weeks, the remaining weeks
+are replayed. For each mode the number of crawls and the delay between
+publication and the first crawl that finds the post are reported.
+
+Usage: python -m benchmarks.bench_scheduler [--weeks 52] [--interval 900]
+"""
+from __future__ import annotations
+
+import argparse
+import bisect
+import random
+import statistics
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+
+from cs2posts.bot.scheduler import CrawlScheduler
+
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _history(weeks: int, seed: int) -> list[int]:
+    rng = random.Random(seed)
+    dates = []
+    for week in range(weeks):
+        monday = START + timedelta(weeks=week)
+        for day in (1, 2):
+            if rng.random() < 0.6:
+                when = monday + timedelta(days=day, hours=rng.gauss(1.5, 0.75))
+                dates.append(int(when.timestamp()))
+        for _ in range(rng.randint(0, 2)):
+            when = monday + timedelta(days=rng.randint(0, 4), hours=rng.uniform(15, 23))
+            dates.append(int(when.timestamp()))
+    return sorted(dates)
+
+
+def _replay(dates: list[int], start: int, end: int, next_delay) -> tuple[int, list[float]]:
+    crawls = 0
+    delays = []
+    found = bisect.bisect_right(dates, start)
+    now = float(start)
+    while now < end:
+        now += next_delay(now)
+        crawls += 1
+        while found < len(dates) and dates[found] <= now:
+            delays.append(now - dates[found])
+            found += 1
+    return crawls, delays
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--weeks', type=int, default=52)
+    parser.add_argument('--interval', type=int, default=900)
+    parser.add_argument('--min-interval', type=int, default=30)
+    parser.add_argument('--max-interval', type=int, default=1800)
+    parser.add_argument('--seed', type=int, default=730)
+    args = parser.parse_args()
+
+    dates = _history(args.weeks, args.seed)
+    split = int((START + timedelta(weeks=args.weeks // 2)).timestamp())
+    end = int((START + timedelta(weeks=args.weeks)).timestamp())
+
+    scheduler = CrawlScheduler(args.interval, args.min_interval, args.max_interval)
+    scheduler.learn({str(i): date for i, date in enumerate(dates) if date < split},
+                    now=datetime.fromtimestamp(split, tz=timezone.utc))
+
+    def adaptive(now: float) -> float:
+        return scheduler.next_delay(datetime.fromtimestamp(now, tz=timezone.utc))
+
+    modes = {
+        'fixed': lambda now: float(args.interval),
+        'adaptive': adaptive,
+    }
+    for name, next_delay in modes.items():
+        crawls, delays = _replay(dates, split, end, next_delay)
+        print(
+            f'{name:>8}: {crawls:6d} crawls, '
+            f'median delay {statistics.median(delays):6.0f}s, '
+            f'p90 delay {statistics.quantiles(delays, n=10)[-1]:6.0f}s '
+            f'({len(delays)} posts)')
+
+
+if __name__ == '__main__':
+    main()
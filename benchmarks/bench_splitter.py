@@ -0,0 +1,108 @@
+"""Compare the line splitter with the HTML aware message splitter.
+
+The ``lines`` mode reproduces the old TelegramMessage.split, which packed
+whole lines up to the limit counted in characters and cut longer lines
+anywhere. The ``html`` mode uses :func:`cs2posts.msg.split_message` as is.
+The input is each post in ``tests/data`` rendered like an update message.
+For each limit the number of chunks is reported, i.e. API calls per chat,
+how full they are on average and how many of them Telegram would reject,
+because a tag is cut or left open or the chunk is too long.
+
+Usage: python -m benchmarks.bench_splitter [--data tests/data] [--limits 4096 1024 256] [--rounds 5]
+"""
+from __future__ import annotations
+
+import argparse
+import html
+import json
+import re
+import timeit
+from collections.abc import Callable
+from pathlib import Path
+
+from cs2posts.msg import CounterStrikeUpdateMessage
+from cs2posts.msg import split_message
+from cs2posts.msg.splitter import utf16_len
+from cs2posts.parser import ParsedDocument
+
+TAG = re.compile(r"</?([a-zA-Z]+)[^>]*>")
+
+
+def split_lines(message: str, limit: int) -> list[str]:
+    """TelegramMessage.split as it was before it knew about HTML."""
+    if len(message) <= limit:
+        return [message]
+
+    chunks: list[str] = []
+    chunk = ''
+
+    for line in message.split('\n'):
+        candidate = f'{chunk}{line}\n'
+        if len(candidate) <= limit:
+            chunk = candidate
+            continue
+
+        if chunk:
+            chunks.append(chunk)
+
+        while len(line) > limit:
+            chunks.append(line[:limit])
+            line = line[limit:]
+
+        chunk = f'{line}\n'
+
+    if chunk:
+        chunks.append(chunk)
+
+    return chunks
+
+
+def visible_len(chunk: str) -> int:
+    return utf16_len(html.unescape(TAG.sub("", chunk)))
+
+
+def is_valid(chunk: str, limit: int) -> bool:
+    if visible_len(chunk) > limit or re.search(r"<[^>]*$|^[^<]*>", chunk):
+        return False
+    stack: list[str] = []
+    for match in TAG.finditer(chunk):
+        if not match.group().startswith("</"):
+            stack.append(match.group(1))
+        elif not stack or stack.pop() != match.group(1):
+            return False
+    return not stack
+
+
+MODES: dict[str, Callable[[str, int], list[str]]] = {
+    "lines": split_lines,
+    "html": split_message,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", type=Path, default=Path("tests/data"))
+    parser.add_argument("--limits", type=int, nargs="+", default=[4096, 1024, 256])
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    messages = [
+        ParsedDocument(json.loads(path.read_text(encoding="utf-8"))["contents"])
+        .render(CounterStrikeUpdateMessage.PARSERS)
+        for path in sorted(args.data.glob("*.json"))]
+    print(f"{len(messages)} posts, {sum(len(m) for m in messages)} characters")
+
+    for limit in args.limits:
+        for mode, split in MODES.items():
+            chunks = [chunk for message in messages for chunk in split(message, limit)]
+            fill = sum(visible_len(chunk) for chunk in chunks) / (len(chunks) * limit)
+            invalid = sum(not is_valid(chunk, limit) for chunk in chunks)
+            seconds = min(timeit.repeat(
+                lambda: [split(message, limit) for message in messages],
+                number=1, repeat=args.rounds))
+            print(f"limit {limit:5} {mode:>6}: {len(chunks):4} chunks, "
+                  f"{fill:6.1%} full, {invalid:3} invalid, {seconds * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Compare queries per second of a connection per query with the shared one.
+
+The ``per-query`` mode reproduces the old ``SQLite`` helpers, which opened a
+new aiosqlite connection for every statement, the ``shared`` mode uses
+:class:`cs2posts.db.ChatDatabase` as is. The workload mirrors
+``spam_protected``: one ``get`` followed by one ``update`` per command.
+
+Usage: python -m benchmarks.bench_sqlite [--chats 100] [--rounds 2000]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+import aiosqlite
+
+from cs2posts.db import ChatDatabase
+from cs2posts.dto import Chat
+
+
+async def _prepare(filepath: Path, chats: int) -> None:
+    db = ChatDatabase(filepath)
+    await db.create_table()
+    for chat_id in range(chats):
+        await db.save(Chat(chat_id))
+    await db.close()
+
+
+class PerQueryChatDatabase(ChatDatabase):
+    """ChatDatabase with the old helpers opening a connection per query."""
+
+    async def _execute(self, query: str, params: Sequence[Any] = ()) -> None:
+        async with aiosqlite.connect(self.filepath) as conn:
+            await conn.execute(query, params)
+            await conn.commit()
+
+    async def _fetch_one(self, query: str, params: Sequence[Any] = ()) -> aiosqlite.Row | None:
+        async with aiosqlite.connect(self.filepath) as conn:
+            conn.row_factory = aiosqlite.Row
+            async with conn.execute(query, params) as cursor:
+                return await cursor.fetchone()
+
+
+async def bench(db: ChatDatabase, chats: int, rounds: int) -> float:
+    start = time.perf_counter()
+    try:
+        for i in range(rounds):
+            chat = await db.get(i % chats)
+            assert chat is not None
+            await db.update(chat)
+        return time.perf_counter() - start
+    finally:
+        await db.close()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--chats', type=int, default=100)
+    parser.add_argument('--rounds', type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filepath = Path(tmp) / 'bench.db'
+        await _prepare(filepath, args.chats)
+
+        queries = args.rounds * 2
+        for name, db in (('per-query', PerQueryChatDatabase(filepath)), ('shared', ChatDatabase(filepath))):
+            elapsed = await bench(db, args.chats, args.rounds)
+            print(f'{name:>10}: {queries / elapsed:10.0f} queries/s ({elapsed:.3f}s)')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+"""Compare the character by character SteamListParser with the tag scan.
+
+The ``per-char`` mode reproduces the old parser, which appended every
+character to the result string and compared up to four tags at every
+position, the ``scan`` mode uses :class:`cs2posts.parser.SteamListParser` as
+is. The input is a patch note with sections of nested bullet lists, rendered
+to HTML like in the message pipeline and repeated to the given size.
+
+Usage: python -m benchmarks.bench_steam_list [--sections 10 100 1000] [--rounds 5]
+"""
+from __future__ import annotations
+
+import argparse
+import timeit
+
+import bbcode
+
+from cs2posts.parser.parser import Parser
+from cs2posts.parser.steam_list import SteamListParser
+
+
+SECTION = (
+    "[ GAMEPLAY ]\n[list]\n"
+    "[*]Fixed a bug where the bomb could sometimes disappear from the radar\n"
+    "[*]Smokes\n[list]\n"
+    "[*]Reduced the duration of smokes that were extinguished by a grenade\n"
+    "[*]Fixed cases where smokes could be seen through on low settings\n[/list]\n"
+    "[*]Allow deleting empty storage units that have an assigned label\n[/list]\n"
+    "[ MAPS ]\n[i]Ancient:[/i][list]\n"
+    "[*]Added simplified grenade collisions to corner trims on B site\n[/list]\n"
+)
+
+
+class PerCharSteamListParser(Parser):
+    """SteamListParser as it was before the tag scan."""
+
+    def is_tag(self, tag: str, i: int) -> bool:
+        return self.text[i:i + len(tag)] == tag
+
+    def parse(self) -> str:
+        i = 0
+        nested_lvl = 0
+        modified_str = ""
+
+        while i < len(self.text):
+            if self.is_tag("<ul>", i):
+                modified_str += "" if nested_lvl > 0 else "\n"
+                i += 4
+                nested_lvl += 1
+                continue
+
+            if self.is_tag("<li>", i):
+                space = " " * (nested_lvl - 1) * 4 if nested_lvl > 1 else ""
+                tag = "◦" if nested_lvl > 1 else "•"
+                modified_str += f"{space}{tag} "
+                i += 9 if self.is_tag("<li></li>", i) else 4
+                continue
+
+            if self.is_tag("</li>", i):
+                modified_str += "\n"
+                i += 5
+                continue
+
+            if self.is_tag("</ul>", i):
+                modified_str += "" if nested_lvl > 1 else "\n"
+                nested_lvl -= 1
+                i += 5
+                continue
+
+            modified_str += self.text[i]
+            i += 1
+
+        self.text = modified_str
+        return self.text
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sections', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    for sections in args.sections:
+        text = bbcode.render_html(SECTION * sections)
+        expected = PerCharSteamListParser(text).parse()
+        assert SteamListParser(text).parse() == expected
+
+        timings = {
+            name: min(timeit.repeat(lambda: cls(text).parse(), number=args.rounds, repeat=3)) / args.rounds
+            for name, cls in (('per-char', PerCharSteamListParser), ('scan', SteamListParser))
+        }
+        results = ', '.join(f'{name} {seconds * 1e3:8.2f}ms' for name, seconds in timings.items())
+        print(f'{len(text):8d} chars: {results}, {timings["per-char"] / timings["scan"]:5.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""Compare text blocks copied out of the post with text blocks kept as spans.
+
+The ``copy`` mode reproduces the old TextBlock, which sliced and stripped
+the text between the media into a new string, built new strings to join a
+clickable image's blocks and to add the message header and footer. The
+``span`` mode uses :class:`cs2posts.content.ContentExtractor` and
+:class:`cs2posts.content.TextBlock` as is and joins the text once, like
+when the message is sent. The input is each post in ``tests/data``
+rendered like in the message pipeline and repeated to the given size.
+
+Usage: python -m benchmarks.bench_textblock [--data tests/data] [--size 1000000] [--rounds 5]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+from cs2posts.content import ContentExtractor
+from cs2posts.content import TextBlock
+from cs2posts.parser import Steam2TelegramHTML
+from cs2posts.parser import SteamListParser
+from cs2posts.parser import SteamNewsTableParser
+
+HEADER = "<b>Counter-Strike 2 Update</b>\n(2024-04-16 00:00:00)\n\n"
+FOOTER = "\n\n(Author: Valve)\n\nSource: <a href='https://store.steampowered.com'>Link</a>"
+
+
+@dataclass
+class CopiedTextBlock:
+    """TextBlock as it was before it was kept as spans."""
+
+    text_pos_start: int
+    text_pos_end: int
+    text: str
+
+
+def copy_blocks(text: str) -> list[CopiedTextBlock]:
+    media = [(c.text_pos_start, c.text_pos_end) for c in ContentExtractor(text).tokenize()]
+    # Without media the post is a single block, which is not stripped
+    blocks = [] if media else [CopiedTextBlock(0, len(text), text)]
+    combined = False
+    text_pos = 0
+    for start, end in media + [(len(text), len(text))] if media else []:
+        block = CopiedTextBlock(text_pos, start, text[text_pos:start].strip())
+        text_pos = end
+        if not block.text:
+            continue
+        if blocks and not combined and blocks[-1].text.endswith('>') and block.text.startswith('</a>'):
+            left = blocks[-1]
+            blocks[-1] = CopiedTextBlock(left.text_pos_start, start, left.text + "\nImage Link" + block.text)
+            combined = True
+            continue
+        blocks.append(block)
+        combined = False
+    blocks[0].text = HEADER + blocks[0].text
+    blocks[-1].text += FOOTER
+    return blocks
+
+
+def span_blocks(text: str) -> list[TextBlock]:
+    blocks = [c for c in ContentExtractor(text).extract() if isinstance(c, TextBlock) and not c.is_empty()]
+    blocks[0].prepend(HEADER)
+    blocks[-1].append(FOOTER)
+    return blocks
+
+
+def retained(func: Callable[[str], list], text: str) -> int:
+    # Memory still held by the blocks once they are built, before sending
+    tracemalloc.start()
+    blocks = func(text)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del blocks
+    return size
+
+
+def render(contents: str) -> str:
+    parser = Steam2TelegramHTML(contents)
+    parser.add_parser(parser=SteamListParser, priority=1)
+    parser.add_parser(parser=SteamNewsTableParser, priority=2)
+    return parser.parse()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', type=Path, default=Path('tests/data'))
+    parser.add_argument('--size', type=int, default=1_000_000)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    for filepath in sorted(args.data.glob('*.json')):
+        html = render(json.loads(filepath.read_text(encoding='utf-8'))['contents'])
+        text = html * max(args.size // len(html), 1)
+        assert [block.text for block in span_blocks(text)] == [block.text for block in copy_blocks(text)]
+
+        results = []
+        for name, func in (('copy', copy_blocks), ('span', span_blocks)):
+            extract = min(timeit.repeat(lambda: func(text), number=args.rounds, repeat=3)) / args.rounds
+            blocks = func(text)
+            send = min(timeit.repeat(lambda: [block.text for block in blocks], number=args.rounds, repeat=3)) / args.rounds
+            results.append(f'{name} extract {extract * 1e3:6.2f}ms send {send * 1e3:5.2f}ms '
+                           f'held {retained(func, text) / 1e6:5.2f}MB')
+        print(f'{filepath.name:>24} {len(text):8d} chars: ' + ', '.join(results))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterable
+from collections.abc import Awaitable
+from collections.abc import Callable
+from collections.abc import Iterable
+from typing import Any
+from typing import TypeVar
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+
+class RateLimiter:
+    """Spaces acquisitions evenly so that at most ``rate`` pass per second.
+
+    Every caller reserves the next free time slot synchronously and then
+    sleeps until it is due, so concurrent callers are served in FIFO order
+    without needing a lock.
+    """
+
+    def __init__(self, rate: float) -> None:
+        if rate <= 0:
+            raise ValueError('rate must be greater than 0')
+        self.__interval = 1.0 / rate
+        self.__next_slot = 0.0
+
+    @property
+    def interval(self) -> float:
+        return self.__interval
+
+    @property
+    def next_slot(self) -> float:
+        return self.__next_slot
+
+    def reserve(self) -> float:
+        """Reserve the next slot and return how long to wait for it."""
+        now = time.monotonic()
+        slot = max(now, self.__next_slot)
+        self.__next_slot = slot + self.__interval
+        return slot - now
+
+    async def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class ChatRateLimiter:
+    """Keeps one :class:`RateLimiter` per chat id.
+
+    Limiters whose next slot already lies in the past carry no state worth
+    keeping and are dropped, so memory stays bounded by the number of chats
+    that were sent to within the last interval.
+    """
+
+    PRUNE_THRESHOLD = 1024
+
+    def __init__(self, rate: float) -> None:
+        self.__rate = rate
+        self.__limiters: dict[int, RateLimiter] = {}
+
+    def __len__(self) -> int:
+        return len(self.__limiters)
+
+    def prune(self) -> None:
+        now = time.monotonic()
+        idle = [chat_id for chat_id, limiter in self.__limiters.items()
+                if limiter.next_slot <= now]
+        for chat_id in idle:
+            del self.__limiters[chat_id]
+
+    async def acquire(self, chat_id: int) -> None:
+        limiter = self.__limiters.get(chat_id)
+        if limiter is None:
+            if len(self.__limiters) >= self.PRUNE_THRESHOLD:
+                self.prune()
+            limiter = self.__limiters[chat_id] = RateLimiter(self.__rate)
+        await limiter.acquire()
+
+
+class ThrottledBot:
+    """Bot proxy that waits for the chat and the global budget before sending.
+
+    Only the send methods used to deliver posts are throttled, every other
+    attribute is passed through to the wrapped bot unchanged.
+    """
+
+    def __init__(self, bot: Any, global_limiter: RateLimiter, chat_limiter: ChatRateLimiter) -> None:
+        self.__bot = bot
+        self.__global_limiter = global_limiter
+        self.__chat_limiter = chat_limiter
+
+    @property
+    def bot(self) -> Any:
+        return self.__bot
+
+    async def throttle(self, chat_id: int) -> None:
+        # Wait for the per chat budget first so a busy chat does not hold a
+        # global slot while it is still waiting for its own.
+        await self.__chat_limiter.acquire(chat_id)
+        await self.__global_limiter.acquire()
+
+    async def send_message(self, *, chat_id: int, **kwargs: Any) -> Any:
+        await self.throttle(chat_id)
+        return await self.__bot.send_message(chat_id=chat_id, **kwargs)
+
+    async def send_photo(self, *, chat_id: int, **kwargs: Any) -> Any:
+        await self.throttle(chat_id)
+        return await self.__bot.send_photo(chat_id=chat_id, **kwargs)
+
+    async def send_video(self, *, chat_id: int, **kwargs: Any) -> Any:
+        await self.throttle(chat_id)
+        return await self.__bot.send_video(chat_id=chat_id, **kwargs)
+
+    async def send_media_group(self, *, chat_id: int, **kwargs: Any) -> Any:
+        await self.throttle(chat_id)
+        return await self.__bot.send_media_group(chat_id=chat_id, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.__bot, name)
+
+
+class Broadcaster:
+    """Fans a send callback out over many chats concurrently.
+
+    The number of in-flight sends is bounded by ``concurrency`` while the
+    actual Telegram API calls are paced by a global and a per chat rate
+    limit (see :meth:`throttle`). A failing chat is logged and skipped so
+    it can never abort the delivery to the remaining chats.
+    """
+
+    def __init__(self, *, global_rate: float, chat_rate: float, concurrency: int) -> None:
+        if concurrency <= 0:
+            raise ValueError('concurrency must be greater than 0')
+        self.__concurrency = concurrency
+        self.__global_limiter = RateLimiter(global_rate)
+        self.__chat_limiter = ChatRateLimiter(chat_rate)
+
+    @property
+    def concurrency(self) -> int:
+        return self.__concurrency
+
+    def throttle(self, bot: Any) -> ThrottledBot:
+        return ThrottledBot(bot, self.__global_limiter, self.__chat_limiter)
+
+    async def broadcast(
+        self,
+        items: Iterable[T] | AsyncIterable[T],
+        send: Callable[[T], Awaitable[Any]],
+    ) -> int:
+        """Call ``send`` for every item and return the number of failures."""
+        queue: asyncio.Queue[T] = asyncio.Queue(maxsize=self.__concurrency * 2)
+        failures = 0
+
+        async def worker() -> None:
+            nonlocal failures
+            while True:
+                item = await queue.get()
+                try:
+                    await send(item)
+                except Exception as e:
+                    failures += 1
+                    logger.exception(f'Broadcast failed for {item!r}: {e}')
+                finally:
+                    queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.__concurrency)]
+        try:
+            if isinstance(items, AsyncIterable):
+                async for item in items:
+                    await queue.put(item)
+            else:
+                for item in items:
+                    await queue.put(item)
+            await queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        return failures
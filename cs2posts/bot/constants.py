@@ -2,6 +2,9 @@ from __future__ import annotations
 
 REQUESTS_TIMEOUT = 3
 
+# Number of posts crawled while no post is known yet
+SEED_POST_COUNT = 100
+
 WELCOME_MESSAGE_ENGLISH = """\
 <b>Welcome to the Counter-Strike 2 Post Bot!</b>\n
 This bot will automatically keep you updated about latest posted news and updates from the https://www.counter-strike.net/ website. Check /help for more information about the commands.\n
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import AsyncIterator
 from pathlib import Path
 from typing import Any
+from typing import cast
 
 from telegram import Update
 from telegram.constants import ChatType
@@ -10,6 +12,7 @@ from telegram.constants import ParseMode
 from telegram.error import BadRequest
 from telegram.error import ChatMigrated
 from telegram.error import Forbidden
+from telegram.error import RetryAfter
 from telegram.ext import Application
 from telegram.ext import CallbackContext
 from telegram.ext import CommandHandler
@@ -21,17 +24,31 @@ from telegram.request import HTTPXRequest
 import cs2posts.bot.constants as const
 from cs2posts.bot import settings
 from cs2posts.bot.backup import ChatDatabaseBackupManager
+from cs2posts.bot.broadcast import Broadcaster
+from cs2posts.bot.delivery import QueuedMessage
 from cs2posts.bot.heartbeat import write_heartbeat
 from cs2posts.bot.options import Options
+from cs2posts.bot.scheduler import CrawlScheduler
 from cs2posts.bot.spam import SpamProtector
+from cs2posts.circuit import CircuitOpenError
 from cs2posts.crawler import CounterStrike2Crawler
 from cs2posts.cs2posts import CounterStrike2Posts
 from cs2posts.db import ChatDatabase
+from cs2posts.db import DeliveryDatabase
 from cs2posts.db import PostDatabase
 from cs2posts.dto.chats import Chat
+from cs2posts.dto.delivery import Delivery
+from cs2posts.dto.delivery import DeliveryStatus
 from cs2posts.dto.post import Post
+from cs2posts.dto.post import PostHeader
+from cs2posts.dto.post import PostType
 from cs2posts.msg import create_message
+from cs2posts.msg import message_class
+from cs2posts.msg import MessageCache
+from cs2posts.msg import restore_message
 from cs2posts.msg import TelegramMessage
+from cs2posts.parser import DocumentCache
+from cs2posts.resolver import close_resolver
 
 
 logger = logging.getLogger(__name__)
@@ -64,6 +81,7 @@ class CounterStrike2UpdateBot:
         spam_protector: SpamProtector,
         post_db: PostDatabase,
         chat_db: ChatDatabase,
+        delivery_db: DeliveryDatabase,
     ) -> None:
         request = HTTPXRequest(
             read_timeout=30,
@@ -82,15 +100,29 @@ class CounterStrike2UpdateBot:
         self.spam_protector = spam_protector
         self.post_db = post_db
         self.chat_db = chat_db
-
-        # Populated later: username in post_init, the cached latest posts in
-        # async_init / _load_latest_posts. Declared here so the attributes
-        # always exist (e.g. for the getattr/setattr in _post_checker).
+        self.delivery_db = delivery_db
+        self.broadcaster = Broadcaster(
+            global_rate=settings.TELEGRAM_GLOBAL_MESSAGES_PER_SECOND,
+            chat_rate=settings.TELEGRAM_CHAT_MESSAGES_PER_SECOND,
+            concurrency=settings.BROADCAST_CONCURRENCY)
+        self.message_cache = MessageCache(settings.MESSAGE_CACHE_SIZE)
+        self.document_cache = DocumentCache(settings.DOCUMENT_CACHE_SIZE)
+        self.scheduler = CrawlScheduler(
+            interval=settings.CS2_UPDATE_CHECK_INTERVAL,
+            min_interval=settings.CS2_UPDATE_CHECK_MIN_INTERVAL,
+            max_interval=settings.CS2_UPDATE_CHECK_MAX_INTERVAL)
+
+        # Populated later: username in post_init, the headers of the latest
+        # posts in async_init / _load_latest_posts. Declared here so the
+        # attributes always exist (e.g. for the getattr/setattr in
+        # _post_checker).
         self.username: str | None = None
-        self.latest_post: Post | None = None
-        self.latest_news_post: Post | None = None
-        self.latest_update_post: Post | None = None
-        self.latest_external_post: Post | None = None
+        self.latest_post: PostHeader | None = None
+        self.latest_news_post: PostHeader | None = None
+        self.latest_update_post: PostHeader | None = None
+        self.latest_external_post: PostHeader | None = None
+        # False while seeding an empty post database failed, see post_checker.
+        self.is_seeded = True
 
         self.options = Options(app=self.app)
 
@@ -123,6 +155,10 @@ class CounterStrike2UpdateBot:
             await self.chat_db.create()
         await self.chat_db.create_table()
 
+        if not self.delivery_db.filepath.exists():
+            await self.delivery_db.create()
+        await self.delivery_db.create_table()
+
     async def _try_import_json(
         self,
         filepath: str | None,
@@ -137,16 +173,20 @@ class CounterStrike2UpdateBot:
         except Exception as e:
             logger.error(f'Could not import {label} from json: {e}')
 
-    async def _seed_posts_if_empty(self) -> None:
+    async def _seed_posts_if_empty(self) -> bool:
         if not await self.post_db.is_empty():
-            return
+            return True
 
         # TODO: Maybe ensure that there is a latest update and news post
         # As of now we just fetch 100 items.
         logger.info('No post data found. Fetching latest posts...')
-        # TODO: What happens here if crawler fails?
-        data = await self.crawler.crawl()
-        posts = CounterStrike2Posts(data)
+        try:
+            newsitems = [item async for item in self.crawler.crawl_new(
+                page_size=const.SEED_POST_COUNT, limit=const.SEED_POST_COUNT)]
+        except Exception as e:
+            logger.error(f'Could not fetch posts to seed the database: {e}')
+            return False
+        posts = CounterStrike2Posts.from_newsitems(newsitems)
 
         if posts.latest_update_post is not None:
             await self.post_db.save(posts.latest_update_post)
@@ -154,12 +194,29 @@ class CounterStrike2UpdateBot:
             await self.post_db.save(posts.latest_news_post)
         if posts.latest_external_post is not None:
             await self.post_db.save(posts.latest_external_post)
+        return True
 
     async def _load_latest_posts(self) -> None:
-        self.latest_post = await self.post_db.get_latest_post()
-        self.latest_news_post = await self.post_db.get_latest_news_post()
-        self.latest_update_post = await self.post_db.get_latest_update_post()
-        self.latest_external_post = await self.post_db.get_latest_external_post()
+        # Only the headers are read, the contents of a post are loaded when
+        # its message is rendered.
+        latest = await self.post_db.get_latest_posts()
+        self.latest_post = latest.latest
+        self.latest_news_post = latest.get(PostType.NEWS)
+        self.latest_update_post = latest.get(PostType.UPDATE)
+        self.latest_external_post = latest.get(PostType.EXTERNAL)
+
+    async def _load_rendered_messages(self) -> None:
+        # Warm the message cache from the persisted renders, a missing or
+        # outdated render is created on first use instead.
+        for header in (self.latest_news_post, self.latest_update_post, self.latest_external_post):
+            if header is None:
+                continue
+            post = await self.post_db.get_post_by_gid(header.gid)
+            if post is None:
+                continue
+            msg = await self.load_rendered_message(post)
+            if msg is not None:
+                self.message_cache.put(post, msg)
 
     async def async_init(self) -> None:
         await self._ensure_databases_exist()
@@ -173,8 +230,15 @@ class CounterStrike2UpdateBot:
             self.post_db.import_from_json,
             'posts',
         )
-        await self._seed_posts_if_empty()
+        self.is_seeded = await self._seed_posts_if_empty()
         await self._load_latest_posts()
+        await self._load_rendered_messages()
+        self.scheduler.learn(await self.post_db.get_dates())
+
+        pending = await self.delivery_db.count_pending()
+        if pending > 0:
+            # Sending needs the running application, post_init schedules it.
+            logger.info(f'Found {pending} unfinished deliveries. Resuming after startup...')
 
         self.options.set_chat_db(self.chat_db)
 
@@ -185,7 +249,7 @@ class CounterStrike2UpdateBot:
         logger.info(f'Bot username: {self.username}. Bot is ready.')
 
         # Seed the heartbeat immediately so the healthcheck passes before the
-        # first crawl cycle (which only runs after CS2_UPDATE_CHECK_INTERVAL).
+        # first crawl cycle (which only runs after the first crawl interval).
         write_heartbeat(settings.HEARTBEAT_FILEPATH)
 
         # Schedule the recurring jobs up-front so crawling and backups run
@@ -194,24 +258,27 @@ class CounterStrike2UpdateBot:
             logger.error('Job queue is not available. Periodic jobs not scheduled.')
             return
 
-        application.job_queue.run_repeating(
-            callback=self.post_checker,
-            interval=settings.CS2_UPDATE_CHECK_INTERVAL)
+        application.job_queue.run_once(
+            callback=self.crawl_job,
+            when=self.scheduler.next_delay())
         application.job_queue.run_repeating(
             callback=self.backup_chats_db,
             interval=settings.CHAT_DB_BACKUP_INTERVAL)
+        application.job_queue.run_repeating(
+            callback=self.maintain_databases,
+            interval=settings.SQLITE_MAINTENANCE_INTERVAL)
+        application.job_queue.run_once(
+            callback=self.resume_deliveries,
+            when=0)
 
     async def post_shutdown(self, application: Application) -> None:
         logger.info('Shutting down bot...')
-        # saving chats is not required anymore
-        # since we directly operate on the database
-        # Keep function for future use
-        if self.latest_news_post is not None:
-            await self.post_db.save(self.latest_news_post)
-        if self.latest_update_post is not None:
-            await self.post_db.save(self.latest_update_post)
-        if self.latest_external_post is not None:
-            await self.post_db.save(self.latest_external_post)
+        # Posts and chats are saved as they change, only close the databases.
+        await self.delivery_db.close()
+        await self.post_db.close()
+        await self.chat_db.close()
+        await self.crawler.aclose()
+        await close_resolver()
 
     async def new_chat_member(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         if update is None or update.message is None or update.message.from_user is None:
@@ -369,7 +436,9 @@ class CounterStrike2UpdateBot:
 
         logger.info('Sending latest saved post to chat ...')
         chat = await self.chat_db.get(update.message.chat_id)
-        msg = await create_message(self.latest_post)
+        msg = await self.get_latest_message(self.latest_post)
+        if msg is None:
+            return
         await self.send_message(context=context, msg=msg, chat=chat)
 
     @spam_protected
@@ -383,7 +452,9 @@ class CounterStrike2UpdateBot:
 
         logger.info('Sending latest news post to chat ...')
         chat = await self.chat_db.get(update.message.chat_id)
-        msg = await create_message(self.latest_news_post)
+        msg = await self.get_latest_message(self.latest_news_post)
+        if msg is None:
+            return
         await self.send_message(context=context, msg=msg, chat=chat)
 
     @spam_protected
@@ -397,7 +468,9 @@ class CounterStrike2UpdateBot:
 
         logger.info('Sending latest update post to chats ...')
         chat = await self.chat_db.get(update.message.chat_id)
-        msg = await create_message(self.latest_update_post)
+        msg = await self.get_latest_message(self.latest_update_post)
+        if msg is None:
+            return
         await self.send_message(context=context, msg=msg, chat=chat)
 
     @spam_protected
@@ -411,7 +484,9 @@ class CounterStrike2UpdateBot:
 
         logger.info('Sending latest external post to chat ...')
         chat = await self.chat_db.get(update.message.chat_id)
-        msg = await create_message(self.latest_external_post)
+        msg = await self.get_latest_message(self.latest_external_post)
+        if msg is None:
+            return
         await self.send_message(context=context, msg=msg, chat=chat)
 
     async def _post_checker(self, context: CallbackContext, post: Post | None) -> None:
@@ -426,63 +501,255 @@ class CounterStrike2UpdateBot:
 
         logger.info(f'New {post_type} post found latest_{post_type}_post=[{post.title}]')
 
-        setattr(self, f'latest_{post_type}_post', post)
-        await self.send_post_to_chats(context, post=post)
+        setattr(self, f'latest_{post_type}_post', PostHeader.from_post(post))
+        # Queue every delivery before the post is persisted. Should the
+        # process die in between, the post is crawled again as new and the
+        # idempotent enqueue does not queue any chat twice. Once the post is
+        # saved, unfinished deliveries are resumed from the queue.
+        await self.enqueue_post(post)
         await self.post_db.save(post)
+        await self.send_post_to_chats(context, post=post)
 
     async def post_checker(self, context: CallbackContext) -> None:
         # Refresh liveness before crawling so a flaky crawl still proves the
         # job queue is alive; the healthcheck only cares that this loop runs.
         write_heartbeat(settings.HEARTBEAT_FILEPATH)
 
+        if not self.is_seeded:
+            # Without the known latest posts every crawled post would be
+            # sent as new, seed the database first.
+            self.is_seeded = await self._seed_posts_if_empty()
+            if self.is_seeded:
+                await self._load_latest_posts()
+            return
+
         logger.info('Crawling latest posts ...')
+        # Only the items newer than the latest known post are fetched. After
+        # an outage the crawler pages back until it reaches that post.
+        limit = const.SEED_POST_COUNT if self.latest_post is None else None
         try:
-            data = await self.crawler.crawl(count=10)
+            newsitems = [item async for item in self.crawler.crawl_new(self.latest_post, limit=limit)]
+        except CircuitOpenError as e:
+            logger.info(f'Skipping crawl: {e}')
+            return
         except Exception as e:
             logger.error(f'Could not fetch latest posts: {e}')
             return
 
-        cs2posts = CounterStrike2Posts.create(data)
-        cs2posts.validate()
+        cs2posts = CounterStrike2Posts.from_newsitems(newsitems)
+        for post in cs2posts.posts:
+            self.scheduler.observe(post.gid, post.date)
+        await cs2posts.validate()
 
         if cs2posts.is_empty():
             logger.info('No post(s) found in latest crawl.')
             return
 
-        await self._post_checker(context, cs2posts.latest_news_post)
-        await self._post_checker(context, cs2posts.latest_update_post)
-        await self._post_checker(context, cs2posts.latest_external_post)
+        try:
+            await self._post_checker(context, cs2posts.latest_news_post)
+            await self._post_checker(context, cs2posts.latest_update_post)
+            await self._post_checker(context, cs2posts.latest_external_post)
+        except Exception:
+            # The feed would be reported as not modified next cycle and the
+            # unprocessed posts skipped, fetch it in full again instead.
+            self.crawler.invalidate()
+            raise
+
+        # The snapshot already holds the saved posts, this is no query.
+        await self._load_latest_posts()
 
-        self.latest_post = await self.post_db.get_latest_post()
+    async def crawl_job(self, context: CallbackContext) -> None:
+        # Each crawl schedules the next one, the interval follows the hours
+        # in which posts are usually published.
+        try:
+            await self.post_checker(context)
+        finally:
+            delay = self.scheduler.next_delay()
+            breaker = self.crawler.breaker
+            if not breaker.is_closed:
+                # Pick up the recovery of the API once the backoff has passed
+                # instead of waiting for the next regular crawl.
+                delay = min(delay, max(breaker.retry_in, 1))
+            logger.info(f'Next crawl in {delay:.0f}s')
+            if context.job_queue is not None:
+                context.job_queue.run_once(callback=self.crawl_job, when=delay)
+
+    async def get_message(self, post: Post) -> TelegramMessage:
+        # Rendering runs the parsers and resolves URLs over HTTP. Messages
+        # are kept in memory and persisted next to the post, so command
+        # replies and restarts avoid both.
+        msg = self.message_cache.get(post)
+        if msg is not None:
+            return msg
+
+        msg = await self.load_rendered_message(post)
+        if msg is None:
+            msg = await create_message(post, self.document_cache)
+            await self.save_rendered_message(post, msg)
+
+        self.message_cache.put(post, msg)
+        return msg
+
+    async def get_latest_message(self, header: PostHeader) -> TelegramMessage | None:
+        # The contents of the latest posts are not kept in memory, they are
+        # only read if the message is not cached.
+        msg = self.message_cache.get(header)
+        if msg is not None:
+            return msg
+
+        post = await self.post_db.get_post_by_gid(header.gid)
+        if post is None:
+            logger.error(f'Post {header.gid} not found in database.')
+            return None
+        return await self.get_message(post)
 
-    async def send_post_to_chats(self, context: CallbackContext, post: Post) -> None:
-        logger.info('Sending post to chats ...')
+    async def load_rendered_message(self, post: Post) -> TelegramMessage | None:
+        try:
+            data = await self.post_db.get_rendered(post.gid, message_class(post).VERSION)
+            return restore_message(post, data) if data is not None else None
+        except Exception as e:
+            logger.error(f'Could not restore rendered message of post {post.gid}: {e}')
+            return None
 
-        # Send to all chats that are interested in the post type
-        if post.is_news():
-            chats = await self.chat_db.get_running_and_interested_in_news_chats()
-        elif post.is_update():
-            chats = await self.chat_db.get_running_and_interested_in_updates_chats()
-        elif post.is_external():
-            chats = await self.chat_db.get_running_and_interested_in_external_news_chats()
-        else:
+    async def save_rendered_message(self, post: Post, msg: TelegramMessage) -> None:
+        try:
+            await self.post_db.save_rendered(post.gid, msg.VERSION, msg.to_dict())
+        except Exception as e:
+            logger.error(f'Could not persist rendered message of post {post.gid}: {e}')
+
+    async def enqueue_post(self, post: Post) -> bool:
+        post_type = post.get_type()
+        if post_type == PostType.UNKNOWN:
             logger.error(
                 f'Unknown post type {post.to_dict()}. Not sending any message.')
+            return False
+
+        # Queue all chats that are interested in the post type, page by page
+        # so the subscriber list is never held in memory as a whole.
+        queued = 0
+        async for chat_ids in self.chat_db.iter_subscriber_ids(post_type):
+            await self.delivery_db.enqueue(post.gid, chat_ids)
+            queued += len(chat_ids)
+        logger.info(f'Queued post {post.gid} for {queued} chats.')
+        return True
+
+    async def send_post_to_chats(self, context: CallbackContext, post: Post, retry: int = 0) -> None:
+        if not await self.delivery_db.get_pending(post.gid, limit=1):
             return
 
-        msg = await create_message(post=post)
+        logger.info('Sending post to chats ...')
+        msg = await self.get_message(post)
+
+        # All chats share one throttled bot so the global and per chat
+        # message budgets hold across the concurrent sends.
+        bot = self.broadcaster.throttle(context.bot)
+        retry_after = 0
+
+        async def pending() -> AsyncIterator[Delivery]:
+            # Pending deliveries are streamed batch by batch into the
+            # broadcaster, the first chat is served as soon as the first
+            # batch is read.
+            async for delivery in self.delivery_db.iter_pending(
+                    post.gid, batch_size=settings.DELIVERY_BATCH_SIZE):
+                yield delivery
+
+        async def send(delivery: Delivery) -> None:
+            nonlocal retry_after
+            try:
+                await self.deliver(context, msg, delivery, bot)
+            except RetryAfter as e:
+                retry_after = max(retry_after, e.retry_after)
+                raise
+
+        failures = await self.broadcaster.broadcast(pending(), send)
+        if failures > 0 and await self.delivery_db.get_pending(post.gid, limit=1):
+            # Retry the failed chats that have attempts left once Telegram
+            # or the network had time to recover.
+            delay = max(self.delivery_retry_delay(retry), retry_after)
+            logger.error(f'{failures} deliveries of post {post.gid} failed. Retrying in {delay:.0f}s.')
+            self.schedule_deliveries(context, post.gid, delay, retry + 1)
+            return
+
+        await self.delivery_db.remove_finished(post.gid)
+        # Persist again so the media URL checks done while sending are kept.
+        await self.save_rendered_message(post, msg)
+        logger.info(f'Finished sending post {post.gid} to chats.')
 
-        for chat in chats:
-            await self.send_message(context=context, msg=msg, chat=chat)
+    @staticmethod
+    def delivery_retry_delay(retry: int) -> float:
+        return min(settings.DELIVERY_RETRY_DELAY * 2 ** retry, settings.DELIVERY_RETRY_MAX_DELAY)
 
-    async def send_message(self, context: CallbackContext, msg: TelegramMessage, chat: Chat | None) -> None:
+    def schedule_deliveries(self, context: CallbackContext, gid: str, delay: float, retry: int) -> None:
+        if context.job_queue is None:
+            logger.error(f'Job queue is not available. Deliveries of post {gid} resume after a restart.')
+            return
+        name = f'deliveries-{gid}'
+        if context.job_queue.get_jobs_by_name(name):
+            return
+        context.job_queue.run_once(
+            callback=self.retry_deliveries, when=delay, data=(gid, retry), name=name)
+
+    async def retry_deliveries(self, context: CallbackContext) -> None:
+        if context.job is None:
+            return
+        gid, retry = cast(tuple[str, int], context.job.data)
+        post = await self.post_db.get_post_by_gid(gid)
+        if post is None:
+            logger.error(f'Post {gid} of queued deliveries not found. Dropping them.')
+            await self.delivery_db.remove(gid)
+            return
+        logger.info(f'Retrying deliveries of post {gid} ...')
+        await self.send_post_to_chats(context, post=post, retry=retry)
+
+    async def deliver(self, context: CallbackContext, msg: TelegramMessage, delivery: Delivery, bot: Any) -> None:
+        chat = await self.chat_db.get(delivery.chat_id)
+        if chat is None or not chat.is_running:
+            # The chat stopped or left the bot after the post was queued.
+            await self.delivery_db.set_status(delivery, DeliveryStatus.FAILED)
+            return
+
+        queued = QueuedMessage(msg, delivery, self.delivery_db)
+        try:
+            await self.send_message(context=context, msg=queued, chat=chat, bot=bot)
+        except RetryAfter:
+            # Flood control says nothing about the chat, the delivery is
+            # retried without using up one of its attempts.
+            raise
+        except Exception:
+            await self.delivery_db.record_failure(delivery, settings.DELIVERY_MAX_ATTEMPTS)
+            raise
+
+        await self.delivery_db.set_status(delivery, DeliveryStatus.SENT)
+
+    async def resume_deliveries(self, context: CallbackContext) -> None:
+        for gid in await self.delivery_db.get_pending_gids():
+            post = await self.post_db.get_post_by_gid(gid)
+            if post is None:
+                logger.error(f'Post {gid} of queued deliveries not found. Dropping them.')
+                await self.delivery_db.remove(gid)
+                continue
+
+            logger.info(f'Resuming deliveries of post {gid} ...')
+            await self.send_post_to_chats(context, post=post)
+
+    async def send_message(
+        self,
+        context: CallbackContext,
+        msg: TelegramMessage | QueuedMessage,
+        chat: Chat | None,
+        bot: Any | None = None,
+    ) -> None:
 
         if chat is None:
             logger.error('Chat is None. Not sending any message.')
             return
 
+        if bot is None:
+            # The blocks of a message are paced by the chat's rate limit.
+            bot = self.broadcaster.throttle(context.bot)
+
         try:
-            await msg.send(context.bot, chat_id=chat.chat_id)
+            await msg.send(bot, chat_id=chat.chat_id)
         except BadRequest as e:
             logger.error(f'Bad request for {chat.chat_id=}')
             if e.message == 'Chat not found':
@@ -500,7 +767,14 @@ class CounterStrike2UpdateBot:
                 f'Chat migrated we update the chat {chat.chat_id=}')
             logger.error(f"Reason: {e}")
             chat = await self.chat_db.migrate(chat, e.new_chat_id)
-            await self.send_message(context, msg, chat)
+            await self.send_message(context, msg, chat, bot)
+
+    async def maintain_databases(self, context: CallbackContext) -> None:
+        for db in (self.post_db, self.chat_db, self.delivery_db):
+            try:
+                await db.optimize()
+            except Exception as e:
+                logger.error(f'Database maintenance failed for {db.filepath}: {e}')
 
     async def backup_chats_db(self, context: CallbackContext) -> None:
         logger.info('Backing up chat database ...')
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from typing import Any
+
+from cs2posts.db import DeliveryDatabase
+from cs2posts.dto import Delivery
+from cs2posts.msg import TelegramMessage
+
+
+class QueuedMessage:
+    """A message bound to one queued delivery.
+
+    Sending starts at the delivery's block cursor and persists the cursor
+    after every block, so a delivery interrupted by a crash resumes with the
+    first block the chat has not received yet.
+    """
+
+    def __init__(self, msg: TelegramMessage, delivery: Delivery, delivery_db: DeliveryDatabase) -> None:
+        self.__msg = msg
+        self.__delivery = delivery
+        self.__delivery_db = delivery_db
+
+    @property
+    def msg(self) -> TelegramMessage:
+        return self.__msg
+
+    @property
+    def delivery(self) -> Delivery:
+        return self.__delivery
+
+    async def advance(self, block: int) -> None:
+        await self.__delivery_db.advance(self.__delivery, block)
+
+    async def send(self, bot: Any, chat_id: int) -> None:
+        await self.__msg.send(
+            bot, chat_id=chat_id, start=self.__delivery.block, progress=self.advance)
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import logging
+import math
+from collections.abc import Mapping
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+
+
+logger = logging.getLogger(__name__)
+
+
+class CrawlScheduler:
+    """Adapts the crawl interval to the hours Valve usually posts in.
+
+    The post history is counted per weekday and hour (UTC). Every hour of
+    the week is then assigned a polling rate between ``1 / max_interval``
+    and ``1 / min_interval``. Hours in which posts were published get the
+    shorter intervals, quiet hours the longer ones. The rates add up to the
+    same number of crawls per week as polling every ``interval`` seconds,
+    so the API is not called more often than with a fixed interval.
+    """
+
+    SLOTS = 7 * 24
+    # Older posts count less, Valve's release habits change over time.
+    HALF_LIFE_DAYS = 90
+
+    def __init__(self, interval: float, min_interval: float, max_interval: float) -> None:
+        if min(interval, min_interval, max_interval) <= 0:
+            raise ValueError('intervals must be greater than 0')
+        if not min_interval <= interval <= max_interval:
+            logger.warning(
+                f'Crawl interval {interval}s is outside [{min_interval}s, {max_interval}s], '
+                f'widening the bounds to include it')
+
+        self.__interval = interval
+        self.__min_interval, self.__max_interval = crawl_bounds(interval, min_interval, max_interval)
+        self.__weights = [0.0] * self.SLOTS
+        self.__intervals = [float(interval)] * self.SLOTS
+        # Posts already counted, a post crawled again is not counted twice.
+        self.__gids: set[str] = set()
+
+    @property
+    def min_interval(self) -> float:
+        return self.__min_interval
+
+    @property
+    def max_interval(self) -> float:
+        return self.__max_interval
+
+    @property
+    def intervals(self) -> list[float]:
+        return list(self.__intervals)
+
+    @property
+    def interval(self) -> float:
+        """Crawl interval of the current hour."""
+        return self.interval_at(_now())
+
+    @staticmethod
+    def slot(when: datetime) -> int:
+        when = when.astimezone(timezone.utc)
+        return when.weekday() * 24 + when.hour
+
+    def interval_at(self, when: datetime) -> float:
+        return self.__intervals[self.slot(when)]
+
+    def learn(self, dates: Mapping[str, int], now: datetime | None = None) -> None:
+        """Replaces the history with the publication ``dates`` (unix
+        timestamps by gid) of the known posts."""
+        reference = (now or _now()).timestamp()
+        self.__weights = [0.0] * self.SLOTS
+        self.__gids = set(dates)
+        for date in dates.values():
+            age_days = max(reference - date, 0) / 86400
+            self.__weights[self.slot(_from_timestamp(date))] += 0.5 ** (age_days / self.HALF_LIFE_DAYS)
+        self.__update_intervals()
+
+    def observe(self, gid: str, date: int) -> None:
+        """Adds a newly published post to the history, unless it is already
+        part of it."""
+        if gid in self.__gids:
+            return
+        self.__gids.add(gid)
+        self.__weights[self.slot(_from_timestamp(date))] += 1.0
+        self.__update_intervals()
+
+    def next_delay(self, now: datetime | None = None) -> float:
+        """Seconds until the next crawl. A crawl due after the current hour
+        is moved up, so a hot hour is not entered with a cold interval."""
+        now = now or _now()
+        next_hour = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        until_next_hour = (next_hour - now).total_seconds()
+        return min(self.interval_at(now), until_next_hour + self.interval_at(next_hour))
+
+    def __update_intervals(self) -> None:
+        # Posts are rarely published on the exact hour, let them count for
+        # the neighbouring hours as well.
+        smoothed = [
+            self.__weights[i] + 0.5 * (self.__weights[i - 1] + self.__weights[(i + 1) % self.SLOTS])
+            for i in range(self.SLOTS)
+        ]
+        if not any(smoothed):
+            self.__intervals = [float(self.__interval)] * self.SLOTS
+            return
+
+        # Polling at rate r delays a post by 1 / (2r) on average. For a fixed
+        # number of crawls the expected delay is minimal with r ~ sqrt(p).
+        shares = [math.sqrt(weight) for weight in smoothed]
+        rates = _distribute(
+            budget=self.SLOTS / self.__interval,
+            shares=shares,
+            low=1 / self.__max_interval,
+            high=1 / self.__min_interval)
+        self.__intervals = [1 / rate for rate in rates]
+        logger.debug(
+            f'Crawl intervals updated min={min(self.__intervals):.0f}s '
+            f'max={max(self.__intervals):.0f}s')
+
+
+def crawl_bounds(interval: float, min_interval: float, max_interval: float) -> tuple[float, float]:
+    """The bounds of the crawl interval. A configured interval outside the
+    default bounds keeps working, the bounds are widened to include it."""
+    return min(min_interval, interval), max(max_interval, interval)
+
+
+def _distribute(budget: float, shares: list[float], low: float, high: float) -> list[float]:
+    # Every slot gets at least ``low``, the rest of the budget is split by
+    # share. Slots reaching ``high`` are capped and their excess goes to the
+    # remaining slots.
+    rates = [low] * len(shares)
+    open_slots = {i for i, share in enumerate(shares) if share > 0}
+    remaining = budget - low * len(shares)
+    while open_slots and remaining > 1e-12:
+        total = sum(shares[i] for i in open_slots)
+        capped = set()
+        spent = 0.0
+        for i in open_slots:
+            extra = remaining * shares[i] / total
+            if rates[i] + extra >= high:
+                extra = high - rates[i]
+                capped.add(i)
+            rates[i] += extra
+            spent += extra
+        remaining -= spent
+        if not capped:
+            break
+        open_slots -= capped
+    return rates
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _from_timestamp(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
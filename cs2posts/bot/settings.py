@@ -11,6 +11,19 @@ load_dotenv()
 
 TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
 CS2_UPDATE_CHECK_INTERVAL = int(os.getenv('CS2_UPDATE_CHECK_INTERVAL', 900))
+# The crawl interval adapts to the hours Valve usually posts in, within these
+# bounds. On average the bot still crawls every CS2_UPDATE_CHECK_INTERVAL.
+# Set both to CS2_UPDATE_CHECK_INTERVAL to crawl at a fixed interval. An
+# interval outside the bounds widens them.
+CS2_UPDATE_CHECK_MIN_INTERVAL = int(os.getenv('CS2_UPDATE_CHECK_MIN_INTERVAL', 30))
+CS2_UPDATE_CHECK_MAX_INTERVAL = int(os.getenv('CS2_UPDATE_CHECK_MAX_INTERVAL', 1800))
+
+# Circuit breaker of the Steam API. After STEAM_API_FAILURE_THRESHOLD failed
+# crawls no further request is made until the backoff has passed, starting at
+# STEAM_API_BACKOFF_BASE seconds and doubling up to STEAM_API_BACKOFF_MAX.
+STEAM_API_FAILURE_THRESHOLD = int(os.getenv('STEAM_API_FAILURE_THRESHOLD', 3))
+STEAM_API_BACKOFF_BASE = int(os.getenv('STEAM_API_BACKOFF_BASE', 5))
+STEAM_API_BACKOFF_MAX = int(os.getenv('STEAM_API_BACKOFF_MAX', 300))
 
 # Liveness heartbeat consumed by the container HEALTHCHECK. The bot refreshes
 # this file once per crawl cycle; the healthcheck fails it if it goes stale.
@@ -19,12 +32,46 @@ HEARTBEAT_FILEPATH = os.getenv('HEARTBEAT_FILEPATH', '/app/bot.heartbeat')
 # Database filepaths (default: database/sqlite.db for both if None)
 CHAT_DB_FILEPATH = os.getenv('CHAT_DB_FILEPATH', None)
 POST_DB_FILEPATH = os.getenv('POST_DB_FILEPATH', None)
+# The delivery queue has a file of its own (default: database/deliveries.db)
+DELIVERY_DB_FILEPATH = os.getenv('DELIVERY_DB_FILEPATH', None)
+
+# SQLite connection pragmas (see cs2posts/db/pragmas.py) and the interval of
+# the maintenance job running wal_checkpoint and optimize on all databases.
+SQLITE_JOURNAL_MODE = os.getenv('SQLITE_JOURNAL_MODE', 'WAL')
+SQLITE_SYNCHRONOUS = os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL')
+SQLITE_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 64 * 1024 * 1024))
+SQLITE_CACHE_SIZE = int(os.getenv('SQLITE_CACHE_SIZE', -16 * 1024))
+SQLITE_TEMP_STORE = os.getenv('SQLITE_TEMP_STORE', 'MEMORY')
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000))
+SQLITE_MAINTENANCE_INTERVAL = int(os.getenv('SQLITE_MAINTENANCE_INTERVAL', 3600))
 
 # Backup filepaths (default: /backups/backup.db if None)
 CHAT_DB_BACKUP_FILEPATH = os.getenv('CHAT_DB_BACKUP_FILEPATH', None)
 CHAT_DB_BACKUP_INTERVAL = int(os.getenv('CHAT_DB_BACKUP_INTERVAL', 86400))
 CHAT_DB_BACKUP_COUNT = int(os.getenv('CHAT_DB_BACKUP_COUNT', 5))
 
+# Broadcast limits, Telegram allows roughly 30 messages per second in total
+# and about 1 message per second to the same chat. BROADCAST_CONCURRENCY is
+# the number of chats a post is delivered to at the same time.
+TELEGRAM_GLOBAL_MESSAGES_PER_SECOND = float(os.getenv('TELEGRAM_GLOBAL_MESSAGES_PER_SECOND', 30))
+TELEGRAM_CHAT_MESSAGES_PER_SECOND = float(os.getenv('TELEGRAM_CHAT_MESSAGES_PER_SECOND', 1))
+BROADCAST_CONCURRENCY = int(os.getenv('BROADCAST_CONCURRENCY', 64))
+
+# Delivery queue: pending deliveries are read in batches of
+# DELIVERY_BATCH_SIZE and given up after DELIVERY_MAX_ATTEMPTS failures.
+# Failed deliveries are retried after DELIVERY_RETRY_DELAY seconds, doubled
+# on every retry up to DELIVERY_RETRY_MAX_DELAY, or after the time Telegram
+# asks for on flood control. Flood control does not count as a failure.
+DELIVERY_BATCH_SIZE = int(os.getenv('DELIVERY_BATCH_SIZE', 500))
+DELIVERY_MAX_ATTEMPTS = int(os.getenv('DELIVERY_MAX_ATTEMPTS', 3))
+DELIVERY_RETRY_DELAY = int(os.getenv('DELIVERY_RETRY_DELAY', 5))
+DELIVERY_RETRY_MAX_DELAY = int(os.getenv('DELIVERY_RETRY_MAX_DELAY', 300))
+
+# Number of rendered messages kept in memory for the latest post commands.
+MESSAGE_CACHE_SIZE = int(os.getenv('MESSAGE_CACHE_SIZE', 32))
+# Number of parsed post bodies kept in memory to build messages from.
+DOCUMENT_CACHE_SIZE = int(os.getenv('DOCUMENT_CACHE_SIZE', 8))
+
 CHAT_SPAM_INTERVAL_MS = int(os.getenv('CHAT_SPAM_INTERVAL_MS', 750))
 CHAT_BAN_TIMEOUT_SECONDS = int(os.getenv('CHAT_BAN_TIMEOUT_SECONDS', 600))
 CHAT_MAX_STRIKES = int(os.getenv('CHAT_MAX_STRIKES', 3))
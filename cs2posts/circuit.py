@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import logging
+import random
+import time
+from collections.abc import Callable
+from datetime import datetime
+from datetime import timezone
+from enum import Enum
+
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __str__(self) -> str:
+        return str(self.value)
+
+
+class CircuitOpenError(RuntimeError):
+
+    def __init__(self, name: str, retry_in: float) -> None:
+        super().__init__(f'{name} is unavailable, retrying in {retry_in:.0f}s')
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Stops calling a failing service until it had time to recover.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls are rejected right away. Once the backoff has passed it is half
+    open, a single probe decides whether it closes again or reopens with a
+    doubled backoff. The backoff starts at ``base_delay``, is capped at
+    ``max_delay`` and jittered, so restarted bots do not probe in lockstep.
+    """
+
+    def __init__(
+        self,
+        name: str = 'service',
+        *,
+        failure_threshold: int = 3,
+        base_delay: float = 5,
+        max_delay: float = 300,
+        clock: Callable[[], float] = time.monotonic,
+        jitter: Callable[[], float] = random.random,
+    ) -> None:
+        if failure_threshold < 1:
+            raise ValueError('failure_threshold must be greater than 0')
+        if not 0 < base_delay <= max_delay:
+            raise ValueError('delays must satisfy 0 < base_delay <= max_delay')
+
+        self.__name = name
+        self.__failure_threshold = failure_threshold
+        self.__base_delay = base_delay
+        self.__max_delay = max_delay
+        self.__clock = clock
+        self.__jitter = jitter
+
+        self.__state = CircuitState.CLOSED
+        self.__failures = 0
+        self.__opened = 0
+        self.__retry_at = 0.0
+        self.__opened_since: datetime | None = None
+        self.__last_success: datetime | None = None
+        self.__last_failure: datetime | None = None
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def state(self) -> CircuitState:
+        return self.__state
+
+    @property
+    def is_closed(self) -> bool:
+        return self.__state is CircuitState.CLOSED
+
+    @property
+    def failures(self) -> int:
+        """Consecutive failures since the last success."""
+        return self.__failures
+
+    @property
+    def opened_since(self) -> datetime | None:
+        return self.__opened_since
+
+    @property
+    def last_success(self) -> datetime | None:
+        return self.__last_success
+
+    @property
+    def last_failure(self) -> datetime | None:
+        return self.__last_failure
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until the next call is let through."""
+        if self.__state is not CircuitState.OPEN:
+            return 0.0
+        return max(self.__retry_at - self.__clock(), 0.0)
+
+    def allow(self) -> bool:
+        if self.__state is CircuitState.OPEN and self.__clock() >= self.__retry_at:
+            self.__state = CircuitState.HALF_OPEN
+            logger.info(f'Circuit {self.__name} half open, probing')
+        return self.__state is not CircuitState.OPEN
+
+    def check(self) -> None:
+        if not self.allow():
+            raise CircuitOpenError(self.__name, self.retry_in)
+
+    def record_success(self) -> None:
+        if self.__state is not CircuitState.CLOSED:
+            logger.info(f'Circuit {self.__name} closed after {self.__failures} failure(s)')
+        self.__state = CircuitState.CLOSED
+        self.__failures = 0
+        self.__opened = 0
+        self.__opened_since = None
+        self.__last_success = _now()
+
+    def record_failure(self) -> None:
+        self.__failures += 1
+        self.__last_failure = _now()
+        if self.__state is CircuitState.HALF_OPEN or self.__failures >= self.__failure_threshold:
+            self.__open()
+
+    def __open(self) -> None:
+        delay = min(self.__base_delay * 2 ** min(self.__opened, 32), self.__max_delay)
+        # Equal jitter, half of the delay is fixed and half random.
+        delay = delay / 2 + delay / 2 * self.__jitter()
+        self.__opened += 1
+        self.__retry_at = self.__clock() + delay
+        if self.__state is CircuitState.CLOSED:
+            self.__opened_since = self.__last_failure
+        self.__state = CircuitState.OPEN
+        logger.warning(
+            f'Circuit {self.__name} open after {self.__failures} failure(s), retrying in {delay:.0f}s')
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
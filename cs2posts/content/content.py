@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+from dataclasses import asdict
 from dataclasses import dataclass
+from typing import Any
 
 
 @dataclass
@@ -9,6 +11,17 @@ class Content:
     text_pos_end: int
     is_heading: bool
 
+    def to_dict(self) -> dict[str, Any]:
+        return {"type": type(self).__name__, **asdict(self)}
+
+    @staticmethod
+    def from_dict(data: dict[str, Any]) -> Content:
+        data = dict(data)
+        content_type = CONTENT_TYPES[data.pop("type")]
+        if content_type is Carousel:
+            data["images"] = [Image(**image) for image in data["images"]]
+        return content_type(**data)
+
 
 @dataclass
 class Video(Content):
@@ -32,9 +45,92 @@ class Carousel(Content):
     images: list[Image]
 
 
-@dataclass
 class TextBlock(Content):
-    text: str
+    """Text between the media of a post.
+
+    The text is kept as spans into the strings it is made of, mostly the
+    text of the whole post, and only joined when it is read, so extracting
+    a post does not copy its body.
+    """
+
+    def __init__(self, text_pos_start: int, text_pos_end: int, is_heading: bool,
+                 text: str = "") -> None:
+        super().__init__(text_pos_start, text_pos_end, is_heading)
+        self.__spans: list[tuple[str, int, int]] = []
+        self.append(text)
+
+    @classmethod
+    def from_span(cls, source: str, start: int, end: int, is_heading: bool = False) -> TextBlock:
+        """TextBlock of ``source[start:end]`` without surrounding whitespace."""
+        block = cls(start, end, is_heading)
+        # Same as str.strip(), without copying the span
+        while start < end and source[start].isspace():
+            start += 1
+        while end > start and source[end - 1].isspace():
+            end -= 1
+        block.append(source, start, end)
+        return block
+
+    @property
+    def text(self) -> str:
+        if len(self.__spans) == 1:
+            source, start, end = self.__spans[0]
+            if start == 0 and end == len(source):
+                return source
+        return "".join(source[start:end] for source, start, end in self.__spans)
+
+    @text.setter
+    def text(self, text: str) -> None:
+        self.__spans = []
+        self.append(text)
+
+    def append(self, text: str, start: int = 0, end: int | None = None) -> None:
+        end = len(text) if end is None else end
+        if start < end:
+            self.__spans.append((text, start, end))
+
+    def prepend(self, text: str) -> None:
+        if text:
+            self.__spans.insert(0, (text, 0, len(text)))
+
+    def extend(self, other: TextBlock) -> None:
+        self.__spans.extend(other.__spans)
+
+    def is_empty(self) -> bool:
+        return len(self.__spans) == 0
+
+    def startswith(self, prefix: str) -> bool:
+        if self.__spans:
+            source, start, end = self.__spans[0]
+            if end - start >= len(prefix):
+                return source.startswith(prefix, start, end)
+        return self.text.startswith(prefix)
+
+    def endswith(self, suffix: str) -> bool:
+        if self.__spans:
+            source, start, end = self.__spans[-1]
+            if end - start >= len(suffix):
+                return source.endswith(suffix, start, end)
+        return self.text.endswith(suffix)
+
+    def __contains__(self, text: str) -> bool:
+        if len(self.__spans) == 1:
+            source, start, end = self.__spans[0]
+            return source.find(text, start, end) != -1
+        return text in self.text
+
+    def to_dict(self) -> dict[str, Any]:
+        return {**super().to_dict(), "text": self.text}
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TextBlock):
+            return NotImplemented
+        return (self.text_pos_start, self.text_pos_end, self.is_heading, self.text) == \
+            (other.text_pos_start, other.text_pos_end, other.is_heading, other.text)
+
+    def __repr__(self) -> str:
+        return (f"TextBlock(text_pos_start={self.text_pos_start}, text_pos_end={self.text_pos_end}, "
+                f"is_heading={self.is_heading}, text={self.text!r})")
 
 
 @dataclass
@@ -43,3 +139,9 @@ class Youtube(Content):
 
     def get_url(self) -> str:
         return f"https://www.youtube.com/watch?v={self.url}"
+
+
+CONTENT_TYPES: dict[str, type[Content]] = {
+    content_type.__name__: content_type
+    for content_type in (Video, Image, Carousel, TextBlock, Youtube)
+}
@@ -1,11 +1,32 @@
 from __future__ import annotations
 
 import abc
+import re
 from collections.abc import Sequence
 
 from .content import Content
 
 
+def combine_tags(patterns: dict[str, re.Pattern[str]]) -> re.Pattern[str]:
+    """Combine tag patterns into one, each in a group named by its key.
+
+    Every tag starts with "[", which is matched once in front of all
+    alternatives so the regex engine can skip ahead to the next "[". The
+    flags of a pattern only apply to its own alternative. At the same
+    position the first pattern wins.
+    """
+    alternatives = []
+    for name, pattern in patterns.items():
+        if not pattern.pattern.startswith(r"\["):
+            raise ValueError(f"pattern {name} must start with '\\[': {pattern.pattern}")
+        tag = pattern.pattern[2:]
+        flags = "".join(flag for flag, value in (("i", re.I), ("s", re.S)) if pattern.flags & value)
+        if flags:
+            tag = f"(?{flags}:{tag})"
+        alternatives.append(f"(?P<{name}>{tag})")
+    return re.compile(r"\[(?:" + "|".join(alternatives) + ")")
+
+
 class Extractor(abc.ABC):
 
     def __init__(self, text: str) -> None:
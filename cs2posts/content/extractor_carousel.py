@@ -9,17 +9,15 @@ from .extractor_image import ImageExtractor
 
 class CarouselExtractor(Extractor):
 
-    def extract(self) -> list[Carousel]:
-        carousel_pattern = r"\[carousel\](.*?)\[/carousel\]"
-        matches = re.finditer(carousel_pattern, self.text)
+    PATTERN = re.compile(r"\[carousel\](?P<carousel_images>.*?)\[/carousel\]")
 
-        carousel = []
-        for result in matches:
-            images = ImageExtractor(result.group(1)).extract()
-            carousel.append(Carousel(
-                text_pos_start=result.start(),
-                text_pos_end=result.end(),
-                is_heading=False,
-                images=images))
+    @staticmethod
+    def from_match(match: re.Match[str]) -> Carousel:
+        return Carousel(
+            text_pos_start=match.start(),
+            text_pos_end=match.end(),
+            is_heading=False,
+            images=ImageExtractor(match.group("carousel_images")).extract())
 
-        return carousel
+    def extract(self) -> list[Carousel]:
+        return [self.from_match(match) for match in self.PATTERN.finditer(self.text)]
@@ -1,33 +1,94 @@
 from __future__ import annotations
 
+import re
+from collections.abc import Callable
+from collections.abc import Iterator
+
+from .content import Carousel
 from .content import Content
+from .content import Image
+from .content import TextBlock
+from .extractor import combine_tags
 from .extractor import Extractor
 from .extractor_carousel import CarouselExtractor
+from .extractor_image import IMAGE_DEPRECATED_PATTERN
+from .extractor_image import IMAGE_PATTERN
 from .extractor_image import ImageExtractor
-from .extractor_text import TextBlockExtractor
 from .extractor_video import VideoExtractor
 from .extractor_youtube import YoutubeExtractor
 
 
 class ContentExtractor(Extractor):
 
+    # All media tags in one scan. The leftmost tag wins, tags nested in it
+    # (e.g. the images of a carousel) belong to it.
+    PATTERN = combine_tags({
+        "youtube": YoutubeExtractor.PATTERN,
+        "video": VideoExtractor.PATTERN,
+        "carousel": CarouselExtractor.PATTERN,
+        "image": IMAGE_PATTERN,
+        "image_deprecated": IMAGE_DEPRECATED_PATTERN,
+    })
+
+    TOKENS: dict[str, Callable[[re.Match[str]], Content | None]] = {
+        "youtube": YoutubeExtractor.from_match,
+        "video": VideoExtractor.from_match,
+        "carousel": CarouselExtractor.from_match,
+        "image": ImageExtractor.from_match,
+        "image_deprecated": ImageExtractor.from_match,
+    }
+
+    def tokenize(self) -> Iterator[Content]:
+        for match in self.PATTERN.finditer(self.text):
+            assert match.lastgroup is not None
+            token = self.TOKENS[match.lastgroup](match)
+            if token is not None:
+                yield token
+
     def extract(self) -> list[Content]:
-        youtube = YoutubeExtractor(self.text).extract()
-        videos = VideoExtractor(self.text).extract()
-        carousel = CarouselExtractor(self.text).extract()
-        images = ImageExtractor(self.text).extract()
+        media = list(self.tokenize())
+
+        if len(media) == 0:
+            return [TextBlock(0, len(self.text), True, self.text)]
 
-        if len(carousel) > 0:
-            # Remove images that are already in the carousel
-            all_img_urls = {img.url for c in carousel for img in c.images}
-            images = list(filter(lambda img: img.url not in all_img_urls, images))
+        # Images that are already in a carousel are not sent again
+        carousel_urls = {img.url for c in media if isinstance(c, Carousel) for img in c.images}
+        if len(carousel_urls) > 0:
+            media = [c for c in media if not isinstance(c, Image) or c.url not in carousel_urls]
 
-        texts = TextBlockExtractor(self.text, videos, carousel, images, youtube).extract()
+        content: list[Content] = []
+        # Index of the last text block, unless it was already combined
+        last_text_idx: int | None = None
+        text_pos = 0
 
-        content: list[Content] = sorted(
-            [*youtube, *videos, *carousel, *images, *texts],
-            key=lambda content: content.text_pos_start)
+        for c in media:
+            if text_pos != c.text_pos_start:
+                last_text_idx = self.__add_text(content, last_text_idx, text_pos, c.text_pos_start)
+            content.append(c)
+            text_pos = c.text_pos_end
+
+        self.__add_text(content, last_text_idx, text_pos, len(self.text), keep_empty=True)
 
         content[0].is_heading = True
 
         return content
+
+    def __add_text(self, content: list[Content], last_text_idx: int | None,
+                   start: int, end: int, keep_empty: bool = False) -> int | None:
+        block = TextBlock.from_span(self.text, start, end)
+        if block.is_empty() and not keep_empty:
+            return last_text_idx
+
+        if last_text_idx is not None:
+            # New news post if image is clickable and the link contains an
+            # image, the </a> tag would end up as its own TextBlock
+            left = content[last_text_idx]
+            assert isinstance(left, TextBlock)
+            if left.endswith('>') and block.startswith('</a>'):
+                left.text_pos_end = end
+                left.append("\nImage Link")
+                left.extend(block)
+                return None
+
+        content.append(block)
+        return len(content) - 1
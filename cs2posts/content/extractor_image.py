@@ -5,58 +5,76 @@ import re
 from collections.abc import Iterator
 
 from .content import Image
+from .extractor import combine_tags
 from .extractor import Extractor
-from cs2posts.utils import resolve_steam_clan_image_url
 
 logger = logging.getLogger(__name__)
 
 
+IMAGE_DEPRECATED_PATTERN = re.compile(r"\[img\](?P<image_url>.*?)\[/img\]")
+
+# Handle both standard quotes and html-encoded quotes (&quot;)
+# Group 1: Content inside &quot;...&quot; (can contain quotes)
+# Group 2: Content inside "..." (standard)
+IMAGE_PATTERN = re.compile(
+    r'\[img src=(?:&quot;(?P<image_quot>.*?)&quot;|"(?P<image_src>[^"]*)")(?:[^\]]*)\]\[\/img\]',
+    re.I | re.S)
+
+
 def extract_images_deprecated(text: str) -> Iterator:
-    pattern = r"\[img\](.*?)\[/img\]"
-    matches = re.finditer(pattern, text)
-    return matches
+    return IMAGE_DEPRECATED_PATTERN.finditer(text)
 
 
 def extract_images(text: str) -> Iterator:
-    # Handle both standard quotes and html-encoded quotes (&quot;)
-    # Group 1: Content inside &quot;...&quot; (can contain quotes)
-    # Group 2: Content inside "..." (standard)
-    pattern = r'\[img src=(?:&quot;(.*?)&quot;|"([^"]*)")(?:[^\]]*)\]\[\/img\]'
-    matches = re.finditer(pattern, text, re.I | re.S)
-    return matches
+    return IMAGE_PATTERN.finditer(text)
 
 
 class ImageExtractor(Extractor):
 
-    def extract(self) -> list[Image]:
-        matches = extract_images(self.text)
-        matches_deprecated = extract_images_deprecated(self.text)
-
-        # Merge both iterators
-        all_matches = list(matches) + list(matches_deprecated)
+    # Both formats in one scan, the deprecated one is tried second.
+    PATTERN = combine_tags({
+        "image": IMAGE_PATTERN,
+        "image_deprecated": IMAGE_DEPRECATED_PATTERN,
+    })
+
+    @staticmethod
+    def from_match(match: re.Match[str]) -> Image | None:
+        # Get the URL from the correct capture group
+        if match.lastgroup == "image_deprecated":
+            src_url = match.group("image_url")
+        else:
+            src_url = match.group("image_quot") or match.group("image_src")
+        if not src_url:
+            return None
+
+        html_encoded_quot = "&quot;"
+        # {STEAM_CLAN_IMAGE} placeholders are kept, they are resolved
+        # for the whole post at once after extraction.
+        url = src_url.replace(html_encoded_quot, "")
+
+        if url == "":
+            logger.warning("Image URL is empty in text!")
+            return None
+
+        return Image(
+            text_pos_start=match.start(),
+            text_pos_end=match.end(),
+            is_heading=False,
+            url=url)
 
+    def extract(self) -> list[Image]:
         images = []
-        for result in all_matches:
+        images_deprecated = []
 
-            # Get the URL from the correct capture group
-            src_url = result.group(1) or result.group(2)
-            if not src_url:
+        # Images in the current format come first, as they did when both
+        # formats were searched one after the other.
+        for match in self.PATTERN.finditer(self.text):
+            image = self.from_match(match)
+            if image is None:
                 continue
+            if match.lastgroup == "image_deprecated":
+                images_deprecated.append(image)
+            else:
+                images.append(image)
 
-            html_encoded_quot = "&quot;"
-            if html_encoded_quot in src_url:
-                src_url = src_url.replace(html_encoded_quot, "")
-
-            url = resolve_steam_clan_image_url(src_url)
-
-            if url == "":
-                logger.warning("Image URL is empty in text!")
-                continue
-
-            images.append(Image(
-                text_pos_start=result.start(),
-                text_pos_end=result.end(),
-                is_heading=False,
-                url=url))
-
-        return images
+        return images + images_deprecated
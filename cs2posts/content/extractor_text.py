@@ -1,105 +0,0 @@
-from __future__ import annotations
-
-from collections.abc import Sequence
-
-from .content import Content
-from .content import TextBlock
-from .extractor import Extractor
-from .extractor_carousel import CarouselExtractor
-from .extractor_image import ImageExtractor
-from .extractor_video import VideoExtractor
-from .extractor_youtube import YoutubeExtractor
-
-
-class TextBlockExtractor(Extractor):
-
-    def __init__(self, text: str,
-                 videos: Sequence[Content] | None = None,
-                 carousel: Sequence[Content] | None = None,
-                 images: Sequence[Content] | None = None,
-                 youtube: Sequence[Content] | None = None) -> None:
-        super().__init__(text)
-
-        videos = VideoExtractor(self.text).extract() if videos is None else videos
-        carousel = CarouselExtractor(self.text).extract() if carousel is None else carousel
-        images = ImageExtractor(self.text).extract() if images is None else images
-        youtube = YoutubeExtractor(self.text).extract() if youtube is None else youtube
-
-        self.__content = sorted([
-            *videos,
-            *youtube,
-            *carousel,
-            *images,
-        ], key=lambda content: content.text_pos_start)
-
-    def _combine(self, text_blocks: list[TextBlock]) -> list[TextBlock]:
-        if len(text_blocks) == 0:
-            return text_blocks
-
-        if len(text_blocks) == 1:
-            return text_blocks
-
-        blocks = []
-
-        i = 0
-        while i < len(text_blocks):
-            left = text_blocks[i]
-            idx_right = i + 1
-            if idx_right >= len(text_blocks):
-                blocks.append(left)
-                break
-            right = text_blocks[idx_right]
-
-            if left.text.endswith('>') and right.text.startswith('</a>'):
-                blocks.append(TextBlock(
-                    text_pos_start=left.text_pos_start,
-                    text_pos_end=right.text_pos_end,
-                    is_heading=left.is_heading,
-                    text=left.text + "\nImage Link" + right.text))
-                i += 2
-                continue
-
-            blocks.append(left)
-            i += 1
-
-        return blocks
-
-    def extract(self) -> list[TextBlock]:
-
-        if len(self.__content) == 0:
-            return [TextBlock(0, len(self.text), False, self.text)]
-
-        blocks = []
-        text_pos = 0
-
-        for c in self.__content:
-            if c.text_pos_start == 0:
-                text_pos = c.text_pos_end
-                continue
-
-            if text_pos == c.text_pos_start:
-                text_pos = c.text_pos_end
-                continue
-
-            text = self.text[text_pos:c.text_pos_start].strip()
-            if len(text) == 0:
-                text_pos = c.text_pos_end
-                continue
-
-            blocks.append(TextBlock(
-                text_pos_start=text_pos,
-                text_pos_end=c.text_pos_start,
-                is_heading=False,
-                text=text))
-
-            text_pos = c.text_pos_end
-
-        blocks.append(TextBlock(
-            text_pos_start=text_pos,
-            text_pos_end=len(self.text),
-            is_heading=False,
-            text=self.text[text_pos:len(self.text)].strip()))
-
-        # New news post if image is clickable and the link contains an image
-        # We end up with a </a> tag as own TextBlock
-        return self._combine(blocks)
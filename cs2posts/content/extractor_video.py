@@ -5,14 +5,13 @@ import re
 
 from .content import Video
 from .extractor import Extractor
-from cs2posts.utils import resolve_steam_clan_image_url
 
 
 class VideoExtractor(Extractor):
 
     _BOOL_TRUE = {"1", "true", "yes", "on"}
     _BOOL_FALSE = {"0", "false", "no", "off"}
-    _VIDEO_RE = re.compile(r"\[video\b(?P<attrs>.*?)\](?P<inner>.*?)\[/video\]", re.I | re.S)
+    PATTERN = re.compile(r"\[video\b(?P<video_attrs>.*?)\](?P<video_inner>.*?)\[/video\]", re.I | re.S)
     _URL_IN_TEXT_RE = re.compile(r'(https?://[^\s"<>\]]+)', re.I)
     _ATTRS_MIXED_RE = re.compile(r"""
         (\w+)                                 # key
@@ -25,21 +24,23 @@ class VideoExtractor(Extractor):
         )
     """, re.I | re.S | re.X)
 
-    def _to_bool(self, s: str | None) -> bool | None:
+    @classmethod
+    def _to_bool(cls, s: str | None) -> bool | None:
         if s is None:
             return None
         v = s.strip().lower()
-        if v in self._BOOL_TRUE:
+        if v in cls._BOOL_TRUE:
             return True
-        if v in self._BOOL_FALSE:
+        if v in cls._BOOL_FALSE:
             return False
         return None
 
-    def _extract_url(self, val: str) -> str | None:
+    @classmethod
+    def _extract_url(cls, val: str) -> str | None:
         href = re.search(r'href=[\'"]([^\'"]+)[\'"]', val, re.I)
         if href:
             return href.group(1).strip()
-        m = self._URL_IN_TEXT_RE.search(val)
+        m = cls._URL_IN_TEXT_RE.search(val)
         if m:
             return m.group(1).strip()
         # Return raw value if it's a non-empty path (e.g., {STEAM_CLAN_IMAGE}/...)
@@ -48,43 +49,36 @@ class VideoExtractor(Extractor):
             return None
         return stripped
 
-    def _parse_attrs(self, attrs_raw: str) -> dict[str, str]:
+    @classmethod
+    def _parse_attrs(cls, attrs_raw: str) -> dict[str, str]:
         out: dict[str, str] = {}
-        for m in self._ATTRS_MIXED_RE.finditer(attrs_raw):
+        for m in cls._ATTRS_MIXED_RE.finditer(attrs_raw):
             key = m.group(1).strip().lower()
             # pick the first non-None alternative group (2..6)
             val = next(g for g in m.groups()[1:] if g is not None)
             out[key] = html.unescape(val.strip())
         return out
 
-    def extract(self) -> list[Video]:
-        videos = []
-
-        for m in re.finditer(self._VIDEO_RE, self.text):
-            attrs_raw = m.group("attrs") or ""
-            attrs = self._parse_attrs(attrs_raw)
-
-            # Pull urls (handles raw url or <a href="...">)
-            webm_url = self._extract_url(attrs.get("webm", "")) if "webm" in attrs else ""
-            mp4_url = self._extract_url(attrs.get("mp4", "")) if "mp4" in attrs else ""
-            poster_url = self._extract_url(attrs.get("poster", "")) if "poster" in attrs else ""
+    @classmethod
+    def from_match(cls, match: re.Match[str]) -> Video:
+        attrs_raw = match.group("video_attrs") or ""
+        attrs = cls._parse_attrs(attrs_raw)
 
-            if webm_url:
-                webm_url = resolve_steam_clan_image_url(webm_url)
-            if mp4_url:
-                mp4_url = resolve_steam_clan_image_url(mp4_url)
-            if poster_url:
-                poster_url = resolve_steam_clan_image_url(poster_url)
+        # Pull urls (handles raw url or <a href="...">)
+        webm_url = cls._extract_url(attrs.get("webm", "")) if "webm" in attrs else ""
+        mp4_url = cls._extract_url(attrs.get("mp4", "")) if "mp4" in attrs else ""
+        poster_url = cls._extract_url(attrs.get("poster", "")) if "poster" in attrs else ""
 
-            videos.append(Video(
-                text_pos_start=m.start(),
-                text_pos_end=m.end(),
-                webm=webm_url,
-                mp4=mp4_url,
-                poster=poster_url,
-                autoplay=self._to_bool(attrs.get("autoplay")),
-                controls=self._to_bool(attrs.get("controls")),
-                is_heading=False,
-            ))
+        return Video(
+            text_pos_start=match.start(),
+            text_pos_end=match.end(),
+            webm=webm_url,
+            mp4=mp4_url,
+            poster=poster_url,
+            autoplay=cls._to_bool(attrs.get("autoplay")),
+            controls=cls._to_bool(attrs.get("controls")),
+            is_heading=False,
+        )
 
-        return videos
+    def extract(self) -> list[Video]:
+        return [self.from_match(match) for match in self.PATTERN.finditer(self.text)]
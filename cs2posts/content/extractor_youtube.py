@@ -8,17 +8,15 @@ from .extractor import Extractor
 
 class YoutubeExtractor(Extractor):
 
-    def extract(self) -> list[Youtube]:
-        videos = []
-
-        youtube_pattern = r"\[previewyoutube=([^;]+);.*?\]\[/previewyoutube\]"
-        matches = re.finditer(youtube_pattern, self.text)
+    PATTERN = re.compile(r"\[previewyoutube=(?P<youtube_url>[^;]+);.*?\]\[/previewyoutube\]")
 
-        for result in matches:
-            videos.append(Youtube(
-                text_pos_start=result.start(),
-                text_pos_end=result.end(),
-                is_heading=False,
-                url=result.group(1)))
+    @staticmethod
+    def from_match(match: re.Match[str]) -> Youtube:
+        return Youtube(
+            text_pos_start=match.start(),
+            text_pos_end=match.end(),
+            is_heading=False,
+            url=match.group("youtube_url"))
 
-        return videos
+    def extract(self) -> list[Youtube]:
+        return [self.from_match(match) for match in self.PATTERN.finditer(self.text)]
@@ -1,16 +1,23 @@
 from __future__ import annotations
 
-import asyncio
 import json
 import logging
+from collections.abc import AsyncIterator
 from typing import Any
 
-import requests
+import httpx
+
+from cs2posts.circuit import CircuitBreaker
+from cs2posts.dto.post import Post
+from cs2posts.dto.post import PostHeader
+from cs2posts.resolver import HTTP2_AVAILABLE
 
 logger = logging.getLogger(__name__)
 
 
 CRAWLER_REQUEST_TIMEOUT = 3
+# A half open circuit is probed with a single short item before crawling.
+CRAWLER_PROBE_TIMEOUT = 1
 
 
 class CounterStrike2Crawler:
@@ -23,39 +30,184 @@ class CounterStrike2Crawler:
         "&maxlength=0"
     )
 
-    def __init__(self) -> None:
+    PROBE_URL = (
+        "https://api.steampowered.com/ISteamNews/GetNewsForApp/v0002/"
+        "?appid=730"
+        "&count=1"
+        "&maxlength=1"
+    )
+
+    def __init__(
+            self,
+            client: httpx.AsyncClient | None = None,
+            breaker: CircuitBreaker | None = None) -> None:
         self.url = self.BASE_URL
+        self.__client = client
+        self.__breaker = breaker or CircuitBreaker('Steam API')
+        # ETag and Last-Modified of the last successful response per URL.
+        self.__validators: dict[str, dict[str, str]] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Created lazily, the client has to live on the loop that uses it.
+        if self.__client is None:
+            self.__client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=CRAWLER_REQUEST_TIMEOUT,
+                limits=httpx.Limits(max_connections=2, max_keepalive_connections=2))
+        return self.__client
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        return self.__breaker
+
+    async def aclose(self) -> None:
+        client, self.__client = self.__client, None
+        if client is not None:
+            await client.aclose()
+
+    def invalidate(self) -> None:
+        """Forgets the cached validators, the next crawl fetches the full
+        feed again."""
+        self.__validators.clear()
 
     def _validate_args(self, *, count: int) -> None:
         if count < 0:
             raise ValueError('count must be greater than or equal to 0')
 
-    async def crawl(self, *, count: int | None = None) -> dict[str, Any]:
+    async def crawl(self, *, count: int | None = None) -> dict[str, Any] | None:
         """Fetch the latest CS2 news posts.
 
-        This method is asynchronous for integration with the rest of the bot, but
-        it uses a threadpool to keep the HTTP call non-blocking.
+        The request is conditional on the ETag and Last-Modified of the
+        previous response. Returns None if the feed has not changed since,
+        in that case only the headers were transferred.
         """
 
         if count is None:
             count = 100
 
         self._validate_args(count=count)
+        return await self._fetch(self.url % count, conditional=True)
+
+    async def crawl_new(
+            self,
+            since: Post | PostHeader | None = None,
+            *,
+            page_size: int = 10,
+            limit: int | None = None) -> AsyncIterator[dict[str, Any]]:
+        """Yield the news items published after ``since``, newest first.
+
+        Pages backwards through the feed with ``enddate`` and stops at the
+        first item that is ``since`` or older than it, so every missed item
+        is found however long the bot was offline. ``limit`` bounds the
+        number of items, e.g. while no post is known yet. Only the first page
+        is conditional, if the feed has not changed nothing is yielded.
+        """
+
+        if page_size < 1:
+            raise ValueError('page_size must be greater than 0')
+
+        seen: set[str] = set()
+        enddate: int | None = None
+        count = page_size
+        while True:
+            url = self.url % count
+            if enddate is not None:
+                url += f"&enddate={enddate}"
+
+            data = await self._fetch(url, conditional=enddate is None)
+            items = _newsitems(data)
+            for item in items:
+                if item['gid'] in seen:
+                    continue
+                if since is not None and (item['gid'] == since.gid or item['date'] < since.date):
+                    return
+                seen.add(item['gid'])
+                yield item
+                if limit is not None and len(seen) >= limit:
+                    return
+
+            if len(items) < count:
+                return
+
+            # enddate is inclusive, the next page starts with the items of the
+            # oldest second again. Should a single second hold more items than
+            # a page, grow the page until they all fit.
+            oldest = items[-1]['date']
+            count = count * 2 if oldest == enddate else page_size
+            enddate = oldest
+
+    async def _fetch(self, url: str, *, conditional: bool) -> dict[str, Any] | None:
+        # Raises CircuitOpenError without a request while the API is down.
+        self.__breaker.check()
+        if not self.__breaker.is_closed:
+            await self.__probe()
 
-        url = self.url % count
         try:
-            response = await asyncio.to_thread(
-                requests.get, url, timeout=CRAWLER_REQUEST_TIMEOUT)
+            data = await self.__fetch(url, conditional=conditional)
+        except Exception:
+            self.__breaker.record_failure()
+            raise
+
+        self.__breaker.record_success()
+        return data
+
+    async def __probe(self) -> None:
+        try:
+            response = await self.client.get(self.PROBE_URL, timeout=CRAWLER_PROBE_TIMEOUT)
+            response.raise_for_status()
+        except Exception as e:
+            logger.warning(f'Steam API is still unavailable: {e}')
+            self.__breaker.record_failure()
+            raise
+        self.__breaker.record_success()
+
+    async def __fetch(self, url: str, *, conditional: bool) -> dict[str, Any] | None:
+        headers = self.__validators.get(url) if conditional else None
+        try:
+            response = await self.client.get(url, headers=headers)
         except Exception:
             logger.exception('Could not fetch data from Steam API')
             raise
 
-        if not response.ok:
+        if response.status_code == httpx.codes.NOT_MODIFIED:
+            logger.info('Steam API reports no changes since the last crawl')
+            return None
+
+        if not response.is_success:
             raise RuntimeError(
                 f'Could not fetch data, received response code={response.status_code}')
 
         try:
-            return json.loads(response.text)
+            data = json.loads(response.content)
         except json.JSONDecodeError as exc:
             logger.exception('Received invalid JSON from Steam API: %s', exc)
             raise
+
+        if conditional:
+            self.__store_validators(url, response.headers)
+        return data
+
+    def __store_validators(self, url: str, headers: httpx.Headers) -> None:
+        validators = {}
+        if 'etag' in headers:
+            validators['If-None-Match'] = headers['etag']
+        if 'last-modified' in headers:
+            validators['If-Modified-Since'] = headers['last-modified']
+
+        if validators:
+            self.__validators[url] = validators
+        else:
+            self.__validators.pop(url, None)
+
+
+def _newsitems(data: dict[str, Any] | None) -> list[dict[str, Any]]:
+    if not isinstance(data, dict):
+        return []
+    appnews = data.get('appnews')
+    if not isinstance(appnews, dict):
+        return []
+    newsitems = appnews.get('newsitems')
+    if not isinstance(newsitems, list):
+        return []
+    return [item for item in newsitems if isinstance(item, dict)]
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from collections.abc import Callable
 from typing import Any
 
 from cs2posts.dto.post import FeedType
 from cs2posts.dto.post import Post
-from cs2posts.utils import resolve_steam_clan_image_url
+from cs2posts.dto.post import PostType
+from cs2posts.resolver import resolve_steam_clan_images
 
 
 logger = logging.getLogger(__name__)
@@ -16,9 +17,17 @@ class CounterStrike2Posts:
 
     INITIAL_EPOCH_TIME_CS2 = 1679503828
 
-    def __init__(self, posts: dict[str, Any]) -> None:
+    def __init__(self, posts: dict[str, Any] | None) -> None:
 
         self.__posts: list[Post] = []
+        # Every post is classified once, the per type lists keep the order of
+        # __posts (newest first) and only hold posts published since CS2.
+        self.__posts_by_type: dict[PostType, list[Post]] = {post_type: [] for post_type in PostType}
+        self.__posts_by_gid: dict[str, Post] = {}
+        self.__post_types: dict[str, PostType] = {}
+        # Posts of the external feed, whatever their type. An update
+        # published there is in this list and in the update posts.
+        self.__external_posts: list[Post] = []
 
         if posts is None or posts == {}:
             return
@@ -50,30 +59,44 @@ class CounterStrike2Posts:
             self.__posts.append(Post.from_dict(post))
 
         self.__posts.sort(key=lambda x: x.date, reverse=True)
+        self.__index()
+
+    def __index(self) -> None:
+        for post in self.__posts:
+            post_type = post.get_type()
+            self.__posts_by_gid[post.gid] = post
+            self.__post_types[post.gid] = post_type
+            if post.date >= self.INITIAL_EPOCH_TIME_CS2:
+                self.__posts_by_type[post_type].append(post)
+                if post.is_external():
+                    self.__external_posts.append(post)
 
     @classmethod
-    def create(cls, posts: dict[str, Any]) -> CounterStrike2Posts:
+    def create(cls, posts: dict[str, Any] | None) -> CounterStrike2Posts:
         return cls(posts)
 
+    @classmethod
+    def from_newsitems(cls, newsitems: list[dict[str, Any]]) -> CounterStrike2Posts:
+        return cls({'appnews': {'newsitems': newsitems}})
+
     @property
     def posts(self) -> list[Post]:
         return self.__posts
 
-    def _posts_since_cs2(self, predicate: Callable[[Post], bool]) -> list[Post]:
-        return [post for post in self.__posts
-                if post.date >= self.INITIAL_EPOCH_TIME_CS2 and predicate(post)]
+    def posts_of_type(self, post_type: PostType) -> list[Post]:
+        return self.__posts_by_type[post_type]
 
     @property
     def news_posts(self) -> list[Post]:
-        return self._posts_since_cs2(Post.is_news)
+        return self.__posts_by_type[PostType.NEWS]
 
     @property
     def update_posts(self) -> list[Post]:
-        return self._posts_since_cs2(Post.is_update)
+        return self.__posts_by_type[PostType.UPDATE]
 
     @property
     def external_posts(self) -> list[Post]:
-        return self._posts_since_cs2(Post.is_external)
+        return self.__external_posts
 
     @property
     def posts_json(self) -> list[dict]:
@@ -83,17 +106,25 @@ class CounterStrike2Posts:
     def latest(self) -> Post | None:
         return self.__posts[0] if self.__posts else None
 
+    def latest_of_type(self, post_type: PostType) -> Post | None:
+        posts = self.__posts_by_type[post_type]
+        return posts[0] if posts else None
+
+    def oldest_of_type(self, post_type: PostType) -> Post | None:
+        posts = self.__posts_by_type[post_type]
+        return posts[-1] if posts else None
+
     @property
     def latest_news_post(self) -> Post | None:
-        return self.news_posts[0] if self.news_posts else None
+        return self.latest_of_type(PostType.NEWS)
 
     @property
     def latest_update_post(self) -> Post | None:
-        return self.update_posts[0] if self.update_posts else None
+        return self.latest_of_type(PostType.UPDATE)
 
     @property
     def latest_external_post(self) -> Post | None:
-        return self.external_posts[0] if self.external_posts else None
+        return self.__external_posts[0] if self.__external_posts else None
 
     @property
     def oldest(self) -> Post | None:
@@ -101,29 +132,37 @@ class CounterStrike2Posts:
 
     @property
     def oldest_news_post(self) -> Post | None:
-        return self.news_posts[-1] if self.news_posts else None
+        return self.oldest_of_type(PostType.NEWS)
 
     @property
     def oldest_update_post(self) -> Post | None:
-        return self.update_posts[-1] if self.update_posts else None
+        return self.oldest_of_type(PostType.UPDATE)
 
     @property
     def oldest_external_post(self) -> Post | None:
-        return self.external_posts[-1] if self.external_posts else None
+        return self.__external_posts[-1] if self.__external_posts else None
 
-    def validate(self) -> None:
-        for post in self.news_posts:
-            post.contents = resolve_steam_clan_image_url(post.contents)
+    def get(self, gid: str) -> Post | None:
+        return self.__posts_by_gid.get(gid)
 
-    def is_latest_post_news(self) -> bool:
+    async def validate(self) -> None:
+        # The CDN host behind {STEAM_CLAN_IMAGE} is probed once and cached
+        # by the resolver, the posts only substitute it.
+        posts = self.news_posts
+        contents = await asyncio.gather(*(resolve_steam_clan_images(post.contents) for post in posts))
+        for post, text in zip(posts, contents):
+            post.contents = text
+
+    def _is_latest_post(self, post_type: PostType) -> bool:
         if self.latest is None:
             return False
-        return self.latest.is_news()
+        return self.__post_types[self.latest.gid] is post_type
+
+    def is_latest_post_news(self) -> bool:
+        return self._is_latest_post(PostType.NEWS)
 
     def is_latest_post_update(self) -> bool:
-        if self.latest is None:
-            return False
-        return self.latest.is_update()
+        return self._is_latest_post(PostType.UPDATE)
 
     def is_latest_post_external(self) -> bool:
         if self.latest is None:
@@ -135,3 +174,7 @@ class CounterStrike2Posts:
 
     def __len__(self) -> int:
         return len(self.__posts)
+
+    def __contains__(self, item: object) -> bool:
+        gid = item.gid if isinstance(item, Post) else item
+        return isinstance(gid, str) and gid in self.__posts_by_gid
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 from .db_chats import ChatDatabase
+from .db_deliveries import DeliveryDatabase
 from .db_posts import PostDatabase
 from .db_sqlite import SQLite
+from .pragmas import PragmaProfile
 
 __all__ = [
     'PostDatabase',
     'ChatDatabase',
+    'DeliveryDatabase',
     'SQLite',
+    'PragmaProfile',
 ]
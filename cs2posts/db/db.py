@@ -34,3 +34,7 @@ class Database(abc.ABC):
     @abc.abstractmethod
     async def backup(self, filepath: Path) -> None:
         ...  # pragma: no cover
+
+    @abc.abstractmethod
+    async def close(self) -> None:
+        ...  # pragma: no cover
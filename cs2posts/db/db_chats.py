@@ -1,16 +1,23 @@
 from __future__ import annotations
 
 import json
+from collections.abc import AsyncIterator
 from pathlib import Path
 
 from .db_sqlite import SQLite
 from cs2posts.dto import Chat
+from cs2posts.dto.post import PostType
 
 
 class ChatDatabase(SQLite):
 
-    def __init__(self, filepath: Path | None) -> None:
-        super().__init__(filepath)
+    # Interest column that subscribes a chat to a post type.
+    SUBSCRIBER_COLUMNS = {
+        PostType.NEWS: "is_news_interested",
+        PostType.UPDATE: "is_update_interested",
+        PostType.EXTERNAL: "is_external_news_interested",
+    }
+    SUBSCRIBER_PAGE_SIZE = 1000
 
     COLUMNS = (
         "chat_id",
@@ -54,6 +61,13 @@ class ChatDatabase(SQLite):
                 last_activity TEXT NOT NULL
             )
         """)
+        # One partial index per post type holding only the chat ids of its
+        # subscribers, so a broadcast reads the index instead of the table.
+        for post_type, column in self.SUBSCRIBER_COLUMNS.items():
+            await self._execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_chats_{post_type}_subscribers
+                ON chats (chat_id) WHERE is_running = 1 AND {column} = 1
+            """)
 
     async def _insert(self, chat: Chat, *, replace: bool) -> None:
         verb = "INSERT OR REPLACE" if replace else "INSERT"
@@ -135,14 +149,29 @@ class ChatDatabase(SQLite):
     async def get_interested_in_external_news_chats(self) -> list[Chat]:
         return await self._query_chats("is_external_news_interested = 1")
 
-    async def get_running_and_interested_in_news_chats(self) -> list[Chat]:
-        return await self._query_chats("is_running = 1 AND is_news_interested = 1")
-
-    async def get_running_and_interested_in_updates_chats(self) -> list[Chat]:
-        return await self._query_chats("is_running = 1 AND is_update_interested = 1")
-
-    async def get_running_and_interested_in_external_news_chats(self) -> list[Chat]:
-        return await self._query_chats("is_running = 1 AND is_external_news_interested = 1")
+    def _subscriber_condition(self, post_type: PostType) -> str:
+        column = self.SUBSCRIBER_COLUMNS.get(post_type)
+        if column is None:
+            raise ValueError(f"No subscribers for post type {post_type}")
+        # Must match the WHERE clause of the partial index to use it.
+        return f"is_running = 1 AND {column} = 1"
+
+    async def iter_subscriber_ids(
+        self,
+        post_type: PostType,
+        page_size: int | None = None,
+    ) -> AsyncIterator[list[int]]:
+        """Yield the ids of running chats subscribed to ``post_type`` in pages.
+
+        Only the partial index is read and no ``Chat`` objects are built;
+        memory stays bounded by ``page_size`` however many chats subscribe.
+        """
+        if page_size is None:
+            page_size = self.SUBSCRIBER_PAGE_SIZE
+        async for rows in self._iter_rows(
+                "SELECT chat_id FROM chats", "chat_id",
+                self._subscriber_condition(post_type), batch_size=page_size):
+            yield [row[0] for row in rows]
 
     async def contains(self, chat: Chat) -> bool:
         return await self.exists(chat.chat_id)
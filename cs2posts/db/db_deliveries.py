@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from collections.abc import Iterable
+
+from .db_sqlite import SQLite
+from cs2posts.dto import Delivery
+from cs2posts.dto import DeliveryStatus
+
+
+class DeliveryDatabase(SQLite):
+    """Durable queue with one row per (post, chat) delivery.
+
+    The queue is written to for every chat a post is sent to, so it has a
+    file of its own instead of a second connection to the posts database.
+    """
+
+    DEFAULT_FILENAME = "deliveries.db"
+
+    async def create_table(self) -> None:
+        await self._execute("""
+            CREATE TABLE IF NOT EXISTS deliveries (
+                gid TEXT NOT NULL,
+                chat_id INTEGER NOT NULL,
+                block INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (gid, chat_id)
+            )
+        """)
+        await self._execute("""
+            CREATE INDEX IF NOT EXISTS idx_deliveries_status_gid
+            ON deliveries (status, gid)
+        """)
+
+    async def is_empty(self, table_name: str | None = None) -> bool:
+        return await super().is_empty('deliveries')
+
+    async def enqueue(self, gid: str, chat_ids: Iterable[int]) -> None:
+        # Existing rows keep their progress, which makes enqueueing the same
+        # post again (e.g. after a crash) a no-op for chats already queued.
+        await self._execute_many(
+            "INSERT OR IGNORE INTO deliveries (gid, chat_id, block, status, attempts) VALUES (?, ?, 0, ?, 0)",
+            ((gid, chat_id, str(DeliveryStatus.PENDING)) for chat_id in chat_ids))
+
+    async def get(self, gid: str, chat_id: int) -> Delivery | None:
+        row = await self._fetch_one(
+            "SELECT * FROM deliveries WHERE gid = ? AND chat_id = ?", (gid, chat_id))
+        return Delivery.from_dict(dict(row)) if row is not None else None
+
+    async def get_pending(self, gid: str, limit: int) -> list[Delivery]:
+        rows = await self._fetch_all(
+            "SELECT * FROM deliveries WHERE status = ? AND gid = ? ORDER BY chat_id LIMIT ?",
+            (str(DeliveryStatus.PENDING), gid, limit))
+        return [Delivery.from_dict(dict(row)) for row in rows]
+
+    async def iter_pending(self, gid: str, batch_size: int | None = None) -> AsyncIterator[Delivery]:
+        async for rows in self._iter_rows(
+                "SELECT * FROM deliveries", "chat_id", "status = ? AND gid = ?",
+                (str(DeliveryStatus.PENDING), gid), batch_size):
+            for row in rows:
+                yield Delivery.from_dict(dict(row))
+
+    async def get_pending_gids(self) -> list[str]:
+        rows = await self._fetch_all(
+            "SELECT DISTINCT gid FROM deliveries WHERE status = ?",
+            (str(DeliveryStatus.PENDING),))
+        return [row['gid'] for row in rows]
+
+    async def count_pending(self) -> int:
+        count = await self._scalar(
+            "SELECT COUNT(*) FROM deliveries WHERE status = ?",
+            (str(DeliveryStatus.PENDING),))
+        return count if count is not None else 0
+
+    async def advance(self, delivery: Delivery, block: int) -> None:
+        delivery.block = block
+        await self._execute(
+            "UPDATE deliveries SET block = ? WHERE gid = ? AND chat_id = ?",
+            (block, delivery.gid, delivery.chat_id))
+
+    async def set_status(self, delivery: Delivery, status: DeliveryStatus) -> None:
+        delivery.status = status
+        await self._execute(
+            "UPDATE deliveries SET status = ? WHERE gid = ? AND chat_id = ?",
+            (str(status), delivery.gid, delivery.chat_id))
+
+    async def record_failure(self, delivery: Delivery, max_attempts: int) -> None:
+        delivery.attempts += 1
+        if delivery.attempts >= max_attempts:
+            delivery.status = DeliveryStatus.FAILED
+        await self._execute(
+            "UPDATE deliveries SET attempts = ?, status = ? WHERE gid = ? AND chat_id = ?",
+            (delivery.attempts, str(delivery.status), delivery.gid, delivery.chat_id))
+
+    async def remove_finished(self, gid: str) -> None:
+        await self._execute(
+            "DELETE FROM deliveries WHERE gid = ? AND status != ?",
+            (gid, str(DeliveryStatus.PENDING)))
+
+    async def remove(self, gid: str) -> None:
+        await self._execute("DELETE FROM deliveries WHERE gid = ?", (gid,))
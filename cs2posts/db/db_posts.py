@@ -2,15 +2,25 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
+from typing import Any
 
 import aiosqlite
 
 from .db_sqlite import SQLite
+from .pragmas import PragmaProfile
+from cs2posts.dto import LatestPosts
 from cs2posts.dto import Post
+from cs2posts.dto import PostHeader
+from cs2posts.dto.post import PostType
 
 
 class PostDatabase(SQLite):
 
+    def __init__(self, filepath: Path | None, pragmas: PragmaProfile | None = None) -> None:
+        super().__init__(filepath, pragmas)
+        # Loaded by get_latest_posts, kept up to date by save.
+        self.__latest: LatestPosts | None = None
+
     async def create_table(self) -> None:
         await self._execute("""
             CREATE TABLE IF NOT EXISTS posts (
@@ -29,6 +39,19 @@ class PostDatabase(SQLite):
                 type TEXT NOT NULL
             )
         """)
+        # The latest post of a type is the first entry of its index range.
+        await self._execute("""
+            CREATE INDEX IF NOT EXISTS idx_posts_type_date ON posts (type, date DESC)
+        """)
+        # Rendered output of a post, stored by the version of the renderer
+        # that produced it. Rows of an outdated version are ignored.
+        await self._execute("""
+            CREATE TABLE IF NOT EXISTS rendered_messages (
+                gid TEXT PRIMARY KEY NOT NULL,
+                version INTEGER NOT NULL,
+                payload TEXT NOT NULL
+            )
+        """)
 
     async def save(self, post: Post | None) -> None:
         if post is None:
@@ -65,12 +88,19 @@ class PostDatabase(SQLite):
             json.dumps(post.tags),
             str(post.get_type())
         ))
+        if self.__latest is not None:
+            self.__latest.update(PostHeader.from_post(post))
 
     async def load(self) -> list[Post]:
         rows = await self._fetch_all("SELECT * FROM posts")
         posts = [self._convert_row_to_post(row) for row in rows]
         return [post for post in posts if post is not None]
 
+    async def create(self, *, overwrite: bool = False) -> None:
+        if overwrite:
+            self.__latest = None
+        await super().create(overwrite=overwrite)
+
     async def is_empty(self, table_name: str | None = None) -> bool:
         return await super().is_empty('posts')
 
@@ -96,6 +126,12 @@ class PostDatabase(SQLite):
         data['tags'] = json.loads(data['tags'])
         return Post(**data)
 
+    def _convert_row_to_header(self, row: aiosqlite.Row | None) -> PostHeader | None:
+        if row is None:
+            return None
+        return PostHeader(
+            gid=row['gid'], title=row['title'], date=row['date'], type=PostType(row['type']))
+
     async def _get_latest(self, post_type: str | None = None) -> Post | None:
         if post_type is None:
             row = await self._fetch_one(
@@ -106,6 +142,21 @@ class PostDatabase(SQLite):
                 (post_type,))
         return self._convert_row_to_post(row)
 
+    async def get_latest_posts(self) -> LatestPosts:
+        """Headers of the latest post of every type, read in one query on
+        the first call. The snapshot follows the posts saved afterwards."""
+        if self.__latest is None:
+            rows = await self._fetch_all("""
+                SELECT gid, title, date, type FROM (
+                    SELECT gid, title, date, type,
+                        ROW_NUMBER() OVER (PARTITION BY type ORDER BY date DESC) AS position
+                    FROM posts
+                ) WHERE position = 1
+            """)
+            self.__latest = LatestPosts(
+                header for header in map(self._convert_row_to_header, rows) if header is not None)
+        return self.__latest
+
     async def get_latest_news_post(self) -> Post | None:
         return await self._get_latest('news')
 
@@ -118,7 +169,22 @@ class PostDatabase(SQLite):
     async def get_latest_post(self) -> Post | None:
         return await self._get_latest()
 
+    async def get_dates(self) -> dict[str, int]:
+        rows = await self._fetch_all("SELECT gid, date FROM posts")
+        return {row['gid']: row['date'] for row in rows}
+
     async def get_post_by_gid(self, gid: str) -> Post | None:
         row = await self._fetch_one(
             "SELECT * FROM posts WHERE gid = ?", (gid,))
         return self._convert_row_to_post(row)
+
+    async def save_rendered(self, gid: str, version: int, payload: dict[str, Any]) -> None:
+        await self._execute(
+            "INSERT OR REPLACE INTO rendered_messages (gid, version, payload) VALUES (?, ?, ?)",
+            (gid, version, json.dumps(payload)))
+
+    async def get_rendered(self, gid: str, version: int) -> dict[str, Any] | None:
+        payload = await self._scalar(
+            "SELECT payload FROM rendered_messages WHERE gid = ? AND version = ?",
+            (gid, version))
+        return json.loads(payload) if payload is not None else None
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import asyncio
+from collections.abc import AsyncIterator
+from collections.abc import Iterable
 from collections.abc import Sequence
 from pathlib import Path
 from typing import Any
@@ -7,40 +10,128 @@ from typing import Any
 import aiosqlite
 
 from .db import Database
+from .pragmas import PragmaProfile
 
 
 class SQLite(Database):
+    """SQLite backend sharing one long-lived connection per database.
 
-    def __init__(self, filepath: Path | None) -> None:
+    The connection is opened lazily (or by :meth:`create`) and kept until
+    :meth:`close`, so queries no longer pay for a new worker thread, opening
+    the file and parsing the schema. The :class:`PragmaProfile` is applied
+    every time the connection is opened. aiosqlite runs every call on the
+    connection's own thread; the write lock additionally keeps a statement
+    and its commit together when several coroutines write concurrently.
+    """
+
+    CACHED_STATEMENTS = 256
+    STREAM_BATCH_SIZE = 500
+    DEFAULT_FILENAME = "sqlite.db"
+
+    def __init__(self, filepath: Path | None, pragmas: PragmaProfile | None = None) -> None:
         if filepath is None:
             filepath = Path(__file__).parent.parent.parent / "database"
             filepath.mkdir(parents=True, exist_ok=True)
-            filepath /= "sqlite.db"
+            filepath /= self.DEFAULT_FILENAME
 
         super().__init__(filepath)
+        self.__pragmas = pragmas if pragmas is not None else PragmaProfile()
+        self.__conn: aiosqlite.Connection | None = None
+        self.__connect_lock = asyncio.Lock()
+        self.__write_lock = asyncio.Lock()
+
+    @property
+    def pragmas(self) -> PragmaProfile:
+        return self.__pragmas
+
+    @property
+    def is_connected(self) -> bool:
+        return self.__conn is not None
+
+    async def connect(self) -> aiosqlite.Connection:
+        if self.__conn is not None:
+            return self.__conn
+
+        async with self.__connect_lock:
+            if self.__conn is None:
+                conn = await aiosqlite.connect(
+                    self.filepath, cached_statements=self.CACHED_STATEMENTS)
+                conn.row_factory = aiosqlite.Row
+                await conn.executescript(self.__pragmas.to_sql())
+                self.__conn = conn
+        return self.__conn
+
+    async def close(self) -> None:
+        conn, self.__conn = self.__conn, None
+        if conn is not None:
+            await conn.close()
 
     async def _execute(self, query: str, params: Sequence[Any] = ()) -> None:
-        async with aiosqlite.connect(self.filepath) as conn:
+        conn = await self.connect()
+        async with self.__write_lock:
             await conn.execute(query, params)
             await conn.commit()
 
+    async def _execute_many(self, query: str, params: Iterable[Sequence[Any]]) -> None:
+        conn = await self.connect()
+        async with self.__write_lock:
+            await conn.executemany(query, params)
+            await conn.commit()
+
     async def _fetch_all(self, query: str, params: Sequence[Any] = ()) -> list[aiosqlite.Row]:
-        async with aiosqlite.connect(self.filepath) as conn:
-            conn.row_factory = aiosqlite.Row
-            async with conn.execute(query, params) as cursor:
-                return list(await cursor.fetchall())
+        conn = await self.connect()
+        async with conn.execute(query, params) as cursor:
+            return list(await cursor.fetchall())
 
     async def _fetch_one(self, query: str, params: Sequence[Any] = ()) -> aiosqlite.Row | None:
-        async with aiosqlite.connect(self.filepath) as conn:
-            conn.row_factory = aiosqlite.Row
-            async with conn.execute(query, params) as cursor:
-                return await cursor.fetchone()
+        conn = await self.connect()
+        async with conn.execute(query, params) as cursor:
+            return await cursor.fetchone()
+
+    async def _iter_rows(
+        self,
+        select: str,
+        key: str,
+        where: str = "1",
+        params: Sequence[Any] = (),
+        batch_size: int | None = None,
+    ) -> AsyncIterator[list[aiosqlite.Row]]:
+        """Yield the rows of ``select`` matching ``where`` in batches ordered
+        by ``key``, a unique column of the result.
+
+        Each batch is a query of its own on the shared connection that
+        continues after the last key of the previous one, so no statement
+        (and no read transaction) stays open while the consumer works on a
+        batch. The consumer may write to the same tables in the meantime and
+        a checkpoint is not held up by the stream. Rows updated after they
+        were yielded are not yielded again.
+        """
+        if batch_size is None:
+            batch_size = self.STREAM_BATCH_SIZE
+
+        query = f"{select} WHERE ({where}) ORDER BY {key} LIMIT ?"
+        rows = await self._fetch_all(query, (*params, batch_size))
+        query = f"{select} WHERE ({where}) AND {key} > ? ORDER BY {key} LIMIT ?"
+        while rows:
+            yield rows
+            if len(rows) < batch_size:
+                return
+            rows = await self._fetch_all(query, (*params, rows[-1][key], batch_size))
 
     async def _scalar(self, query: str, params: Sequence[Any] = ()) -> Any:
-        async with aiosqlite.connect(self.filepath) as conn:
-            async with conn.execute(query, params) as cursor:
-                row = await cursor.fetchone()
-                return row[0] if row is not None else None
+        conn = await self.connect()
+        async with conn.execute(query, params) as cursor:
+            row = await cursor.fetchone()
+            return row[0] if row is not None else None
+
+    async def optimize(self) -> None:
+        """Periodic maintenance: fold the WAL back into the database file and
+        let SQLite refresh the statistics of tables that need it."""
+        conn = await self.connect()
+        async with self.__write_lock:
+            if self.__pragmas.is_wal:
+                await conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            await conn.execute("PRAGMA optimize")
 
     async def is_empty(self, table_name: str) -> bool:
         count = await self._scalar(f"SELECT COUNT(*) FROM {table_name}")
@@ -48,16 +139,16 @@ class SQLite(Database):
 
     async def create(self, *, overwrite: bool = False) -> None:
         if overwrite and self.filepath.exists():
+            await self.close()
             self.filepath.unlink()
 
         if self.filepath.exists():
             return
 
-        async with aiosqlite.connect(self.filepath):
-            pass
+        await self.connect()
 
     async def backup(self, filepath: Path) -> None:
         filepath.parent.mkdir(parents=True, exist_ok=True)
-        async with aiosqlite.connect(self.filepath) as conn:
-            async with aiosqlite.connect(filepath) as backup_conn:
-                await conn.backup(backup_conn)
+        conn = await self.connect()
+        async with aiosqlite.connect(filepath) as backup_conn:
+            await conn.backup(backup_conn)
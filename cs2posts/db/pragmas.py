@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+JOURNAL_MODES = ('DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF')
+SYNCHRONOUS_MODES = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+TEMP_STORES = ('DEFAULT', 'FILE', 'MEMORY')
+
+
+@dataclass(frozen=True)
+class PragmaProfile:
+    """Connection pragmas applied whenever a database connection is opened.
+
+    The defaults favour the bot's workload of many small writes: WAL lets
+    readers (and the backup) proceed while a write is in progress and
+    ``synchronous=NORMAL`` only fsyncs on checkpoints instead of every commit.
+    ``cache_size`` follows SQLite's convention, negative values are KiB.
+    """
+
+    journal_mode: str = 'WAL'
+    synchronous: str = 'NORMAL'
+    mmap_size: int = 64 * 1024 * 1024
+    cache_size: int = -16 * 1024
+    temp_store: str = 'MEMORY'
+    busy_timeout_ms: int = 5000
+
+    def __post_init__(self) -> None:
+        # Values end up verbatim in the PRAGMA statements, so only accept
+        # the keywords SQLite knows.
+        object.__setattr__(self, 'journal_mode', self.journal_mode.upper())
+        object.__setattr__(self, 'synchronous', self.synchronous.upper())
+        object.__setattr__(self, 'temp_store', self.temp_store.upper())
+
+        if self.journal_mode not in JOURNAL_MODES:
+            raise ValueError(f'Invalid journal_mode: {self.journal_mode}')
+        if self.synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(f'Invalid synchronous: {self.synchronous}')
+        if self.temp_store not in TEMP_STORES:
+            raise ValueError(f'Invalid temp_store: {self.temp_store}')
+
+    @property
+    def is_wal(self) -> bool:
+        return self.journal_mode == 'WAL'
+
+    def to_sql(self) -> str:
+        return (
+            f"PRAGMA journal_mode = {self.journal_mode};\n"
+            f"PRAGMA synchronous = {self.synchronous};\n"
+            f"PRAGMA mmap_size = {int(self.mmap_size)};\n"
+            f"PRAGMA cache_size = {int(self.cache_size)};\n"
+            f"PRAGMA temp_store = {self.temp_store};\n"
+            f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)};\n"
+        )
@@ -1,9 +1,17 @@
 from __future__ import annotations
 
 from .chats import Chat
+from .delivery import Delivery
+from .delivery import DeliveryStatus
+from .post import LatestPosts
 from .post import Post
+from .post import PostHeader
 
 __all__ = [
     "Chat",
+    "Delivery",
+    "DeliveryStatus",
+    "LatestPosts",
     "Post",
+    "PostHeader",
 ]
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
+
+
+class DeliveryStatus(Enum):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+    def __str__(self) -> str:
+        return str(self.value)
+
+
+@dataclass
+class Delivery:
+    """Delivery of one post (``gid``) to one chat.
+
+    ``block`` is the index of the next content block to send, so an
+    interrupted delivery resumes where it stopped instead of starting over.
+    """
+    gid: str
+    chat_id: int
+    block: int = 0
+    status: DeliveryStatus = DeliveryStatus.PENDING
+    attempts: int = 0
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Delivery:
+        return cls(
+            gid=data['gid'],
+            chat_id=data['chat_id'],
+            block=data['block'],
+            status=DeliveryStatus(data['status']),
+            attempts=data['attempts'])
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import asdict
+from collections.abc import Iterable
 from dataclasses import dataclass
 from dataclasses import field
 from dataclasses import fields
@@ -24,13 +24,7 @@ class PostType(Enum):
 
     @classmethod
     def from_post(cls, post: Post) -> PostType:
-        if post.is_news():
-            return cls.NEWS
-        if post.is_update():
-            return cls.UPDATE
-        if post.is_external():
-            return cls.EXTERNAL
-        return cls.UNKNOWN
+        return post.get_type()
 
 
 class FeedType(Enum):
@@ -43,7 +37,7 @@ class FeedType(Enum):
         return cls.NOT_DEFINED
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Post:
     gid: str
     title: str
@@ -58,13 +52,16 @@ class Post:
     appid: int
     # can be empty from crawled data
     tags: list[str] = field(default_factory=list)
+    # Classification of the title, tags and feed_type it was computed for.
+    # Changing one of them, also the tags in place, reclassifies.
+    _type: tuple[str, tuple[str, ...], int, PostType] | None = field(
+        default=None, init=False, repr=False)
 
     @classmethod
     def from_dict(cls, json: dict[str, Any]) -> Post:
         # Ignore unknown keys so new fields added by the Steam API do not
         # break construction.
-        field_names = {f.name for f in fields(cls)}
-        return cls(**{k: v for k, v in json.items() if k in field_names})
+        return cls(**{k: v for k, v in json.items() if k in _FIELD_NAMES})
 
     @property
     def date_as_datetime(self) -> datetime:
@@ -72,23 +69,25 @@ class Post:
         return datetime.fromtimestamp(self.date, tz=ZoneInfo('UTC')).replace(tzinfo=None)
 
     def to_dict(self) -> dict[str, Any]:
-        return asdict(self)
+        data = {name: getattr(self, name) for name in _FIELDS}
+        data['tags'] = list(self.tags)
+        return data
 
     def is_update(self) -> bool:
-        return "patchnotes" in self.tags or "Release Notes" in self.title
+        return self.get_type() is PostType.UPDATE
 
     def is_news(self) -> bool:
-        return not self.is_update() and not self.is_external()
+        return self.get_type() is PostType.NEWS
 
     def is_external(self) -> bool:
-        return FeedType(self.feed_type) == FeedType.EXTERN
+        return self.feed_type == FeedType.EXTERN.value
 
-    def is_newer_than(self, other: Post) -> bool:
+    def is_newer_than(self, other: Post | PostHeader | None) -> bool:
         if other is None:
             return False
         return self.date > other.date
 
-    def is_older_eq_than(self, other: Post | None) -> bool:
+    def is_older_eq_than(self, other: Post | PostHeader | None) -> bool:
         if other is None:
             return False
         return self.date <= other.date
@@ -97,15 +96,109 @@ class Post:
         return FeedType(self.feed_type)
 
     def get_type(self) -> PostType:
-        return PostType.from_post(self)
+        key = (self.title, tuple(self.tags), self.feed_type)
+        cached = self._type
+        if cached is not None and cached[:3] == key:
+            return cached[3]
+        post_type = self.__classify()
+        self._type = (*key, post_type)
+        return post_type
+
+    def __classify(self) -> PostType:
+        # An update published on an external feed is still an update.
+        if "patchnotes" in self.tags or "Release Notes" in self.title:
+            return PostType.UPDATE
+        if self.is_external():
+            return PostType.EXTERNAL
+        return PostType.NEWS
 
     def __getitem__(self, key: str) -> Any:
-        return self.to_dict()[key]
+        if key not in _FIELD_NAMES:
+            raise KeyError(key)
+        return getattr(self, key)
 
     def __eq__(self, other: object) -> bool:
-        if isinstance(other, self.__class__):
-            return self.to_dict() == other.to_dict()
-        return False
+        if not isinstance(other, self.__class__):
+            return False
+        return all(getattr(self, name) == getattr(other, name) for name in _FIELDS)
 
     def __ne__(self, other: object) -> bool:
         return not self.__eq__(other)
+
+
+@dataclass(slots=True, frozen=True)
+class PostHeader:
+    """The columns of a post that crawled posts are compared with.
+
+    Stands in for the latest known posts, so their multi-kilobyte contents
+    are not kept in memory. The full :class:`Post` is read from the database
+    by its gid when a message has to be rendered.
+    """
+
+    gid: str
+    title: str
+    date: int
+    type: PostType
+
+    @classmethod
+    def from_post(cls, post: Post) -> PostHeader:
+        return cls(gid=post.gid, title=post.title, date=post.date, type=post.get_type())
+
+    def is_update(self) -> bool:
+        return self.type is PostType.UPDATE
+
+    def is_news(self) -> bool:
+        return self.type is PostType.NEWS
+
+    def is_external(self) -> bool:
+        return self.type is PostType.EXTERNAL
+
+    def is_newer_than(self, other: Post | PostHeader | None) -> bool:
+        if other is None:
+            return False
+        return self.date > other.date
+
+    def is_older_eq_than(self, other: Post | PostHeader | None) -> bool:
+        if other is None:
+            return False
+        return self.date <= other.date
+
+    def get_type(self) -> PostType:
+        return self.type
+
+
+class LatestPosts:
+    """Snapshot of the latest post overall and of every type.
+
+    Built from the database once, then kept up to date with the posts that
+    are saved, so it can be read without a query.
+    """
+
+    def __init__(self, headers: Iterable[PostHeader] = ()) -> None:
+        self.__by_type: dict[PostType, PostHeader] = {}
+        self.__latest: PostHeader | None = None
+        for header in headers:
+            self.update(header)
+
+    @property
+    def latest(self) -> PostHeader | None:
+        return self.__latest
+
+    def get(self, post_type: PostType) -> PostHeader | None:
+        return self.__by_type.get(post_type)
+
+    def update(self, header: PostHeader) -> None:
+        """Takes ``header`` as the latest of its type unless a newer post of
+        that type is known."""
+        current = self.__by_type.get(header.type)
+        if current is None or not current.is_newer_than(header):
+            self.__by_type[header.type] = header
+        if self.__latest is None or not self.__latest.is_newer_than(header):
+            self.__latest = header
+
+    def __len__(self) -> int:
+        return len(self.__by_type)
+
+
+_FIELDS = tuple(f.name for f in fields(Post) if f.init)
+_FIELD_NAMES = frozenset(_FIELDS)
@@ -11,6 +11,7 @@ import time
 from pathlib import Path
 
 from cs2posts.bot import settings
+from cs2posts.bot.scheduler import crawl_bounds
 
 
 logger = logging.getLogger(__name__)
@@ -24,7 +25,11 @@ def main() -> int:
 
     age = time.time() - path.stat().st_mtime
     # Tolerate one fully missed crawl cycle before declaring the bot dead.
-    max_age = settings.CS2_UPDATE_CHECK_INTERVAL * 2 + 60
+    _, max_interval = crawl_bounds(
+        settings.CS2_UPDATE_CHECK_INTERVAL,
+        settings.CS2_UPDATE_CHECK_MIN_INTERVAL,
+        settings.CS2_UPDATE_CHECK_MAX_INTERVAL)
+    max_age = max_interval * 2 + 60
     if age > max_age:
         logger.error(f'heartbeat stale: {age:.0f}s old (max {max_age}s)')
         return 1
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+from .cache import MessageCache
 from .cs_external_msg import CounterStrikeExternalMessage
 from .cs_news_msg import CounterStrikeNewsMessage
 from .cs_update_msg import CounterStrikeUpdateMessage
 from .factory import create_message
+from .factory import message_class
+from .factory import restore_message
+from .splitter import MessageSplitter
+from .splitter import split_message
 from .telegram import TelegramMessage
 
 __all__ = [
@@ -11,5 +16,10 @@ __all__ = [
     "CounterStrikeNewsMessage",
     "CounterStrikeUpdateMessage",
     "create_message",
+    "MessageCache",
+    "message_class",
+    "MessageSplitter",
+    "restore_message",
+    "split_message",
     "TelegramMessage",
 ]
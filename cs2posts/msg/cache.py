@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Hashable
+
+from .factory import message_class
+from .telegram import TelegramMessage
+from cs2posts.dto.post import Post
+from cs2posts.dto.post import PostHeader
+
+
+class MessageCache:
+    """Bounded LRU cache of built messages.
+
+    Entries are keyed by the post gid and the ``VERSION`` of the message
+    class that renders it, so bumping the version after a rendering change
+    makes every cached message of that class stale.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        if maxsize <= 0:
+            raise ValueError('maxsize must be greater than 0')
+        self.__maxsize = maxsize
+        self.__messages: OrderedDict[Hashable, TelegramMessage] = OrderedDict()
+
+    @property
+    def maxsize(self) -> int:
+        return self.__maxsize
+
+    @staticmethod
+    def key(post: Post | PostHeader) -> Hashable:
+        return (post.gid, message_class(post).VERSION)
+
+    def __len__(self) -> int:
+        return len(self.__messages)
+
+    def __contains__(self, post: Post | PostHeader) -> bool:
+        return self.key(post) in self.__messages
+
+    def get(self, post: Post | PostHeader) -> TelegramMessage | None:
+        key = self.key(post)
+        msg = self.__messages.get(key)
+        if msg is not None:
+            self.__messages.move_to_end(key)
+        return msg
+
+    def put(self, post: Post | PostHeader, msg: TelegramMessage) -> None:
+        key = self.key(post)
+        self.__messages[key] = msg
+        self.__messages.move_to_end(key)
+        while len(self.__messages) > self.__maxsize:
+            self.__messages.popitem(last=False)
+
+    def clear(self) -> None:
+        self.__messages.clear()
@@ -8,7 +8,7 @@ from bs4 import Tag
 
 from .telegram import TelegramMessage
 from cs2posts.dto.post import Post
-from cs2posts.utils import get_redirected_url
+from cs2posts.parser.document import ParsedDocument
 
 
 logger = logging.getLogger(__name__)
@@ -47,6 +47,25 @@ def build_content(soup: BeautifulSoup) -> str:
     return content.strip()
 
 
+def parse_contents(contents: str) -> tuple[str, str | None]:
+    """The message content of an external post and its read more link."""
+    soup = BeautifulSoup(contents, "html.parser")
+
+    cleanup_soup(soup)
+    read_more = extract_read_more_links(soup)
+    remove_read_more_links(read_more)
+
+    content = build_content(soup)
+
+    read_more_url = None
+    if len(read_more) > 0:
+        href = read_more[0].get("href")
+        if isinstance(href, str):
+            read_more_url = href
+
+    return content, read_more_url
+
+
 def build_message(post: Post, content: str, source_url: str | None = None) -> str:
     if source_url is None:
         source_url = post.url
@@ -62,22 +81,20 @@ def build_message(post: Post, content: str, source_url: str | None = None) -> st
 
 class CounterStrikeExternalMessage(TelegramMessage):
 
-    def __init__(self, post: Post) -> None:
+    def __init__(self, post: Post, source_url: str | None = None,
+                 document: ParsedDocument | None = None) -> None:
         self.post = post
-        source_url = get_redirected_url(post.url)
-
-        soup = BeautifulSoup(post.contents, "html.parser")
-
-        cleanup_soup(soup)
-        read_more = extract_read_more_links(soup)
-        remove_read_more_links(read_more)
+        # create_message resolves the redirect, a message built without it
+        # links the post URL as is instead of blocking on the network.
+        if source_url is None:
+            source_url = post.url
 
-        content = build_content(soup)
+        if document is None:
+            document = ParsedDocument(post.contents)
 
-        if len(read_more) > 0:
-            href = read_more[0].get("href")
-            if isinstance(href, str):
-                source_url = href
+        content, read_more_url = document.derive(parse_contents)
+        if read_more_url is not None:
+            source_url = read_more_url
 
         msg = build_message(post, content, source_url)
 
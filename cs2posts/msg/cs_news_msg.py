@@ -10,6 +10,8 @@ import httpx
 from telegram import InputMediaPhoto
 from telegram.constants import ParseMode
 
+from .plan import ApiCall
+from .plan import replay
 from .telegram import TelegramMessage
 from cs2posts.content import Carousel
 from cs2posts.content import ContentExtractor
@@ -21,12 +23,11 @@ from cs2posts.content.content import Content
 from cs2posts.dto.post import Post
 from cs2posts.msg.constants import MAX_MEDIA_GROUP_SIZE
 from cs2posts.msg.constants import TELEGRAM_SEND_DELAY_SECONDS
-from cs2posts.parser.steam2telegram_html import Steam2TelegramHTML
+from cs2posts.parser.document import ParsedDocument
 from cs2posts.parser.steam_list import SteamListParser
 from cs2posts.parser.steam_news_table import SteamNewsTableParser
+from cs2posts.resolver import is_valid_url
 from cs2posts.utils import extract_url
-from cs2posts.utils import get_redirected_url
-from cs2posts.utils import is_valid_url
 
 
 logger = logging.getLogger(__name__)
@@ -34,16 +35,48 @@ logger = logging.getLogger(__name__)
 
 class CounterStrikeNewsMessage(TelegramMessage):
 
-    def __init__(self, post: Post) -> None:
-        self.post = post
-        parser = Steam2TelegramHTML(post.contents)
-        parser.add_parser(parser=SteamListParser, priority=1)
-        parser.add_parser(parser=SteamNewsTableParser, priority=2)
+    PARSERS = (SteamListParser, SteamNewsTableParser)
 
-        self.content = ContentExtractor(parser.parse()).extract()
+    def __init__(self, post: Post, source_url: str | None = None,
+                 document: ParsedDocument | None = None) -> None:
+        self.post = post
+        self.__source_url = source_url
+        # Media URLs are checked once per message, a cached message is sent
+        # again without probing them on every send.
+        self.__valid_media_urls: dict[str | None, bool] = {}
+        self.__plan: list[tuple[ApiCall, ...]] | None = None
+        self.__plan_lock = asyncio.Lock()
+        if document is None:
+            document = ParsedDocument(post.contents)
+
+        self.content = ContentExtractor(document.render(self.PARSERS)).extract()
         self.__add_header()
         self.__add_footer()
 
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "content": [content.to_dict() for content in self.content],
+            # Only valid URLs are persisted. An invalid one may have failed
+            # for a transient reason, a restored message probes it again
+            # (the resolver caches error statuses for a while).
+            "valid_media_urls": {
+                url: True for url, valid in self.__valid_media_urls.items() if url is not None and valid},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], post: Post | None = None) -> TelegramMessage:
+        if post is None:
+            raise ValueError("A news message can only be restored with its post")
+        msg = cls.__new__(cls)
+        msg.post = post
+        msg.content = [Content.from_dict(content) for content in data["content"]]
+        # Messages saved by older versions also hold invalid URLs
+        msg.__valid_media_urls = {
+            url: True for url, valid in data["valid_media_urls"].items() if valid}
+        msg.__plan = None
+        msg.__plan_lock = asyncio.Lock()
+        return msg
+
     def __add_header(self) -> None:
         if (isinstance(self.content[0], Image) or  # noqa
             isinstance(self.content[0], Video) or  # noqa
@@ -54,19 +87,22 @@ class CounterStrikeNewsMessage(TelegramMessage):
 
         header = self.get_header()
         if isinstance(self.content[0], TextBlock):
-            if self.content[0].is_heading and header not in self.content[0].text:
-                self.content[0].text = self.get_header() + "\n\n" + \
-                    self.content[0].text
+            if self.content[0].is_heading and header not in self.content[0]:
+                self.content[0].prepend(header + "\n\n")
 
     def __add_footer(self) -> None:
-        url = get_redirected_url(self.post.url)
+        # create_message resolves the redirect, a message built without it
+        # links the post URL as is instead of blocking on the network.
+        url = self.__source_url
+        if url is None:
+            url = self.post.url
         footer = (
             f"\n\n(Author: {html.escape(self.post.author)})\n\n"
             f"Source: <a href='{html.escape(url, quote=True)}'>Link</a>"
         )
 
         if isinstance(self.content[-1], TextBlock):
-            self.content[-1].text += footer
+            self.content[-1].append(footer)
         else:
             self.content.append(TextBlock(
                 text_pos_start=self.content[-1].text_pos_end + 1,
@@ -78,39 +114,80 @@ class CounterStrikeNewsMessage(TelegramMessage):
         return f"<b>{html.escape(self.post.title)}</b>\n({self.post.date_as_datetime})"
 
     async def _is_valid_media_url(self, url: str | None) -> bool:
-        return await asyncio.to_thread(is_valid_url, url)
-
-    async def send_message(self, bot: Any, chat_id: int, message: TextBlock) -> None:
-        chunks = self.split(message.text)
-        for i, text in enumerate(chunks):
-            await bot.send_message(
-                chat_id=chat_id,
-                text=text,
-                parse_mode=ParseMode.HTML,
-                disable_web_page_preview=True)
-            if i < len(chunks) - 1:
-                await asyncio.sleep(TELEGRAM_SEND_DELAY_SECONDS)
-
-    async def send_image(self, bot: Any, chat_id: int, image: Image) -> None:
+        if url not in self.__valid_media_urls:
+            self.__valid_media_urls[url] = await is_valid_url(url)
+        return self.__valid_media_urls[url]
+
+    async def _validate_media_urls(self, urls: list[str | None]) -> None:
+        # Check all URLs at once, the requests share the resolver's pooled
+        # connections instead of running one after another.
+        await asyncio.gather(*(self._is_valid_media_url(url) for url in dict.fromkeys(urls)))
+
+    def _media_urls(self, content: Content) -> list[str | None]:
+        if isinstance(content, Image):
+            return [extract_url(content.url)]
+        if isinstance(content, Carousel):
+            return [extract_url(image.url) for image in content.images]
+        if isinstance(content, Video) and not content.is_empty():
+            return [self._video_url(content)]
+        return []
+
+    @staticmethod
+    def _video_url(video: Video) -> str | None:
+        if video.mp4:
+            return extract_url(video.mp4)
+        if video.mp4 is None and video.webm:
+            return extract_url(video.webm)
+        return None
+
+    async def plan(self) -> list[tuple[ApiCall, ...]]:
+        """The API calls of every content block.
+
+        The plan is built on first use, all media URLs are checked at
+        once, and then replayed for every chat the message is sent to.
+        """
+        async with self.__plan_lock:
+            if self.__plan is None:
+                await self._validate_media_urls(
+                    [url for content in self.content for url in self._media_urls(content)])
+                self.__plan = [await self.__plan_block(content) for content in self.content]
+        return self.__plan
+
+    async def __plan_block(self, content: Content) -> tuple[ApiCall, ...]:
+        try:
+            return tuple(await self.plan_content(content))
+        except Exception as e:
+            logger.exception(f"Could not prepare content={type(content).__name__}, reason={e}")
+            return ()
+
+    async def plan_message(self, message: TextBlock) -> list[ApiCall]:
+        return [
+            ApiCall("send_message", {
+                "text": text,
+                "parse_mode": ParseMode.HTML,
+                "disable_web_page_preview": True})
+            for text in self.split(message.text)]
+
+    async def plan_image(self, image: Image) -> list[ApiCall]:
         image_url = extract_url(image.url)
 
         if not await self._is_valid_media_url(image_url):
             logger.error(
                 f"Not sending image due to invalid image URL {image_url=}")
-            return
+            return []
 
         caption = self.get_header() if image.is_heading else None
-        await bot.send_photo(
-            chat_id=chat_id,
-            photo=image_url,
-            caption=caption,
-            parse_mode=ParseMode.HTML)
+        return [ApiCall("send_photo", {
+            "photo": image_url,
+            "caption": caption,
+            "parse_mode": ParseMode.HTML})]
 
-    async def send_carousel(self, bot: Any, chat_id: int, carousel: Carousel) -> None:
-        media = []
-        for image in carousel.images:
-            image_url = extract_url(image.url)
+    async def plan_carousel(self, carousel: Carousel) -> list[ApiCall]:
+        image_urls = [extract_url(image.url) for image in carousel.images]
+        await self._validate_media_urls(image_urls)
 
+        media = []
+        for image_url in image_urls:
             if image_url is None or not await self._is_valid_media_url(image_url):
                 logger.error(
                     f"Not sending image due to invalid image URL {image_url=}")
@@ -118,38 +195,27 @@ class CounterStrikeNewsMessage(TelegramMessage):
 
             media.append(InputMediaPhoto(media=image_url))
 
-        chunks = [media[i:i + MAX_MEDIA_GROUP_SIZE] for i in range(0, len(media), MAX_MEDIA_GROUP_SIZE)]
+        return [
+            ApiCall("send_media_group", {"media": media[i:i + MAX_MEDIA_GROUP_SIZE]})
+            for i in range(0, len(media), MAX_MEDIA_GROUP_SIZE)]
 
-        for i, chunk in enumerate(chunks):
-            await bot.send_media_group(
-                chat_id=chat_id,
-                media=chunk)
-            if i < len(chunks) - 1:
-                await asyncio.sleep(TELEGRAM_SEND_DELAY_SECONDS)
-
-    async def send_video(self, bot: Any, chat_id: int, video: Video) -> None:
+    async def plan_video(self, video: Video) -> list[ApiCall]:
         if video.is_empty():
-            return
+            return []
 
-        args = {
-            "chat_id": chat_id,
+        args: dict[str, Any] = {
             "supports_streaming": True,
             "parse_mode": ParseMode.HTML
         }
 
-        video_url = None
-        if video.mp4:
-            video_url = extract_url(video.mp4)
-            args['video'] = video_url
-
-        if video.mp4 is None and video.webm:
-            video_url = extract_url(video.webm)
+        video_url = self._video_url(video)
+        if video_url is not None:
             args['video'] = video_url
 
         if video_url is None or not await self._is_valid_media_url(video_url):
             logger.error(
                 f"Not sending video due to invalid video URL {video_url=}")
-            return
+            return []
 
         if video.poster:
             thumbnail_url = extract_url(video.poster)
@@ -158,38 +224,56 @@ class CounterStrikeNewsMessage(TelegramMessage):
         caption = self.get_header() if video.is_heading else None
         args['caption'] = caption
 
-        await bot.send_video(**args)
+        return [ApiCall("send_video", args)]
 
-    async def send_youtube_video(self, bot: Any, chat_id: int, youtube: Youtube) -> None:
+    async def plan_youtube_video(self, youtube: Youtube) -> list[ApiCall]:
         text: str = ""
         if youtube.is_heading:
             text = self.get_header() + "\n\n"
         text += f"<a href='{youtube.get_url()}'>{youtube.get_url()}</a>"
 
-        await bot.send_message(
-            chat_id=chat_id,
-            text=text,
-            parse_mode=ParseMode.HTML,
-            disable_web_page_preview=False)
+        return [ApiCall("send_message", {
+            "text": text,
+            "parse_mode": ParseMode.HTML,
+            "disable_web_page_preview": False})]
 
-    async def send_content(self, bot: Any, chat_id: int, content: Content) -> None:
+    async def plan_content(self, content: Content) -> list[ApiCall]:
         if isinstance(content, TextBlock):
-            await self.send_message(bot, chat_id, content)
+            return await self.plan_message(content)
         elif isinstance(content, Image):
-            await self.send_image(bot, chat_id, content)
+            return await self.plan_image(content)
         elif isinstance(content, Carousel):
-            await self.send_carousel(bot, chat_id, content)
+            return await self.plan_carousel(content)
         elif isinstance(content, Video):
-            await self.send_video(bot, chat_id, content)
+            return await self.plan_video(content)
         elif isinstance(content, Youtube):
-            await self.send_youtube_video(bot, chat_id, content)
+            return await self.plan_youtube_video(content)
         else:
             raise TypeError(f"Unsupported content type: {type(content)!r}")
 
-    async def _send_with_retry(self, bot: Any, chat_id: int, content: Content, max_retries: int = 3) -> bool:
+    async def send_message(self, bot: Any, chat_id: int, message: TextBlock) -> None:
+        await replay(await self.plan_message(message), bot, chat_id)
+
+    async def send_image(self, bot: Any, chat_id: int, image: Image) -> None:
+        await replay(await self.plan_image(image), bot, chat_id)
+
+    async def send_carousel(self, bot: Any, chat_id: int, carousel: Carousel) -> None:
+        await replay(await self.plan_carousel(carousel), bot, chat_id)
+
+    async def send_video(self, bot: Any, chat_id: int, video: Video) -> None:
+        await replay(await self.plan_video(video), bot, chat_id)
+
+    async def send_youtube_video(self, bot: Any, chat_id: int, youtube: Youtube) -> None:
+        await replay(await self.plan_youtube_video(youtube), bot, chat_id)
+
+    async def send_content(self, bot: Any, chat_id: int, content: Content) -> None:
+        await replay(await self.plan_content(content), bot, chat_id)
+
+    async def _send_with_retry(self, bot: Any, chat_id: int, content: Content,
+                               calls: tuple[ApiCall, ...], max_retries: int = 3) -> bool:
         for attempt in range(max_retries + 1):
             try:
-                await self.send_content(bot, chat_id, content)
+                await replay(calls, bot, chat_id)
                 return True
             except (httpx.ReadTimeout, httpcore.ReadTimeout, httpx.ConnectError) as e:
                 if attempt >= max_retries:
@@ -206,8 +290,10 @@ class CounterStrikeNewsMessage(TelegramMessage):
 
         return False
 
-    async def send(self, bot: Any, chat_id: int) -> None:
-        for i, content in enumerate(self.content):
-            await self._send_with_retry(bot, chat_id, content)
-            if i < len(self.content) - 1:
-                await asyncio.sleep(TELEGRAM_SEND_DELAY_SECONDS)
+    @property
+    def block_count(self) -> int:
+        return len(self.content)
+
+    async def send_block(self, bot: Any, chat_id: int, index: int) -> None:
+        plan = await self.plan()
+        await self._send_with_retry(bot, chat_id, self.content[index], plan[index])
@@ -5,11 +5,10 @@ import logging
 
 from .telegram import TelegramMessage
 from cs2posts.dto.post import Post
-from cs2posts.parser.steam2telegram_html import Steam2TelegramHTML
+from cs2posts.parser.document import ParsedDocument
 from cs2posts.parser.steam_list import SteamListParser
 from cs2posts.parser.steam_news_table import SteamNewsTableParser
 from cs2posts.parser.steam_update_heading import SteamUpdateHeadingParser
-from cs2posts.utils import get_redirected_url
 
 
 logger = logging.getLogger(__name__)
@@ -17,18 +16,22 @@ logger = logging.getLogger(__name__)
 
 class CounterStrikeUpdateMessage(TelegramMessage):
 
-    def __init__(self, post: Post) -> None:
-        source_url = get_redirected_url(post.url)
+    PARSERS = (SteamListParser, SteamNewsTableParser, SteamUpdateHeadingParser)
 
-        parser = Steam2TelegramHTML(post.contents)
-        parser.add_parser(parser=SteamListParser, priority=1)
-        parser.add_parser(parser=SteamNewsTableParser, priority=2)
-        parser.add_parser(parser=SteamUpdateHeadingParser, priority=3)
+    def __init__(self, post: Post, source_url: str | None = None,
+                 document: ParsedDocument | None = None) -> None:
+        # create_message resolves the redirect, a message built without it
+        # links the post URL as is instead of blocking on the network.
+        if source_url is None:
+            source_url = post.url
+
+        if document is None:
+            document = ParsedDocument(post.contents)
 
         msg = f"<b>{html.escape(post.title)}</b>\n"
         msg += f"({post.date_as_datetime})\n"
         msg += "\n"
-        msg += parser.parse()
+        msg += document.render(self.PARSERS)
         msg += "\n\n" if not msg.endswith("\n\n") else ""
         msg += f"(Author: {html.escape(post.author)})"
         msg += "\n\n"
@@ -1,26 +1,54 @@
 from __future__ import annotations
 
 import asyncio
+from typing import Any
 
 from .cs_external_msg import CounterStrikeExternalMessage
 from .cs_news_msg import CounterStrikeNewsMessage
 from .cs_update_msg import CounterStrikeUpdateMessage
 from .telegram import TelegramMessage
 from cs2posts.dto.post import Post
+from cs2posts.dto.post import PostHeader
+from cs2posts.parser.document import DocumentCache
+from cs2posts.parser.document import ParsedDocument
+from cs2posts.resolver import resolve_steam_clan_images
+from cs2posts.resolver import resolve_url
 
 
-async def create_message(post: Post) -> TelegramMessage:
-    # Building a message resolves redirect URLs (blocking HTTP) and runs the
-    # bbcode/HTML parsers, so do it in a worker thread to avoid blocking the
-    # asyncio event loop.
-    return await asyncio.to_thread(build_message, post)
+PostMessage = CounterStrikeNewsMessage | CounterStrikeUpdateMessage | CounterStrikeExternalMessage
 
 
-def build_message(post: Post) -> TelegramMessage:
+async def create_message(post: Post, documents: DocumentCache | None = None) -> TelegramMessage:
+    # The source link and image placeholders are resolved on the shared
+    # async resolver. The resolved contents are only handed to the parser,
+    # the post itself is left as it was crawled.
+    source_url, contents = await asyncio.gather(
+        resolve_url(post.url), resolve_steam_clan_images(post.contents))
+    # The cache is only touched on the event loop, the worker thread gets
+    # the document of this post. Building the message runs the bbcode/HTML
+    # parsers, so do it in a worker thread to avoid blocking the asyncio
+    # event loop.
+    if documents is not None:
+        document = documents.get(post.gid, contents)
+    else:
+        document = ParsedDocument(contents)
+    return await asyncio.to_thread(build_message, post, source_url, document)
+
+
+def message_class(post: Post | PostHeader) -> type[PostMessage]:
     if post.is_news():
-        return CounterStrikeNewsMessage(post)
+        return CounterStrikeNewsMessage
     if post.is_update():
-        return CounterStrikeUpdateMessage(post)
+        return CounterStrikeUpdateMessage
     if post.is_external():
-        return CounterStrikeExternalMessage(post)
-    raise ValueError(f"Unknown post type {post.title=} {post.url=}")
+        return CounterStrikeExternalMessage
+    raise ValueError(f"Unknown post type {post.gid=} {post.title=}")
+
+
+def build_message(post: Post, source_url: str | None = None,
+                  document: ParsedDocument | None = None) -> TelegramMessage:
+    return message_class(post)(post, source_url, document)
+
+
+def restore_message(post: Post, data: dict[str, Any]) -> TelegramMessage:
+    return message_class(post).from_dict(data, post)
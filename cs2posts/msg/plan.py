@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from dataclasses import field
+from typing import Any
+
+
+@dataclass(frozen=True)
+class ApiCall:
+    """A bot API call with everything but the chat it is sent to.
+
+    The arguments are shared by every chat the call is replayed for and
+    must not be modified.
+    """
+
+    method: str
+    kwargs: dict[str, Any] = field(default_factory=dict)
+
+    async def send(self, bot: Any, chat_id: int) -> None:
+        await getattr(bot, self.method)(chat_id=chat_id, **self.kwargs)
+
+
+async def replay(calls: Sequence[ApiCall], bot: Any, chat_id: int) -> None:
+    """Sends the calls to the chat one after another.
+
+    The calls are not paced here, the bot is expected to wait for the
+    chat's rate limit (see :class:`cs2posts.bot.broadcast.ThrottledBot`).
+    """
+    for call in calls:
+        await call.send(bot, chat_id)
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+from cs2posts.msg.constants import TELEGRAM_MAX_MESSAGE_LENGTH
+
+
+TOKEN_PATTERN = re.compile(
+    r"<(?P<close>/?)(?P<tag>[a-zA-Z][\w-]*)[^>]*>"
+    r"|&(?P<entity>#[0-9]+|#[xX][0-9a-fA-F]+|[a-zA-Z]+);")
+
+# Named entities Telegram decodes, any other is sent as text.
+TELEGRAM_ENTITIES = {"lt", "gt", "amp", "quot"}
+
+# A line with its line break, or the rest of the text without one
+LINE_PATTERN = re.compile(r"[^\n]*\n|[^\n]+")
+
+
+def utf16_len(text: str) -> int:
+    """Length of text as Telegram counts it, in UTF-16 code units."""
+    if text.isascii():
+        return len(text)
+    return len(text.encode("utf-16-le")) // 2
+
+
+def utf16_prefix(text: str, length: int) -> str:
+    """Longest prefix of text with at most ``length`` UTF-16 code units."""
+    if text.isascii():
+        return text[:length]
+    encoded = text.encode("utf-16-le")[:length * 2]
+    # Do not cut a character outside the BMP in half
+    if len(encoded) >= 2 and 0xD8 <= encoded[-1] <= 0xDB:
+        encoded = encoded[:-2]
+    return encoded.decode("utf-16-le")
+
+
+def entity_len(raw: str, entity: str) -> int:
+    """Length of an entity, Telegram sends an unknown one as text."""
+    if entity.startswith("#"):
+        try:
+            code = int(entity[2:], 16) if entity[1] in "xX" else int(entity[1:])
+            return utf16_len(chr(code))
+        except (ValueError, OverflowError):
+            return len(raw)
+    return 1 if entity in TELEGRAM_ENTITIES else len(raw)
+
+
+@dataclass(frozen=True)
+class _LineStart:
+    """Where the current line starts in the chunk that is being packed."""
+
+    index: int
+    used: int
+    tags: tuple[tuple[str, str], ...]
+
+
+# Kinds of tokens besides tags
+_TEXT = ""
+_ENTITY = "&"
+
+
+class _ChunkBuilder:
+    """State of a single :meth:`MessageSplitter.split` call, the chunks
+    packed so far and the one that is being packed."""
+
+    def __init__(self, limit: int) -> None:
+        self.__limit = limit
+        self.__chunks: list[str] = []
+        self.__tags: list[tuple[str, str]] = []
+        self.__parts: list[str] = []
+        self.__used = 0
+        # Number of parts up to the last one with visible text, if any
+        self.__content_end: int | None = None
+        self.__line_start: _LineStart | None = None
+
+    def finish(self) -> list[str]:
+        self.__end_chunk()
+        return self.__chunks
+
+    def __start_chunk(self) -> None:
+        self.__parts = [raw for _, raw in self.__tags]
+        self.__used = 0
+        self.__content_end = None
+        self.__line_start = None
+
+    def __end_chunk(self) -> None:
+        if self.__content_end is not None:
+            closing = "".join(f"</{tag}>" for tag, _ in reversed(self.__tags))
+            self.__chunks.append("".join(self.__parts) + closing)
+        self.__start_chunk()
+
+    def open_tag(self, raw: str, tag: str) -> None:
+        self.__parts.append(raw)
+        if not raw.endswith("/>"):
+            self.__tags.append((tag, raw))
+
+    def close_tag(self, raw: str, tag: str) -> None:
+        self.__parts.append(raw)
+        for i in range(len(self.__tags) - 1, -1, -1):
+            if self.__tags[i][0] == tag:
+                del self.__tags[i]
+                break
+
+    def __break_at_line_start(self) -> bool:
+        # Move the current line to the next chunk if this one is full enough
+        line_start = self.__line_start
+        if line_start is None or line_start.used * 2 < self.__limit:
+            return False
+
+        line = self.__parts[line_start.index:]
+        used = self.__used - line_start.used
+        content_end = self.__content_end
+        tags = self.__tags
+        self.__parts = self.__parts[:line_start.index]
+        self.__tags = list(line_start.tags)
+        self.__end_chunk()
+
+        self.__tags = tags
+        if content_end is not None and content_end > line_start.index:
+            self.__content_end = content_end - line_start.index + len(self.__parts)
+        self.__parts.extend(line)
+        self.__used = used
+        return True
+
+    def add_text(self, text: str, length: int, cut: bool) -> None:
+        while self.__used + length > self.__limit:
+            if self.__break_at_line_start():
+                continue
+
+            budget = self.__limit - self.__used
+            head = utf16_prefix(text, budget) if cut else ""
+            space = head.rfind(" ")
+            if space > 0:
+                head = head[:space + 1]
+            if head:
+                self.__append(head, utf16_len(head))
+                text = text[len(head):]
+                length = utf16_len(text)
+            elif self.__used == 0:
+                # Does not fit into an empty chunk either
+                break
+            self.__end_chunk()
+
+        if text:
+            self.__append(text, length)
+
+    def __append(self, text: str, length: int) -> None:
+        self.__parts.append(text)
+        self.__used += length
+        if not text.isspace():
+            self.__content_end = len(self.__parts)
+        if text.endswith("\n"):
+            self.__line_start = _LineStart(len(self.__parts), self.__used, tuple(self.__tags))
+
+
+class MessageSplitter:
+    """Splits an HTML message into chunks Telegram accepts.
+
+    The length of a chunk is counted like Telegram does, the text without
+    tags with entities decoded in UTF-16 code units. Tags and entities are
+    never cut, tags that are open at the end of a chunk are closed and
+    opened again in the next one. A chunk ends at a line break once it is
+    at least half full, otherwise the line is cut at its last space that
+    fits, so no chunk but the last one is less than half full.
+    """
+
+    def __init__(self, limit: int = TELEGRAM_MAX_MESSAGE_LENGTH) -> None:
+        if limit <= 0:
+            raise ValueError('limit must be greater than 0')
+        self.__limit = limit
+
+    @property
+    def limit(self) -> int:
+        return self.__limit
+
+    def split(self, message: str) -> list[str]:
+        # Tags and entities are never shorter than the text they stand for
+        if utf16_len(message) <= self.__limit:
+            return [message]
+
+        tokens = self.__tokenize(message)
+        if sum(length for _, _, length in tokens) <= self.__limit:
+            return [message]
+
+        # The chunks are packed on a builder of their own, so one splitter
+        # can be shared, e.g. by messages built in worker threads.
+        builder = _ChunkBuilder(self.__limit)
+        for raw, kind, length in tokens:
+            if kind == _TEXT or kind == _ENTITY:
+                builder.add_text(raw, length, cut=kind == _TEXT)
+            elif kind.startswith("/"):
+                builder.close_tag(raw, kind[1:])
+            else:
+                builder.open_tag(raw, kind)
+        return builder.finish()
+
+    @staticmethod
+    def __tokenize(message: str) -> list[tuple[str, str, int]]:
+        # (raw, kind, length), the kind of a tag is its name prefixed with
+        # "/" if it closes. Text is split into lines.
+        tokens: list[tuple[str, str, int]] = []
+        end = 0
+        for match in TOKEN_PATTERN.finditer(message):
+            for line in LINE_PATTERN.findall(message, end, match.start()):
+                tokens.append((line, _TEXT, utf16_len(line)))
+            end = match.end()
+            raw = match.group()
+            entity = match.group("entity")
+            if entity is not None:
+                tokens.append((raw, _ENTITY, entity_len(raw, entity)))
+            else:
+                tokens.append((raw, match.group("close") + match.group("tag").lower(), 0))
+        for line in LINE_PATTERN.findall(message, end):
+            tokens.append((line, _TEXT, utf16_len(line)))
+        return tokens
+
+
+def split_message(message: str, limit: int = TELEGRAM_MAX_MESSAGE_LENGTH) -> list[str]:
+    return MessageSplitter(limit).split(message)
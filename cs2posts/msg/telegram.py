@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-import asyncio
 import logging
+from collections.abc import Awaitable
+from collections.abc import Callable
 from typing import Any
 
 from telegram.constants import ParseMode
 
+from cs2posts.dto.post import Post
 from cs2posts.msg.constants import TELEGRAM_MAX_MESSAGE_LENGTH
-from cs2posts.msg.constants import TELEGRAM_SEND_DELAY_SECONDS
+from cs2posts.msg.splitter import split_message
 
 
 logger = logging.getLogger(__name__)
@@ -15,10 +17,25 @@ logger = logging.getLogger(__name__)
 
 class TelegramMessage:
 
+    # Bump when the rendered output or the fields of to_dict change to
+    # invalidate cached messages (see tests/msg/test_message.py).
+    VERSION = 3
+
     def __init__(self, message: str) -> None:
         self.__message = message
         self.__messages = self.split(message)
 
+    def to_dict(self) -> dict[str, Any]:
+        return {"message": self.__message, "messages": self.__messages}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], post: Post | None = None) -> TelegramMessage:
+        """Rebuild a message from :meth:`to_dict` without rendering it again."""
+        msg = cls.__new__(cls)
+        msg.__message = data["message"]
+        msg.__messages = list(data["messages"])
+        return msg
+
     @property
     def message(self) -> str:
         return self.__message
@@ -28,46 +45,35 @@ class TelegramMessage:
         return self.__messages
 
     def split(self, message: str) -> list[str]:
+        return split_message(message, TELEGRAM_MAX_MESSAGE_LENGTH)
 
-        if len(message) <= TELEGRAM_MAX_MESSAGE_LENGTH:
-            return [message]
-
-        chunks: list[str] = []
-        chunk = ''
-
-        for line in message.split('\n'):
-            candidate = f'{chunk}{line}\n'
-            if len(candidate) <= TELEGRAM_MAX_MESSAGE_LENGTH:
-                chunk = candidate
-                continue
-
-            if chunk:
-                chunks.append(chunk)
-
-            # A single line can itself exceed the limit; hard-split it so we
-            # never hand Telegram an over-long message that it would reject.
-            while len(line) > TELEGRAM_MAX_MESSAGE_LENGTH:
-                chunks.append(line[:TELEGRAM_MAX_MESSAGE_LENGTH])
-                line = line[TELEGRAM_MAX_MESSAGE_LENGTH:]
-
-            chunk = f'{line}\n'
-
-        if chunk:
-            chunks.append(chunk)
-
-        return chunks
-
-    async def send(self, bot: Any, chat_id: int) -> None:
-        """Default implementation: sends each text chunk in ``self.messages``.
-
-        Subclasses that handle richer content (images, carousels, etc.) should
-        override this method.
+    @property
+    def block_count(self) -> int:
+        return len(self.messages)
+
+    async def send_block(self, bot: Any, chat_id: int, index: int) -> None:
+        await bot.send_message(
+            chat_id=chat_id,
+            text=self.messages[index],
+            parse_mode=ParseMode.HTML,
+            disable_web_page_preview=True)
+
+    async def send(
+        self,
+        bot: Any,
+        chat_id: int,
+        *,
+        start: int = 0,
+        progress: Callable[[int], Awaitable[None]] | None = None,
+    ) -> None:
+        """Sends the blocks of the message beginning with block ``start``.
+
+        By default a block is a text chunk in ``self.messages``. Subclasses
+        that handle richer content (images, carousels, etc.) should override
+        ``block_count`` and ``send_block``. After each block ``progress`` is
+        awaited with the index of the next block to send.
         """
-        for i, msg in enumerate(self.messages):
-            await bot.send_message(
-                chat_id=chat_id,
-                text=msg,
-                parse_mode=ParseMode.HTML,
-                disable_web_page_preview=True)
-            if i < len(self.messages) - 1:
-                await asyncio.sleep(TELEGRAM_SEND_DELAY_SECONDS)
+        for i in range(start, self.block_count):
+            await self.send_block(bot, chat_id, i)
+            if progress is not None:
+                await progress(i + 1)
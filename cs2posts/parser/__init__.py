@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+from .document import DocumentCache
+from .document import ParsedDocument
 from .steam2telegram_html import Steam2TelegramHTML
 from .steam_list import SteamListParser
 from .steam_news_table import SteamNewsTableParser
 from .steam_update_heading import SteamUpdateHeadingParser
 
 __all__ = [
+    "DocumentCache",
+    "ParsedDocument",
     "SteamListParser",
     "SteamNewsTableParser",
     "SteamUpdateHeadingParser",
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable
+from collections.abc import Sequence
+from typing import Any
+from typing import TypeVar
+
+from cs2posts.parser.parser import Parser
+from cs2posts.parser.steam2telegram_html import render_bbcode
+from cs2posts.parser.steam2telegram_html import render_steam_format
+
+
+T = TypeVar('T')
+
+
+class ParsedDocument:
+    """The body of a post, parsed once for every message built from it.
+
+    The bbcode is rendered on first use. The HTML after a chain of
+    sub-parsers and whatever a message derives from the body are kept, so
+    rendering the same body again skips the parsing. The results must not
+    be modified, they are shared.
+    """
+
+    def __init__(self, contents: str) -> None:
+        self.__contents = contents
+        self.__html: str | None = None
+        self.__rendered: dict[tuple[type[Parser], ...], str] = {}
+        self.__derived: dict[Callable[[str], Any], Any] = {}
+
+    @property
+    def contents(self) -> str:
+        return self.__contents
+
+    @property
+    def html(self) -> str:
+        """The rendered bbcode, before any sub-parser ran."""
+        if self.__html is None:
+            self.__html = render_bbcode(self.__contents)
+        return self.__html
+
+    def render(self, parsers: Sequence[type[Parser]]) -> str:
+        """Same as Steam2TelegramHTML with the sub-parsers in this order."""
+        key = tuple(parsers)
+        rendered = self.__rendered.get(key)
+        if rendered is None:
+            text = self.html
+            for parser in parsers:
+                text = parser(text).parse()
+            rendered = self.__rendered[key] = render_steam_format(text)
+        return rendered
+
+    def derive(self, func: Callable[[str], T]) -> T:
+        """``func(contents)``, computed once per function."""
+        if func not in self.__derived:
+            self.__derived[func] = func(self.__contents)
+        return self.__derived[func]
+
+
+class DocumentCache:
+    """Bounded LRU cache of parsed post bodies.
+
+    Entries are keyed by the post gid. A post whose body changed since it
+    was parsed, e.g. after its image placeholders were resolved, is parsed
+    again.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        if maxsize <= 0:
+            raise ValueError('maxsize must be greater than 0')
+        self.__maxsize = maxsize
+        self.__documents: OrderedDict[str, ParsedDocument] = OrderedDict()
+
+    @property
+    def maxsize(self) -> int:
+        return self.__maxsize
+
+    def __len__(self) -> int:
+        return len(self.__documents)
+
+    def __contains__(self, gid: str) -> bool:
+        return gid in self.__documents
+
+    def get(self, gid: str, contents: str) -> ParsedDocument:
+        document = self.__documents.get(gid)
+        if document is None or document.contents != contents:
+            document = self.__documents[gid] = ParsedDocument(contents)
+        self.__documents.move_to_end(gid)
+        while len(self.__documents) > self.__maxsize:
+            self.__documents.popitem(last=False)
+        return document
+
+    def clear(self) -> None:
+        self.__documents.clear()
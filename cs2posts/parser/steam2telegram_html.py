@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import re
 import sys
+from typing import Any
 
 import bbcode
 
@@ -19,49 +20,117 @@ NEWLINE_FORMAT = {
     },
 }
 
-PatternSubRule = dict[str, re.Pattern[str] | str]
-
 # Patterns that must be resolved before sub-parsers run (e.g. before
 # SteamUpdateHeadingParser, which would otherwise match [/p] as a heading).
-PRE_PARSER_FORMAT: dict[str, PatternSubRule] = {
+# The paragraphs are rewritten by PARAGRAPH_PASS.
+PRE_PARSER_FORMAT: dict[str, dict[str, Any]] = {
     "strike": {
         'pattern': re.compile(r'\[strike\](.*?)\[/strike\]', re.IGNORECASE | re.DOTALL),
         'replace': r'\1',
     },
-    "p_empty": {
-        'pattern': re.compile(r'\[p\]\[/p\]', re.IGNORECASE),
-        'replace': '\n',
-    },
-    "p": {
-        'pattern': re.compile(r'\[p\](.*?)\[/p\]', re.IGNORECASE | re.DOTALL),
-        'replace': r'\1',
-    },
 }
 
-STEAM_FORMAT = {
-    "h2": {
-        'pattern': r'\[h2\](.*?)\[/h2\]',
-        'replace': r'\n\n<b>\1</b>\n\n',
-    },
-    "h3": {
-        'pattern': r'\[h3\](.*?)\[/h3\]',
-        'replace': r'\n\n<b>\1</b>\n\n',
-    },
-    "h4": {
-        'pattern': r'\[h4\](.*?)\[/h4\]',
-        'replace': r'\n\n<b>\1</b>\n\n',
-    },
-    "h5": {
-        'pattern': r'\[h5\](.*?)\[/h5\]',
-        'replace': r'\n\n<b>\1</b>\n\n',
-    },
+# The headings are rewritten by HEADING_PASS.
+STEAM_FORMAT: dict[str, dict[str, Any]] = {
     "dash": {
-        'pattern': r'&ndash;',
+        'pattern': re.compile(r'&ndash;', re.IGNORECASE),
         'replace': r'—',
     },
 }
 
 
+class TagPass:
+    """Rewrites paired bbcode tags and bbcode literals in one scan.
+
+    A tag is paired like a lazy, case insensitive substitution of
+    ``[tag](.*?)[/tag]`` would pair it: an opening tag pairs with the first
+    closing tag after it, tags of the same name in between are left as
+    they are. Both tags of a pair are replaced by ``(before, after)``, the
+    text between them is kept. A literal, e.g. ``[p][/p]``, is replaced
+    wherever it occurs and wins over the tags it starts with.
+
+    The scan gives the same text as applying the rules one after another
+    as long as no replacement creates or removes a token of another rule.
+    All tokens start with ``[``, the regex engine skips ahead to it.
+    """
+
+    def __init__(self, tags: dict[str, tuple[str, str]], literals: dict[str, str] | None = None) -> None:
+        self.__tags = tags
+        self.__literals = literals or {}
+        if not all(literal.startswith('[') for literal in self.__literals):
+            raise ValueError('literals must start with "["')
+        tokens = [re.escape(literal[1:]) for literal in sorted(self.__literals, key=len, reverse=True)]
+        tokens.append('/?(?:' + '|'.join(re.escape(tag) for tag in tags) + r')\]')
+        # The group makes split return the tokens between the text.
+        self.__pattern = re.compile(r'(\[(?i:' + '|'.join(tokens) + '))')
+
+    def sub(self, text: str) -> str:
+        parts = self.__pattern.split(text)
+        # Index of the first unpaired opening tag of every tag
+        opened: dict[str, int] = {}
+
+        for i in range(1, len(parts), 2):
+            token = parts[i].lower()
+            if token in self.__literals:
+                parts[i] = self.__literals[token]
+            elif token[1] != '/':
+                opened.setdefault(token[1:-1], i)
+            else:
+                start = opened.pop(token[2:-1], None)
+                if start is not None:
+                    parts[start], parts[i] = self.__tags[token[2:-1]]
+
+        return ''.join(parts)
+
+
+# Empty and filled paragraphs in one scan. It runs after PRE_PARSER_FORMAT,
+# removing a [strike] can leave an empty paragraph behind.
+PARAGRAPH_PASS = TagPass(tags={"p": ("", "")}, literals={"[p][/p]": "\n"})
+
+# All heading levels in one scan, before STEAM_FORMAT
+HEADING_PASS = TagPass(tags={tag: ("\n\n<b>", "</b>\n\n") for tag in ("h2", "h3", "h4", "h5")})
+
+# Three or more line breaks, after the trailing whitespace of the lines is
+# stripped.
+BLANK_LINES_PATTERN = re.compile(r'\n{3,}')
+
+
+def render_bbcode(text: str) -> str:
+    """Render the bbcode of a post, the input of the sub-parsers."""
+    text = bbcode.render_html(text)
+
+    # TODO: Must be placed here now before parsers due to HeadingParser
+    for value in NEWLINE_FORMAT.values():
+        plain_pattern = value['pattern']
+        replace = value['replace']
+        text = text.replace(plain_pattern, replace)
+
+    for pre_value in PRE_PARSER_FORMAT.values():
+        text = pre_value['pattern'].sub(pre_value['replace'], text)
+    text = PARAGRAPH_PASS.sub(text)
+
+    # Replace non-breaking spaces with regular spaces so that
+    # headings like "[ SOUND\xa0]" normalise to "[ SOUND ]".
+    return text.replace('\xa0', ' ')
+
+
+def render_steam_format(text: str) -> str:
+    """Format the Steam tags left after the sub-parsers and tidy up."""
+    text = HEADING_PASS.sub(text)
+    for format_value in STEAM_FORMAT.values():
+        text = format_value['pattern'].sub(format_value['replace'], text)
+
+    # Strip trailing whitespace on each line and collapse 3+ newlines.
+    # rstrip strips the same characters as [^\S\n]+ before a line break,
+    # without trying a match at every position. The last line has no
+    # line break and keeps its whitespace.
+    lines = text.split('\n')
+    last_line = lines.pop()
+    lines = [line.rstrip() for line in lines]
+    lines.append(last_line)
+    return BLANK_LINES_PATTERN.sub('\n\n', '\n'.join(lines))
+
+
 class Steam2TelegramHTML(Parser):
 
     def __init__(self, text: str):
@@ -71,41 +140,16 @@ class Steam2TelegramHTML(Parser):
     def add_parser(self, parser: type[Parser], priority: int = sys.maxsize) -> None:
         self.__parser.append((parser, priority))
 
+    @property
+    def parsers(self) -> list[type[Parser]]:
+        return [parser for parser, _ in sorted(self.__parser, key=lambda x: x[1])]
+
     def parse(self) -> str:
-        self.text = bbcode.render_html(self.text)
-
-        # TODO: Must be placed here now before parsers due to HeadingParser
-        for value in NEWLINE_FORMAT.values():
-            plain_pattern = value['pattern']
-            replace = value['replace']
-            self.text = self.text.replace(plain_pattern, replace)
-
-        for pre_value in PRE_PARSER_FORMAT.values():
-            pattern = pre_value['pattern']
-            if not isinstance(pattern, re.Pattern):
-                continue
-            pre_replace = pre_value['replace']
-            if not isinstance(pre_replace, str):
-                continue
-            self.text = pattern.sub(pre_replace, self.text)
-
-        # Replace non-breaking spaces with regular spaces so that
-        # headings like "[ SOUND\xa0]" normalise to "[ SOUND ]".
-        self.text = self.text.replace('\xa0', ' ')
-
-        parser_by_priority = sorted(self.__parser, key=lambda x: x[1])
-        for parser, _ in parser_by_priority:
-            self.text = parser(self.text).parse()
+        self.text = render_bbcode(self.text)
 
-        for value in STEAM_FORMAT.values():
-            pattern = value['pattern']
-            replace = value['replace']
-            self.text = re.sub(
-                pattern, replace, self.text,
-                flags=re.IGNORECASE | re.DOTALL)
+        for parser in self.parsers:
+            self.text = parser(self.text).parse()
 
-        # Strip trailing whitespace on each line and collapse 3+ newlines.
-        self.text = re.sub(r'[^\S\n]+\n', '\n', self.text)
-        self.text = re.sub(r'\n{3,}', '\n\n', self.text)
+        self.text = render_steam_format(self.text)
 
         return self.text
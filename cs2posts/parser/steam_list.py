@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import re
+
 from cs2posts.parser.parser import Parser
 
 
@@ -12,64 +14,40 @@ class SteamListParser(Parser):
     LIST_ITEM_ICON = "•"
     LIST_ITEM_ICON_NESTED = "◦"
 
-    def is_tag(self, tag: str, i: int) -> bool:
-        return self.text[i:i + len(tag)] == tag
-
-    def is_start_tag_list(self, i: int) -> bool:
-        return self.is_tag(self.LIST_START_TAG, i)
-
-    def is_end_tag_list(self, i: int) -> bool:
-        return self.is_tag(self.LIST_END_TAG, i)
-
-    def is_start_tag_list_item(self, i: int) -> bool:
-        return self.is_tag(self.LIST_ITEM_START_TAG, i)
-
-    def is_end_tag_list_item(self, i: int) -> bool:
-        return self.is_tag(self.LIST_ITEM_END_TAG, i)
-
-    def is_empty_tag_list_item(self, i: int) -> bool:
-        return self.is_tag(self.LIST_ITEM_START_TAG + self.LIST_ITEM_END_TAG, i)
+    # An empty item is matched first, it gets an icon but no line break.
+    # The group makes split return the tags between the text.
+    TAG_PATTERN = re.compile("(" + "|".join(re.escape(tag) for tag in (
+        LIST_ITEM_START_TAG + LIST_ITEM_END_TAG,
+        LIST_START_TAG,
+        LIST_END_TAG,
+        LIST_ITEM_START_TAG,
+        LIST_ITEM_END_TAG,
+    )) + ")")
 
     def parse(self) -> str:
-        i = 0
+        # One scan splits the text at the tags, every tag is replaced in
+        # place and the result joined once.
+        parts = self.TAG_PATTERN.split(self.text)
         nested_lvl = 0
-        modified_str = ""
 
-        while i < len(self.text):
-            if self.is_start_tag_list(i):
-                modified_str += "" if nested_lvl > 0 else "\n"
-                i += len(self.LIST_START_TAG)
+        for i in range(1, len(parts), 2):
+            tag = parts[i]
+            if tag == self.LIST_ITEM_END_TAG:
+                parts[i] = "\n"
+            elif tag == self.LIST_START_TAG:
+                parts[i] = "\n" if nested_lvl <= 0 else ""
                 nested_lvl += 1
-                continue
-
-            if self.is_start_tag_list_item(i):
-                space = " " * (nested_lvl - 1) * 4 if nested_lvl > 1 else ""
-                if nested_lvl > 1:
-                    tag = self.LIST_ITEM_ICON_NESTED
-                else:
-                    tag = self.LIST_ITEM_ICON
-                modified_str += f"{space}{tag} "
-
-                if self.is_empty_tag_list_item(i):
-                    i += len(self.LIST_ITEM_START_TAG + self.LIST_ITEM_END_TAG)
-                else:
-                    i += len(self.LIST_ITEM_START_TAG)
-                continue
-
-            if self.is_end_tag_list_item(i):
-                modified_str += "\n"
-                i += len(self.LIST_ITEM_END_TAG)
-                continue
-
-            if self.is_end_tag_list(i):
-                modified_str += "" if nested_lvl > 1 else "\n"
+            elif tag == self.LIST_END_TAG:
+                parts[i] = "\n" if nested_lvl <= 1 else ""
                 nested_lvl -= 1
-                i += len(self.LIST_END_TAG)
-                continue
-
-            modified_str += self.text[i]
-            i += 1
+            else:
+                parts[i] = self.__item_icon(nested_lvl)
 
-        self.text = modified_str
+        self.text = "".join(parts)
 
         return self.text
+
+    def __item_icon(self, nested_lvl: int) -> str:
+        if nested_lvl > 1:
+            return f"{' ' * (nested_lvl - 1) * 4}{self.LIST_ITEM_ICON_NESTED} "
+        return f"{self.LIST_ITEM_ICON} "
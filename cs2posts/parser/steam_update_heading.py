@@ -11,7 +11,10 @@ logger = logging.getLogger(__name__)
 
 class SteamUpdateHeadingParser(Parser):
 
-    HEADING_REGEX = re.compile(r"(?P<escape>\\)?\[(?P<heading>[a-zA-Z0-9&/'\-\s]+)\]")
+    # Starts with a literal "[", so the regex engine can skip ahead to it.
+    # An escaping backslash in front is added to the match by parse.
+    HEADING_REGEX = re.compile(r"\[(?P<heading>[a-zA-Z0-9&/'\-\s]+)\]")
+    ESCAPE = "\\"
     # Will be completed if needed
     HEADING_LIST_IGNORE = ["CT"]
     MIN_HEADING_LENGTH = 2
@@ -52,18 +55,16 @@ class SteamUpdateHeadingParser(Parser):
         stripped = word.strip().upper()
         return stripped in self.HEADING_LIST_IGNORE
 
-    def format_heading(self, match: re.Match[str]) -> str:
-        heading = match.group("heading")
+    def format_heading(self, heading: str, start: int, end: int) -> str:
         bracketed_heading = f"[{heading}]"
 
         if not self.has_min_size(heading) or self.is_single_element_heading(heading):
-            return match.group(0)
+            return self.text[start:end]
 
         if self.ignore(heading):
             logger.warning(f"Not handled heading: {bracketed_heading}")
-            return match.group(0)
+            return self.text[start:end]
 
-        start, end = match.span()
         formatted_heading = f"<b>{bracketed_heading}</b>"
 
         if self.is_heading(start, end):
@@ -83,5 +84,18 @@ class SteamUpdateHeadingParser(Parser):
         return f"{formatted_heading}\n"
 
     def parse(self) -> str:
-        self.text = self.HEADING_REGEX.sub(self.format_heading, self.text)
+        text = self.text
+        parts = []
+        end = 0
+
+        for match in self.HEADING_REGEX.finditer(text):
+            start = match.start()
+            if start > 0 and text[start - 1] == self.ESCAPE:
+                start -= 1
+            parts.append(text[end:start])
+            end = match.end()
+            parts.append(self.format_heading(match.group("heading"), start, end))
+
+        parts.append(text[end:])
+        self.text = "".join(parts)
         return self.text
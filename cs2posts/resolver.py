@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+import re
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Hashable
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+from typing import Generic
+from typing import TypeVar
+
+import httpx
+
+from cs2posts.bot.constants import REQUESTS_TIMEOUT
+
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+# HTTP/2 needs the optional h2 package (pip install httpx[http2]).
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+# Steam posts reference their images relative to one of these CDN hosts.
+STEAM_CLAN_IMAGE = "{STEAM_CLAN_IMAGE}"
+STEAM_CLAN_IMAGE_HOSTS = (
+    "https://clan.akamai.steamstatic.com/images",
+    "https://clan.fastly.steamstatic.com/images",
+)
+# Image URLs of a post probed at most before its hosts are given up on.
+STEAM_CLAN_IMAGE_SAMPLES = 3
+_STEAM_CLAN_IMAGE_URL_RE = re.compile(re.escape(STEAM_CLAN_IMAGE) + r"""[^\s"'<>\[\]]*""")
+
+
+class TTLCache(Generic[K, V]):
+    """LRU cache whose entries additionally expire ``ttl`` seconds after
+    they were stored. Once ``maxsize`` is reached the least recently used
+    entry is evicted, the rest of the cache is kept."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        if maxsize <= 0:
+            raise ValueError('maxsize must be greater than 0')
+        self.__maxsize = maxsize
+        self.__ttl = ttl
+        self.__entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    @property
+    def maxsize(self) -> int:
+        return self.__maxsize
+
+    @property
+    def ttl(self) -> float:
+        return self.__ttl
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, key: K) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: K) -> V | None:
+        entry = self.__entries.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if expires <= time.monotonic():
+            del self.__entries[key]
+            return None
+        self.__entries.move_to_end(key)
+        return value
+
+    def put(self, key: K, value: V) -> None:
+        self.__entries[key] = (time.monotonic() + self.__ttl, value)
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.__maxsize:
+            self.__entries.popitem(last=False)
+
+    def pop(self, key: K) -> None:
+        self.__entries.pop(key, None)
+
+    def clear(self) -> None:
+        self.__entries.clear()
+
+
+@dataclass(frozen=True)
+class Probe:
+    """Outcome of requesting a URL: whether it answered with a success
+    status and the URL it finally redirected to."""
+    ok: bool
+    url: str
+
+
+class UrlResolver:
+    """Validates URLs and follows their redirects over one pooled client.
+
+    Successful probes are cached for ``ttl`` seconds and URLs that answered
+    with an error status for ``negative_ttl`` seconds. Transient errors
+    (timeouts, refused connections) are never cached, otherwise a single
+    network blip would mark a valid URL as invalid. Concurrent lookups of
+    the same URL share a single request.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient | None = None,
+        *,
+        maxsize: int = 1024,
+        ttl: float = 3600,
+        negative_ttl: float = 300,
+        timeout: float = REQUESTS_TIMEOUT,
+        max_connections: int = 20,
+    ) -> None:
+        self.__client = client
+        self.__timeout = timeout
+        self.__max_connections = max_connections
+        self.__positive: TTLCache[str, Probe] = TTLCache(maxsize, ttl)
+        self.__negative: TTLCache[str, Probe] = TTLCache(maxsize, negative_ttl)
+        self.__in_flight: dict[str, asyncio.Future[Probe]] = {}
+        self.__steam_clan_image_host: TTLCache[str, str] = TTLCache(1, ttl)
+        self.__steam_clan_image_lock = asyncio.Lock()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self.__client is None:
+            self.__client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                follow_redirects=True,
+                timeout=self.__timeout,
+                limits=httpx.Limits(
+                    max_connections=self.__max_connections,
+                    max_keepalive_connections=self.__max_connections))
+        return self.__client
+
+    def cache_clear(self) -> None:
+        self.__positive.clear()
+        self.__negative.clear()
+        self.__steam_clan_image_host.clear()
+
+    async def aclose(self) -> None:
+        client, self.__client = self.__client, None
+        if client is not None:
+            await client.aclose()
+
+    async def probe(self, url: str) -> Probe:
+        cached = self.__positive.get(url) or self.__negative.get(url)
+        if cached is not None:
+            return cached
+
+        future = self.__in_flight.get(url)
+        if future is None:
+            future = asyncio.ensure_future(self.__probe(url))
+            self.__in_flight[url] = future
+            future.add_done_callback(lambda _: self.__in_flight.pop(url, None))
+        # Shielded, so a cancelled caller does not cancel the shared request.
+        return await asyncio.shield(future)
+
+    async def __probe(self, url: str) -> Probe:
+        try:
+            response = await self.client.head(url)
+            # Fallback if server does not allow HEAD requests
+            if response.status_code == 405:
+                response = await self.client.get(url)
+        except Exception as e:
+            logger.error(f"Could not request {url}: {e}")
+            return Probe(ok=False, url=url)
+
+        result = Probe(ok=response.is_success, url=str(response.url))
+        if result.ok:
+            self.__positive.put(url, result)
+        else:
+            self.__negative.put(url, result)
+        return result
+
+    async def is_valid(self, url: str | None) -> bool:
+        if not url or not url.startswith("http"):
+            return False
+        return (await self.probe(url)).ok
+
+    async def resolve(self, url: str) -> str:
+        return (await self.probe(url)).url
+
+    async def steam_clan_image_host(self, urls: Iterable[str]) -> str | None:
+        """Returns the first CDN host serving one of ``urls``, image URLs
+        that still contain the placeholder. The URLs are tried in turn, so
+        a single broken image does not rule out a healthy host. The healthy
+        host is cached, so further posts are resolved without probing the
+        CDN again."""
+        samples = list(dict.fromkeys(urls))[:STEAM_CLAN_IMAGE_SAMPLES]
+        async with self.__steam_clan_image_lock:
+            host = self.__steam_clan_image_host.get(STEAM_CLAN_IMAGE)
+            if host is not None:
+                return host
+
+            for url in samples:
+                for host in STEAM_CLAN_IMAGE_HOSTS:
+                    if await self.is_valid(url.replace(STEAM_CLAN_IMAGE, host)):
+                        self.__steam_clan_image_host.put(STEAM_CLAN_IMAGE, host)
+                        return host
+
+        logger.warning(f"No Steam CDN host serves any of {samples}")
+        return None
+
+    async def resolve_steam_clan_images(self, text: str) -> str:
+        urls = _STEAM_CLAN_IMAGE_URL_RE.findall(text)
+        if not urls:
+            return text
+
+        host = await self.steam_clan_image_host(urls)
+        if host is None:
+            return text
+        return text.replace(STEAM_CLAN_IMAGE, host)
+
+    async def validate_many(self, urls: Iterable[str | None]) -> dict[str | None, bool]:
+        unique = list(dict.fromkeys(urls))
+        results = await asyncio.gather(*(self.is_valid(url) for url in unique))
+        return dict(zip(unique, results))
+
+
+# One resolver per event loop, an httpx client must not be shared between
+# loops.
+_resolvers: weakref.WeakKeyDictionary[Any, UrlResolver] = weakref.WeakKeyDictionary()
+
+
+def get_resolver() -> UrlResolver:
+    loop = asyncio.get_running_loop()
+    resolver = _resolvers.get(loop)
+    if resolver is None:
+        resolver = _resolvers[loop] = UrlResolver()
+    return resolver
+
+
+async def close_resolver() -> None:
+    resolver = _resolvers.pop(asyncio.get_running_loop(), None)
+    if resolver is not None:
+        await resolver.aclose()
+
+
+async def is_valid_url(url: str | None) -> bool:
+    return await get_resolver().is_valid(url)
+
+
+async def resolve_url(url: str) -> str:
+    return await get_resolver().resolve(url)
+
+
+async def resolve_steam_clan_images(text: str) -> str:
+    return await get_resolver().resolve_steam_clan_images(text)
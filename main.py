@@ -7,9 +7,12 @@ from cs2posts.bot import settings
 from cs2posts.bot.cs2 import CounterStrike2UpdateBot
 from cs2posts.bot.heartbeat import write_heartbeat
 from cs2posts.bot.spam import SpamProtector
+from cs2posts.circuit import CircuitBreaker
 from cs2posts.crawler import CounterStrike2Crawler
 from cs2posts.db import ChatDatabase
+from cs2posts.db import DeliveryDatabase
 from cs2posts.db import PostDatabase
+from cs2posts.db import PragmaProfile
 
 
 logging.basicConfig(
@@ -26,11 +29,26 @@ def main() -> int:
     # The heartbeat will be refreshed in post_checker() each crawl cycle.
     write_heartbeat(settings.HEARTBEAT_FILEPATH)
 
+    pragmas = PragmaProfile(
+        journal_mode=settings.SQLITE_JOURNAL_MODE,
+        synchronous=settings.SQLITE_SYNCHRONOUS,
+        mmap_size=settings.SQLITE_MMAP_SIZE,
+        cache_size=settings.SQLITE_CACHE_SIZE,
+        temp_store=settings.SQLITE_TEMP_STORE,
+        busy_timeout_ms=settings.SQLITE_BUSY_TIMEOUT_MS)
+
+    breaker = CircuitBreaker(
+        'Steam API',
+        failure_threshold=settings.STEAM_API_FAILURE_THRESHOLD,
+        base_delay=settings.STEAM_API_BACKOFF_BASE,
+        max_delay=settings.STEAM_API_BACKOFF_MAX)
+
     cs2_update_bot = CounterStrike2UpdateBot(
-        crawler=CounterStrike2Crawler(),
+        crawler=CounterStrike2Crawler(breaker=breaker),
         spam_protector=SpamProtector(),
-        post_db=PostDatabase(settings.POST_DB_FILEPATH),
-        chat_db=ChatDatabase(settings.CHAT_DB_FILEPATH),
+        post_db=PostDatabase(settings.POST_DB_FILEPATH, pragmas),
+        chat_db=ChatDatabase(settings.CHAT_DB_FILEPATH, pragmas),
+        delivery_db=DeliveryDatabase(settings.DELIVERY_DB_FILEPATH, pragmas),
         token=settings.TELEGRAM_TOKEN)
 
     loop = asyncio.new_event_loop()
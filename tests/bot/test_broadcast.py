@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import pytest
+
+from cs2posts.bot.broadcast import Broadcaster
+from cs2posts.bot.broadcast import ChatRateLimiter
+from cs2posts.bot.broadcast import RateLimiter
+from cs2posts.bot.broadcast import ThrottledBot
+
+
+def test_rate_limiter_rejects_invalid_rate():
+    with pytest.raises(ValueError):
+        RateLimiter(0)
+
+
+def test_rate_limiter_reserve_spaces_slots():
+    limiter = RateLimiter(10)
+
+    with patch('cs2posts.bot.broadcast.time.monotonic', return_value=100.0):
+        delays = [limiter.reserve() for _ in range(3)]
+
+    assert delays == pytest.approx([0.0, 0.1, 0.2])
+
+
+def test_rate_limiter_reserve_does_not_bank_idle_time():
+    limiter = RateLimiter(10)
+
+    with patch('cs2posts.bot.broadcast.time.monotonic', return_value=100.0):
+        limiter.reserve()
+    with patch('cs2posts.bot.broadcast.time.monotonic', return_value=200.0):
+        # Being idle for a long time must not allow a burst afterwards.
+        assert limiter.reserve() == 0.0
+        assert limiter.reserve() == pytest.approx(0.1)
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_acquire_sleeps_for_reserved_slot():
+    limiter = RateLimiter(2)
+
+    with patch('cs2posts.bot.broadcast.time.monotonic', return_value=100.0), \
+            patch('cs2posts.bot.broadcast.asyncio.sleep', new=AsyncMock()) as mocked_sleep:
+        await limiter.acquire()
+        await limiter.acquire()
+
+    mocked_sleep.assert_awaited_once_with(pytest.approx(0.5))
+
+
+@pytest.mark.asyncio
+async def test_chat_rate_limiter_limits_each_chat_separately():
+    limiter = ChatRateLimiter(1)
+
+    with patch('cs2posts.bot.broadcast.time.monotonic', return_value=100.0), \
+            patch('cs2posts.bot.broadcast.asyncio.sleep', new=AsyncMock()) as mocked_sleep:
+        await limiter.acquire(1)
+        await limiter.acquire(2)
+        mocked_sleep.assert_not_awaited()
+        await limiter.acquire(1)
+
+    mocked_sleep.assert_awaited_once_with(pytest.approx(1.0))
+    assert len(limiter) == 2
+
+
+def test_chat_rate_limiter_prune_drops_idle_chats():
+    limiter = ChatRateLimiter(1)
+
+    with patch('cs2posts.bot.broadcast.time.monotonic', return_value=100.0):
+        asyncio.run(limiter.acquire(1))
+    with patch('cs2posts.bot.broadcast.time.monotonic', return_value=200.0):
+        limiter.prune()
+
+    assert len(limiter) == 0
+
+
+@pytest.mark.asyncio
+async def test_throttled_bot_throttles_send_methods():
+    bot = AsyncMock()
+    global_limiter = Mock(acquire=AsyncMock())
+    chat_limiter = Mock(acquire=AsyncMock())
+    throttled = ThrottledBot(bot, global_limiter, chat_limiter)
+
+    await throttled.send_message(chat_id=42, text='hello')
+    await throttled.send_photo(chat_id=42, photo='url')
+    await throttled.send_video(chat_id=42, video='url')
+    await throttled.send_media_group(chat_id=42, media=[])
+
+    assert global_limiter.acquire.await_count == 4
+    chat_limiter.acquire.assert_awaited_with(42)
+    bot.send_message.assert_awaited_once_with(chat_id=42, text='hello')
+    bot.send_photo.assert_awaited_once_with(chat_id=42, photo='url')
+    bot.send_video.assert_awaited_once_with(chat_id=42, video='url')
+    bot.send_media_group.assert_awaited_once_with(chat_id=42, media=[])
+
+
+def test_throttled_bot_passes_through_other_attributes():
+    bot = Mock()
+    bot.username = 'cs2bot'
+    throttled = ThrottledBot(bot, RateLimiter(1), ChatRateLimiter(1))
+    assert throttled.username == 'cs2bot'
+    assert throttled.bot is bot
+
+
+def test_broadcaster_rejects_invalid_concurrency():
+    with pytest.raises(ValueError):
+        Broadcaster(global_rate=30, chat_rate=1, concurrency=0)
+
+
+@pytest.mark.asyncio
+async def test_broadcaster_sends_to_every_item():
+    broadcaster = Broadcaster(global_rate=1000, chat_rate=1000, concurrency=4)
+    send = AsyncMock()
+
+    failures = await broadcaster.broadcast(range(10), send)
+
+    assert failures == 0
+    assert sorted(c.args[0] for c in send.await_args_list) == list(range(10))
+
+
+@pytest.mark.asyncio
+async def test_broadcaster_accepts_async_iterables():
+    broadcaster = Broadcaster(global_rate=1000, chat_rate=1000, concurrency=2)
+    send = AsyncMock()
+
+    async def items():
+        for i in range(5):
+            yield i
+
+    await broadcaster.broadcast(items(), send)
+
+    assert send.await_count == 5
+
+
+@pytest.mark.asyncio
+async def test_broadcaster_runs_sends_concurrently():
+    broadcaster = Broadcaster(global_rate=1000, chat_rate=1000, concurrency=3)
+    running = 0
+    max_running = 0
+
+    async def send(item):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    await broadcaster.broadcast(range(9), send)
+
+    assert max_running == 3
+
+
+@pytest.mark.asyncio
+async def test_broadcaster_counts_failures_and_continues():
+    broadcaster = Broadcaster(global_rate=1000, chat_rate=1000, concurrency=1)
+    send = AsyncMock(side_effect=[None, RuntimeError('boom'), None])
+
+    failures = await broadcaster.broadcast([1, 2, 3], send)
+
+    assert failures == 1
+    assert send.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_broadcaster_throttle_shares_limiters():
+    broadcaster = Broadcaster(global_rate=30, chat_rate=1, concurrency=1)
+    bot = AsyncMock()
+
+    first = broadcaster.throttle(bot)
+    second = broadcaster.throttle(bot)
+
+    assert first.bot is bot
+    assert first._ThrottledBot__global_limiter is second._ThrottledBot__global_limiter
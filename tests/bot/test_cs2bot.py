@@ -11,11 +11,20 @@ from telegram.constants import ChatType
 from telegram.error import BadRequest
 from telegram.error import ChatMigrated
 from telegram.error import Forbidden
+from telegram.error import RetryAfter
 
 from cs2posts.bot import settings
+from cs2posts.bot.broadcast import ThrottledBot
 from cs2posts.bot.cs2 import CounterStrike2UpdateBot
+from cs2posts.circuit import CircuitBreaker
+from cs2posts.circuit import CircuitOpenError
 from cs2posts.dto.chats import Chat
+from cs2posts.dto.delivery import Delivery
+from cs2posts.dto.delivery import DeliveryStatus
+from cs2posts.dto.post import LatestPosts
 from cs2posts.dto.post import Post
+from cs2posts.dto.post import PostHeader
+from cs2posts.dto.post import PostType
 
 
 def create_update_post():
@@ -47,19 +56,53 @@ def create_news_post():
                 appid=730)
 
 
+def create_external_post():
+    post = create_news_post()
+    post.gid = "external"
+    post.feed_type = 0
+    return post
+
+
+def _subscriber_pages(*pages):
+    async def iter_subscriber_ids(post_type):
+        for page in pages:
+            yield page
+    return Mock(side_effect=iter_subscriber_ids)
+
+
+def _crawled(*newsitems, error=None):
+    async def crawl_new(*args, **kwargs):
+        for item in newsitems:
+            yield item
+        if error is not None:
+            raise error
+    return Mock(side_effect=crawl_new)
+
+
 @pytest.fixture
 @patch('cs2posts.bot.spam.SpamProtector')
 @patch('cs2posts.crawler.CounterStrike2Crawler')
 def bot(mocked_crawler, mocked_spam_protector):
+    mocked_crawler.aclose = AsyncMock()
+    mocked_crawler.breaker = CircuitBreaker('Steam API')
     mocked_spam_protector.check = AsyncMock()
     mocked_spam_protector.strike = AsyncMock()
     mocked_chat_db = AsyncMock()
+    mocked_chat_db.iter_subscriber_ids = _subscriber_pages()
     mocked_post_db = AsyncMock()
+    mocked_post_db.get_rendered.return_value = None
+    mocked_post_db.get_dates.return_value = {}
+    mocked_post_db.get_latest_posts.return_value = LatestPosts()
+    mocked_delivery_db = AsyncMock()
+    mocked_delivery_db.filepath = Mock()
+    mocked_delivery_db.get_pending.return_value = []
+    mocked_delivery_db.count_pending.return_value = 0
 
     bot = CounterStrike2UpdateBot(
         token='test_token',
         chat_db=mocked_chat_db,
         post_db=mocked_post_db,
+        delivery_db=mocked_delivery_db,
         crawler=mocked_crawler,
         spam_protector=mocked_spam_protector)
 
@@ -94,6 +137,7 @@ def test_cs2_bot_init_sets_custom_timeouts(mocked_httpx_request, mocked_builder)
         post_db=AsyncMock(),
         crawler=AsyncMock(),
         spam_protector=AsyncMock(),
+        delivery_db=AsyncMock(),
     )
 
     mocked_httpx_request.assert_called_once_with(
@@ -113,6 +157,10 @@ async def test_cs2_bot_post_init(bot):
     await bot.post_init(mocked_app)
     assert bot.username == "test_bot"
     assert mocked_app.job_queue.run_repeating.call_count == 2
+    mocked_app.job_queue.run_once.assert_any_call(
+        callback=bot.crawl_job, when=bot.scheduler.next_delay())
+    mocked_app.job_queue.run_once.assert_any_call(
+        callback=bot.resume_deliveries, when=0)
 
 
 @pytest.mark.asyncio
@@ -126,15 +174,18 @@ async def test_cs2_bot_post_init_without_job_queue(bot):
 
 @pytest.mark.asyncio
 async def test_cs2_bot_post_shutdown(bot):
-    bot.latest_news_post = create_news_post()
-    bot.latest_update_post = create_update_post()
-    bot.latest_external_post = create_update_post()
+    bot.latest_news_post = PostHeader.from_post(create_news_post())
 
-    await bot.post_shutdown(Mock())
+    with patch('cs2posts.bot.cs2.close_resolver', new_callable=AsyncMock) as mock_close_resolver:
+        await bot.post_shutdown(Mock())
 
-    assert call(bot.latest_news_post) in bot.post_db.save.call_args_list
-    assert call(bot.latest_update_post) in bot.post_db.save.call_args_list
-    assert call(bot.latest_external_post) in bot.post_db.save.call_args_list
+    # Posts are saved when they are found, not on shutdown
+    bot.post_db.save.assert_not_called()
+    bot.post_db.close.assert_awaited_once()
+    bot.chat_db.close.assert_awaited_once()
+    bot.delivery_db.close.assert_awaited_once()
+    bot.crawler.aclose.assert_awaited_once()
+    mock_close_resolver.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -405,18 +456,121 @@ async def test_cs2_bot_latest_command(bot):
 
     chat = Chat(42)
     bot.chat_db.get.return_value = chat
-    bot.latest_post = Mock()
+    post = create_news_post()
+    bot.latest_post = PostHeader.from_post(post)
+    bot.post_db.get_post_by_gid.return_value = post
 
     with patch('cs2posts.bot.cs2.create_message') as mocked_factory:
         mocked_msg = Mock()
         mocked_factory.return_value = mocked_msg
         bot.send_message = AsyncMock()
         await bot.latest(mocked_update, mocked_context)
-        mocked_factory.assert_called_once_with(bot.latest_post)
+        mocked_factory.assert_called_once_with(post, bot.document_cache)
         bot.send_message.assert_called_once_with(
             context=mocked_context, msg=mocked_msg, chat=chat)
 
 
+@pytest.mark.asyncio
+async def test_cs2_bot_latest_command_reuses_cached_message(bot):
+    bot.chat_db.get.return_value = Chat(42)
+    post = create_news_post()
+    bot.latest_post = PostHeader.from_post(post)
+    bot.post_db.get_post_by_gid.return_value = post
+    bot.send_message = AsyncMock()
+
+    with patch('cs2posts.bot.cs2.create_message', return_value=Mock()) as mocked_factory:
+        await bot.latest(AsyncMock(), AsyncMock())
+        await bot.latest(AsyncMock(), AsyncMock())
+
+        mocked_factory.assert_awaited_once_with(post, bot.document_cache)
+    # The contents are only read for the first message
+    bot.post_db.get_post_by_gid.assert_awaited_once_with(post.gid)
+    first, second = bot.send_message.await_args_list
+    assert first.kwargs['msg'] is second.kwargs['msg']
+
+
+@pytest.mark.asyncio
+async def test_cs2_bot_latest_command_post_missing(bot):
+    bot.chat_db.get.return_value = Chat(42)
+    bot.latest_post = PostHeader.from_post(create_news_post())
+    bot.post_db.get_post_by_gid.return_value = None
+    bot.send_message = AsyncMock()
+
+    with patch('cs2posts.bot.cs2.create_message') as mocked_factory:
+        await bot.latest(AsyncMock(), AsyncMock())
+
+    mocked_factory.assert_not_called()
+    bot.send_message.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_cs2_bot_load_latest_posts_reads_headers(bot):
+    news = PostHeader.from_post(create_news_post())
+    update = PostHeader.from_post(create_update_post())
+    update = PostHeader(gid="update", title=update.title, date=news.date + 1, type=update.type)
+    bot.post_db.get_latest_posts.return_value = LatestPosts([news, update])
+
+    await bot._load_latest_posts()
+
+    assert bot.latest_news_post == news
+    assert bot.latest_update_post == update
+    assert bot.latest_external_post is None
+    assert bot.latest_post == update
+    bot.post_db.get_post_by_gid.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_cs2_bot_get_message_restores_persisted_render(bot):
+    post = create_update_post()
+    bot.post_db.get_rendered.return_value = {"message": "text", "messages": ["text"]}
+
+    with patch('cs2posts.bot.cs2.create_message') as mocked_factory:
+        msg = await bot.get_message(post)
+        mocked_factory.assert_not_called()
+
+    assert msg.messages == ["text"]
+    assert post in bot.message_cache
+    bot.post_db.save_rendered.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_cs2_bot_get_message_persists_new_render(bot):
+    post = create_update_post()
+    mocked_msg = Mock(VERSION=3)
+    mocked_msg.to_dict.return_value = {"message": "text"}
+
+    with patch('cs2posts.bot.cs2.create_message', return_value=mocked_msg):
+        assert await bot.get_message(post) is mocked_msg
+
+    bot.post_db.save_rendered.assert_awaited_once_with(post.gid, 3, {"message": "text"})
+
+
+@pytest.mark.asyncio
+async def test_cs2_bot_get_message_renders_when_restore_fails(bot):
+    post = create_update_post()
+    bot.post_db.get_rendered.return_value = {"unexpected": "payload"}
+    mocked_msg = Mock()
+
+    with patch('cs2posts.bot.cs2.create_message', return_value=mocked_msg):
+        assert await bot.get_message(post) is mocked_msg
+
+
+@pytest.mark.asyncio
+async def test_cs2_bot_async_init_loads_rendered_messages(bot):
+    post = create_update_post()
+    bot.post_db.get_latest_posts.return_value = LatestPosts([PostHeader.from_post(post)])
+    bot.post_db.get_post_by_gid.return_value = post
+    bot.post_db.get_rendered.return_value = {"message": "text", "messages": ["text"]}
+    bot.post_db.filepath = Mock()
+    bot.chat_db.filepath = Mock()
+    bot.post_db.is_empty = AsyncMock(return_value=False)
+    bot.options.set_chat_db = Mock()
+
+    await bot.async_init()
+
+    assert post in bot.message_cache
+
+
 @pytest.mark.asyncio
 async def test_cs2_bot_news_command(bot):
     mocked_context = AsyncMock()
@@ -424,14 +578,16 @@ async def test_cs2_bot_news_command(bot):
 
     chat = Chat(42)
     bot.chat_db.get.return_value = chat
-    bot.latest_news_post = Mock()
+    post = create_news_post()
+    bot.latest_news_post = PostHeader.from_post(post)
+    bot.post_db.get_post_by_gid.return_value = post
 
     with patch('cs2posts.bot.cs2.create_message') as mocked_factory:
         mocked_msg = Mock()
         mocked_factory.return_value = mocked_msg
         bot.send_message = AsyncMock()
         await bot.news(mocked_update, mocked_context)
-        mocked_factory.assert_called_once_with(bot.latest_news_post)
+        mocked_factory.assert_called_once_with(post, bot.document_cache)
         bot.send_message.assert_called_once_with(
             context=mocked_context, msg=mocked_msg, chat=chat)
 
@@ -443,14 +599,16 @@ async def test_cs2_bot_update_command(bot):
 
     chat = Chat(42)
     bot.chat_db.get.return_value = chat
-    bot.latest_update_post = Mock()
+    post = create_update_post()
+    bot.latest_update_post = PostHeader.from_post(post)
+    bot.post_db.get_post_by_gid.return_value = post
 
     with patch('cs2posts.bot.cs2.create_message') as mocked_factory:
         mocked_msg = Mock()
         mocked_factory.return_value = mocked_msg
         bot.send_message = AsyncMock()
         await bot.update(mocked_update, mocked_context)
-        mocked_factory.assert_called_once_with(bot.latest_update_post)
+        mocked_factory.assert_called_once_with(post, bot.document_cache)
         bot.send_message.assert_called_once_with(
             context=mocked_context, msg=mocked_msg, chat=chat)
 
@@ -458,7 +616,7 @@ async def test_cs2_bot_update_command(bot):
 @pytest.mark.asyncio
 async def test_cs2_bot_post_checker_crawler_exception(bot):
     mocked_context = AsyncMock()
-    bot.crawler.crawl.side_effect = Exception("Exception")
+    bot.crawler.crawl_new = _crawled(error=Exception("Exception"))
 
     bot._post_checker_news = AsyncMock()
     bot._post_checker_update = AsyncMock()
@@ -467,6 +625,119 @@ async def test_cs2_bot_post_checker_crawler_exception(bot):
     bot._post_checker_update.assert_not_awaited()
 
 
+@pytest.mark.asyncio
+async def test_cs2_bot_crawl_job_schedules_next_crawl(bot):
+    mocked_context = Mock()
+    bot.post_checker = AsyncMock()
+    bot.scheduler.next_delay = Mock(return_value=42)
+
+    await bot.crawl_job(mocked_context)
+
+    bot.post_checker.assert_awaited_once_with(mocked_context)
+    mocked_context.job_queue.run_once.assert_called_once_with(callback=bot.crawl_job, when=42)
+
+
+@pytest.mark.asyncio
+async def test_cs2_bot_crawl_job_reschedules_after_failure(bot):
+    mocked_context = Mock()
+    bot.post_checker = AsyncMock(side_effect=RuntimeError("database is locked"))
+
+    with pytest.raises(RuntimeError):
+        await bot.crawl_job(mocked_context)
+
+    mocked_context.job_queue.run_once.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_cs2_bot_crawl_job_retries_after_backoff_while_circuit_open(bot):
+    mocked_context = Mock()
+    bot.post_checker = AsyncMock()
+    bot.scheduler.next_delay = Mock(return_value=900)
+    clock = Mock(return_value=100.0)
+    bot.crawler.breaker = CircuitBreaker(failure_threshold=1, base_delay=10, clock=clock, jitter=lambda: 1.0)
+    bot.crawler.breaker.record_failure()
+
+    await bot.crawl_job(mocked_context)
+
+    mocked_context.job_queue.run_once.assert_called_once_with(callback=bot.crawl_job, when=10)
+
+
+@pytest.mark.asyncio
+async def test_cs2_bot_post_checker_circuit_open(bot, caplog):
+    bot.crawler.crawl_new = _crawled(error=CircuitOpenError('Steam API', 42))
+    bot._post_checker = AsyncMock()
+
+    with caplog.at_level('INFO'):
+        await bot.post_checker(context=AsyncMock())
+
+    bot._post_checker.assert_not_awaited()
+    assert 'retrying in 42s' in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_cs2_bot_post_checker_seeds_after_failed_seed(bot):
+    bot.is_seeded = False
+    bot.post_db.is_empty = AsyncMock(return_value=True)
+    bot.crawler.crawl_new = _crawled(*_crawl_payload_with_one_post_of_each_type()["appnews"]["newsitems"])
+    bot._post_checker = AsyncMock()
+
+    await bot.post_checker(context=AsyncMock())
+
+    assert bot.is_seeded
+    assert bot.post_db.save.await_count == 3
+    bot.post_db.get_latest_posts.assert_awaited()
+    # Nothing is sent for the seeded posts
+    bot._post_checker.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_cs2_bot_post_checker_observes_crawled_posts(bot):
+    newsitems = _crawl_payload_with_one_post_of_each_type()["appnews"]["newsitems"]
+    bot.crawler.crawl_new = _crawled(*newsitems)
+    bot._post_checker = AsyncMock()
+    bot.scheduler.observe = Mock()
+
+    await bot.post_checker(context=AsyncMock())
+
+    assert sorted(c.args for c in bot.scheduler.observe.call_args_list) == sorted(
+        (item["gid"], item["date"]) for item in newsitems)
+
+
+@pytest.mark.asyncio
+async def test_cs2_bot_post_checker_no_new_posts(bot):
+    bot.latest_post = create_news_post()
+    bot.crawler.crawl_new = _crawled()
+    bot._post_checker = AsyncMock()
+
+    await bot.post_checker(context=AsyncMock())
+
+    bot.crawler.crawl_new.assert_called_once_with(bot.latest_post, limit=None)
+    bot._post_checker.assert_not_awaited()
+    bot.post_db.get_latest_posts.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_cs2_bot_post_checker_without_known_post_is_limited(bot):
+    bot.latest_post = None
+    bot.crawler.crawl_new = _crawled()
+
+    await bot.post_checker(context=AsyncMock())
+
+    bot.crawler.crawl_new.assert_called_once_with(None, limit=100)
+
+
+@pytest.mark.asyncio
+async def test_cs2_bot_post_checker_failure_invalidates_crawler(bot):
+    bot.crawler.crawl_new = _crawled(*_crawl_payload_with_one_post_of_each_type()["appnews"]["newsitems"])
+    bot.crawler.invalidate = Mock()
+    bot._post_checker = AsyncMock(side_effect=RuntimeError("database is locked"))
+
+    with pytest.raises(RuntimeError):
+        await bot.post_checker(context=AsyncMock())
+
+    bot.crawler.invalidate.assert_called_once()
+
+
 @pytest.mark.asyncio
 async def test_cs2_bot_post_checker_posts_empty(bot):
     # TODO
@@ -492,84 +763,276 @@ async def test_cs2_bot_post_checker_new_news_and_update_post(bot):
 
 
 @pytest.mark.asyncio
-async def test_cs2_bot_send_news_post_to_chats(bot):
-    mocked_context = AsyncMock()
+@pytest.mark.parametrize("post", [
+    create_news_post(), create_update_post(), create_external_post()])
+async def test_cs2_bot_enqueue_post(bot, post):
+    bot.chat_db.iter_subscriber_ids = _subscriber_pages([13, 42], [99])
+
+    assert await bot.enqueue_post(post)
+
+    bot.chat_db.iter_subscriber_ids.assert_called_once_with(post.get_type())
+    assert bot.delivery_db.enqueue.await_args_list == [
+        call(post.gid, [13, 42]), call(post.gid, [99])]
+
+
+@pytest.mark.asyncio
+async def test_cs2_bot_enqueue_post_without_subscribers(bot):
+    bot.chat_db.iter_subscriber_ids = _subscriber_pages()
+
+    assert await bot.enqueue_post(create_news_post())
+
+    bot.delivery_db.enqueue.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_cs2_bot_enqueue_unknown_post(bot):
     mocked_post = Mock()
-    mocked_post.is_news.return_value = True
-    bot.chat_db.get_running_and_interested_in_news_chats.return_value = [
-        Chat(13)]
+    mocked_post.get_type.return_value = PostType.UNKNOWN
+    bot.chat_db.iter_subscriber_ids = _subscriber_pages([13])
+
+    assert not await bot.enqueue_post(mocked_post)
+
+    bot.chat_db.iter_subscriber_ids.assert_not_called()
+    bot.delivery_db.enqueue.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_cs2_bot_send_post_to_chats_nothing_pending(bot):
+    mocked_post = Mock()
+    bot.delivery_db.get_pending.return_value = []
     bot.send_message = AsyncMock()
 
     with patch('cs2posts.bot.cs2.create_message') as mocked_factory:
-        mocked_msg = Mock()
-        mocked_factory.return_value = mocked_msg
-        await bot.send_post_to_chats(mocked_context, mocked_post)
-        bot.chat_db.get_running_and_interested_in_news_chats.assert_called_once()
-        bot.chat_db.get_running_and_interested_in_updates_chats.assert_not_called()
-        mocked_factory.assert_called_once_with(post=mocked_post)
-        bot.send_message.assert_called_with(
-            context=mocked_context, msg=mocked_msg, chat=Chat(13))
+        await bot.send_post_to_chats(AsyncMock(), mocked_post)
+        mocked_factory.assert_not_called()
+        bot.send_message.assert_not_awaited()
+
+
+def _pending_passes(*passes):
+    passes = iter(passes)
+
+    async def iter_pending(gid, batch_size=None):
+        for delivery in next(passes, []):
+            yield delivery
+    return Mock(side_effect=iter_pending)
 
 
 @pytest.mark.asyncio
-async def test_cs2_bot_send_update_post_to_chats(bot):
+async def test_cs2_bot_send_post_to_chats_streams_pending_deliveries(bot):
     mocked_context = AsyncMock()
     mocked_post = Mock()
-    mocked_post.is_news.return_value = False
-    mocked_post.is_update.return_value = True
-    bot.chat_db.get_running_and_interested_in_updates_chats.return_value = [
-        Chat(13)]
+    mocked_post.gid = "gid"
+    bot.delivery_db.get_pending.return_value = [Delivery("gid", 13)]
+    bot.delivery_db.iter_pending = _pending_passes(
+        [Delivery("gid", 13), Delivery("gid", 42), Delivery("gid", 7)])
+    bot.chat_db.get.side_effect = lambda chat_id: Chat(chat_id, is_running=True)
     bot.send_message = AsyncMock()
 
     with patch('cs2posts.bot.cs2.create_message') as mocked_factory:
         mocked_msg = Mock()
         mocked_factory.return_value = mocked_msg
         await bot.send_post_to_chats(mocked_context, mocked_post)
-        bot.chat_db.get_running_and_interested_in_updates_chats.assert_called_once()
-        bot.chat_db.get_running_and_interested_in_news_chats.assert_not_called()
-        mocked_factory.assert_called_once_with(post=mocked_post)
-        bot.send_message.assert_called_with(
-            context=mocked_context, msg=mocked_msg, chat=Chat(13))
+        mocked_factory.assert_called_once_with(mocked_post, bot.document_cache)
+
+    bot.delivery_db.iter_pending.assert_called_once_with(
+        "gid", batch_size=settings.DELIVERY_BATCH_SIZE)
+    sent_to = sorted(c.kwargs['chat'].chat_id for c in bot.send_message.await_args_list)
+    assert sent_to == [7, 13, 42]
+    assert all(c.kwargs['msg'].msg is mocked_msg for c in bot.send_message.await_args_list)
+    # Every chat is served through the same throttled bot (shared budget).
+    throttled = {id(c.kwargs['bot']) for c in bot.send_message.await_args_list}
+    assert len(throttled) == 1
+    assert bot.send_message.await_args.kwargs['bot'].bot is mocked_context.bot
+    assert bot.delivery_db.set_status.await_count == 3
+    bot.delivery_db.remove_finished.assert_awaited_once_with("gid")
+
+
+def _job_context():
+    context = AsyncMock()
+    context.job_queue = Mock()
+    context.job_queue.get_jobs_by_name.return_value = []
+    return context
 
 
 @pytest.mark.asyncio
-async def test_cs2_bot_send_external_post_to_chats(bot):
-    mocked_context = AsyncMock()
+async def test_cs2_bot_send_post_to_chats_schedules_retry_of_failed_chats(bot):
+    mocked_context = _job_context()
     mocked_post = Mock()
-    mocked_post.is_news.return_value = False
-    mocked_post.is_update.return_value = False
-    mocked_post.is_external.return_value = True
-    bot.chat_db.get_running_and_interested_in_news_chats.return_value = [
-        Chat(13)]
-    bot.chat_db.get_running_and_interested_in_updates_chats.return_value = [
-        Chat(42)]
-    bot.send_message = AsyncMock()
+    mocked_post.gid = "gid"
+    bot.delivery_db.get_pending.return_value = [Delivery("gid", 13)]
+    bot.delivery_db.iter_pending = _pending_passes(
+        [Delivery("gid", 13), Delivery("gid", 42)],
+        [Delivery("gid", 13, attempts=1)],
+    )
+    bot.chat_db.get.side_effect = lambda chat_id: Chat(chat_id, is_running=True)
+    bot.send_message = AsyncMock(side_effect=[RuntimeError('boom'), None, None])
 
-    with patch('cs2posts.bot.cs2.create_message') as mocked_factory:
-        mocked_msg = Mock()
-        mocked_factory.return_value = mocked_msg
+    with patch('cs2posts.bot.cs2.create_message', return_value=Mock()):
         await bot.send_post_to_chats(mocked_context, mocked_post)
-        bot.chat_db.get_running_and_interested_in_updates_chats.assert_not_called()
-        bot.chat_db.get_running_and_interested_in_news_chats.assert_not_called()
-        mocked_factory.assert_called_once_with(post=mocked_post)
-        bot.send_message.assert_not_called()
+
+        # The failed chat is not retried right away but by a job.
+        assert bot.send_message.await_count == 2
+        bot.delivery_db.record_failure.assert_awaited_once()
+        bot.delivery_db.remove_finished.assert_not_awaited()
+        mocked_context.job_queue.run_once.assert_called_once_with(
+            callback=bot.retry_deliveries, when=settings.DELIVERY_RETRY_DELAY,
+            data=("gid", 1), name="deliveries-gid")
+
+        await bot.send_post_to_chats(mocked_context, mocked_post, retry=1)
+
+    assert bot.send_message.await_count == 3
+    assert bot.delivery_db.set_status.await_count == 2
+    bot.delivery_db.remove_finished.assert_awaited_once_with("gid")
 
 
 @pytest.mark.asyncio
-async def test_cs2_bot_send_unknown_post_to_chats(bot):
-    mocked_context = AsyncMock()
+async def test_cs2_bot_send_post_to_chats_backs_off_without_progress(bot):
+    mocked_context = _job_context()
     mocked_post = Mock()
-    mocked_post.is_news.return_value = False
-    mocked_post.is_update.return_value = False
-    mocked_post.is_external.return_value = False
-    bot.send_message = AsyncMock()
+    mocked_post.gid = "gid"
+    bot.delivery_db.get_pending.return_value = [Delivery("gid", 13)]
+    bot.delivery_db.iter_pending = _pending_passes([Delivery("gid", 13)])
+    bot.chat_db.get.side_effect = lambda chat_id: Chat(chat_id, is_running=True)
+    bot.send_message = AsyncMock(side_effect=RuntimeError('boom'))
 
-    with patch('cs2posts.bot.cs2.create_message') as mocked_factory:
+    with patch('cs2posts.bot.cs2.create_message', return_value=Mock()):
+        await bot.send_post_to_chats(mocked_context, mocked_post, retry=2)
+
+    bot.send_message.assert_awaited_once()
+    bot.delivery_db.remove_finished.assert_not_awaited()
+    assert mocked_context.job_queue.run_once.call_args.kwargs['when'] == settings.DELIVERY_RETRY_DELAY * 4
+    assert mocked_context.job_queue.run_once.call_args.kwargs['data'] == ("gid", 3)
+
+
+@pytest.mark.asyncio
+async def test_cs2_bot_send_post_to_chats_honors_flood_control(bot):
+    mocked_context = _job_context()
+    mocked_post = Mock()
+    mocked_post.gid = "gid"
+    bot.delivery_db.get_pending.return_value = [Delivery("gid", 13)]
+    bot.delivery_db.iter_pending = _pending_passes([Delivery("gid", 13)])
+    bot.chat_db.get.side_effect = lambda chat_id: Chat(chat_id, is_running=True)
+    bot.send_message = AsyncMock(side_effect=RetryAfter(42))
+
+    with patch('cs2posts.bot.cs2.create_message', return_value=Mock()):
         await bot.send_post_to_chats(mocked_context, mocked_post)
-        bot.chat_db.get_running_and_interested_in_updates_chats.assert_not_called()
-        bot.chat_db.get_running_and_interested_in_news_chats.assert_not_called()
-        mocked_factory.assert_not_called()
-        bot.send_message.assert_not_awaited()
+
+    bot.delivery_db.record_failure.assert_not_awaited()
+    assert mocked_context.job_queue.run_once.call_args.kwargs['when'] == 42
+
+
+@pytest.mark.asyncio
+async def test_cs2_bot_send_post_to_chats_does_not_schedule_retry_twice(bot):
+    mocked_context = _job_context()
+    mocked_context.job_queue.get_jobs_by_name.return_value = [Mock()]
+    mocked_post = Mock()
+    mocked_post.gid = "gid"
+    bot.delivery_db.get_pending.return_value = [Delivery("gid", 13)]
+    bot.delivery_db.iter_pending = _pending_passes([Delivery("gid", 13)])
+    bot.chat_db.get.side_effect = lambda chat_id: Chat(chat_id, is_running=True)
+    bot.send_message = AsyncMock(side_effect=RuntimeError('boom'))
+
+    with patch('cs2posts.bot.cs2.create_message', return_value=Mock()):
+        await bot.send_post_to_chats(mocked_context, mocked_post)
+
+    mocked_context.job_queue.get_jobs_by_name.assert_called_once_with("deliveries-gid")
+    mocked_context.job_queue.run_once.assert_not_called()
+
+
+def test_cs2_bot_delivery_retry_delay_is_capped():
+    assert CounterStrike2UpdateBot.delivery_retry_delay(0) == settings.DELIVERY_RETRY_DELAY
+    assert CounterStrike2UpdateBot.delivery_retry_delay(1) == settings.DELIVERY_RETRY_DELAY * 2
+    assert CounterStrike2UpdateBot.delivery_retry_delay(100) == settings.DELIVERY_RETRY_MAX_DELAY
+
+
+@pytest.mark.asyncio
+async def test_cs2_bot_retry_deliveries(bot):
+    mocked_context = _job_context()
+    mocked_context.job.data = ("gid", 2)
+    post = Mock()
+    bot.post_db.get_post_by_gid.return_value = post
+    bot.send_post_to_chats = AsyncMock()
+
+    await bot.retry_deliveries(mocked_context)
+
+    bot.post_db.get_post_by_gid.assert_awaited_once_with("gid")
+    bot.send_post_to_chats.assert_awaited_once_with(mocked_context, post=post, retry=2)
+
+
+@pytest.mark.asyncio
+async def test_cs2_bot_retry_deliveries_of_missing_post(bot):
+    mocked_context = _job_context()
+    mocked_context.job.data = ("gid", 1)
+    bot.post_db.get_post_by_gid.return_value = None
+    bot.send_post_to_chats = AsyncMock()
+
+    await bot.retry_deliveries(mocked_context)
+
+    bot.delivery_db.remove.assert_awaited_once_with("gid")
+    bot.send_post_to_chats.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_cs2_bot_deliver_flood_control_is_no_failed_attempt(bot):
+    delivery = Delivery("gid", 13)
+    bot.chat_db.get.return_value = Chat(13, is_running=True)
+    bot.send_message = AsyncMock(side_effect=RetryAfter(5))
+
+    with pytest.raises(RetryAfter):
+        await bot.deliver(AsyncMock(), Mock(), delivery, AsyncMock())
+
+    bot.delivery_db.record_failure.assert_not_awaited()
+    bot.delivery_db.set_status.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_cs2_bot_deliver_skips_stopped_chat(bot):
+    delivery = Delivery("gid", 13)
+    bot.chat_db.get.return_value = Chat(13, is_running=False)
+    bot.send_message = AsyncMock()
+
+    await bot.deliver(AsyncMock(), Mock(), delivery, AsyncMock())
+
+    bot.send_message.assert_not_awaited()
+    bot.delivery_db.set_status.assert_awaited_once_with(delivery, DeliveryStatus.FAILED)
+
+
+@pytest.mark.asyncio
+async def test_cs2_bot_deliver_resumes_at_block_cursor(bot):
+    delivery = Delivery("gid", 13, block=2)
+    bot.chat_db.get.return_value = Chat(13, is_running=True)
+    msg = Mock()
+    msg.send = AsyncMock()
+    throttled = AsyncMock()
+
+    await bot.deliver(AsyncMock(), msg, delivery, throttled)
+
+    msg.send.assert_awaited_once()
+    assert msg.send.await_args.kwargs['start'] == 2
+    assert msg.send.await_args.kwargs['chat_id'] == 13
+    bot.delivery_db.set_status.assert_awaited_once_with(delivery, DeliveryStatus.SENT)
+
+
+@pytest.mark.asyncio
+async def test_cs2_bot_resume_deliveries(bot):
+    post = create_news_post()
+    bot.delivery_db.get_pending_gids.return_value = ["gid", "missing"]
+    bot.post_db.get_post_by_gid.side_effect = lambda gid: post if gid == "gid" else None
+    bot.send_post_to_chats = AsyncMock()
+    mocked_context = AsyncMock()
+
+    await bot.resume_deliveries(mocked_context)
+
+    bot.send_post_to_chats.assert_awaited_once_with(mocked_context, post=post)
+    bot.delivery_db.remove.assert_awaited_once_with("missing")
+
+
+def assert_sent_throttled(send, bot, chat_id):
+    # Sent once with the bot wrapped in the chat's rate limit
+    send.assert_called_once()
+    sent_bot = send.call_args.args[0]
+    assert isinstance(sent_bot, ThrottledBot) and sent_bot.bot is bot
+    assert send.call_args.kwargs == {"chat_id": chat_id}
 
 
 @pytest.mark.asyncio
@@ -590,8 +1053,7 @@ async def test_cs2_bot_send_message(bot):
     chat = Chat(42)
 
     await bot.send_message(mocked_context, mocked_msg, chat)
-    mocked_msg.send.assert_called_once_with(
-        mocked_context.bot, chat_id=chat.chat_id)
+    assert_sent_throttled(mocked_msg.send, mocked_context.bot, chat.chat_id)
     mocked_msg.send.assert_awaited_once()
 
 
@@ -605,8 +1067,7 @@ async def test_cs2_bot_send_message_raises_bad_request_chat_not_found(bot):
     chat = Chat(42)
 
     await bot.send_message(mocked_context, mocked_msg, chat)
-    mocked_msg.send.assert_called_once_with(
-        mocked_context.bot, chat_id=chat.chat_id)
+    assert_sent_throttled(mocked_msg.send, mocked_context.bot, chat.chat_id)
     bot.chat_db.remove.assert_called_once_with(chat)
 
 
@@ -620,8 +1081,7 @@ async def test_cs2_bot_send_message_raises_bad_request(bot):
     chat = Chat(42)
 
     await bot.send_message(mocked_context, mocked_msg, chat)
-    mocked_msg.send.assert_called_once_with(
-        mocked_context.bot, chat_id=chat.chat_id)
+    assert_sent_throttled(mocked_msg.send, mocked_context.bot, chat.chat_id)
     bot.chat_db.remove.assert_not_called()
 
 
@@ -635,8 +1095,7 @@ async def test_cs2_bot_send_message_raises_forbidden(bot):
     chat = Chat(42)
 
     await bot.send_message(mocked_context, mocked_msg, chat)
-    mocked_msg.send.assert_called_once_with(
-        mocked_context.bot, chat_id=chat.chat_id)
+    assert_sent_throttled(mocked_msg.send, mocked_context.bot, chat.chat_id)
     bot.chat_db.remove.assert_called_once_with(chat)
 
 
@@ -656,7 +1115,9 @@ async def test_cs2_bot_send_message_raises_chat_migrated(bot):
 
     bot.chat_db.migrate.assert_awaited_once_with(chat, 1337)
     assert mocked_msg.send.await_count == 2
-    mocked_msg.send.assert_awaited_with(mocked_context.bot, chat_id=migrated_chat.chat_id)
+    sent_bot = mocked_msg.send.await_args.args[0]
+    assert isinstance(sent_bot, ThrottledBot) and sent_bot.bot is mocked_context.bot
+    assert mocked_msg.send.await_args.kwargs == {"chat_id": migrated_chat.chat_id}
 
 
 @pytest.mark.asyncio
@@ -671,8 +1132,7 @@ async def test_cs2_bot_send_message_raises_exception(bot):
     with pytest.raises(Exception, match="Exception"):
         await bot.send_message(mocked_context, mocked_msg, chat)
 
-    mocked_msg.send.assert_called_once_with(
-        mocked_context.bot, chat_id=chat.chat_id)
+    assert_sent_throttled(mocked_msg.send, mocked_context.bot, chat.chat_id)
     bot.chat_db.remove.assert_not_called()
 
 
@@ -711,6 +1171,17 @@ async def test_cs2_bot_backup_chats_db_creates_timestamped_file(tmp_path, bot):
             )
 
 
+@pytest.mark.asyncio
+async def test_cs2_bot_maintain_databases(bot):
+    bot.chat_db.optimize.side_effect = RuntimeError("database is locked")
+
+    await bot.maintain_databases(Mock())
+
+    bot.post_db.optimize.assert_awaited_once()
+    bot.chat_db.optimize.assert_awaited_once()
+    bot.delivery_db.optimize.assert_awaited_once()
+
+
 def test_cs2_bot_run(bot):
     bot.app = Mock()
     bot.run()
@@ -763,7 +1234,23 @@ async def test_cs2_bot_post_checker_newer_news_post(bot):
     await bot._post_checker(mocked_context, new_post)
     bot.send_post_to_chats.assert_called_once_with(mocked_context, post=new_post)
     bot.post_db.save.assert_called_once_with(new_post)
-    assert bot.latest_news_post == new_post
+    assert bot.latest_news_post == PostHeader.from_post(new_post)
+
+
+@pytest.mark.asyncio
+async def test_cs2_bot_post_checker_queues_post_before_saving(bot):
+    bot.latest_news_post = create_news_post()
+    new_post = create_news_post()
+    new_post.date = 1234567999
+
+    calls = Mock()
+    bot.enqueue_post = AsyncMock(side_effect=lambda post: calls.enqueue(post))
+    bot.post_db.save = AsyncMock(side_effect=lambda post: calls.save(post))
+    bot.send_post_to_chats = AsyncMock(side_effect=lambda context, post: calls.send(post))
+
+    await bot._post_checker(AsyncMock(), new_post)
+
+    assert [c[0] for c in calls.mock_calls] == ["enqueue", "save", "send"]
 
 
 @pytest.mark.asyncio
@@ -784,7 +1271,7 @@ async def test_cs2_bot_post_checker_newer_update_post(bot):
     await bot._post_checker(mocked_context, new_post)
     bot.send_post_to_chats.assert_called_once_with(mocked_context, post=new_post)
     bot.post_db.save.assert_called_once_with(new_post)
-    assert bot.latest_update_post == new_post
+    assert bot.latest_update_post == PostHeader.from_post(new_post)
 
 
 @pytest.mark.asyncio
@@ -798,17 +1285,12 @@ async def test_cs2_bot_post_checker_valid_posts(bot):
     bot._post_checker = AsyncMock()
 
     # Mock crawler response
-    bot.crawler.crawl = AsyncMock(return_value={
-        'appnews': {
-            'appid': 730,
-            'newsitems': []
-        }
-    })
+    bot.crawler.crawl_new = _crawled()
 
     with patch('cs2posts.cs2posts.CounterStrike2Posts') as mocked_posts:
         mocked_cs2posts = Mock()
         mocked_cs2posts.is_empty.return_value = True
-        mocked_cs2posts.validate.return_value = None
+        mocked_cs2posts.validate = AsyncMock()
         mocked_posts.create.return_value = mocked_cs2posts
 
         await bot.post_checker(mocked_context)
@@ -854,14 +1336,16 @@ async def test_cs2_bot_external_command(bot):
 
     chat = Chat(42)
     bot.chat_db.get.return_value = chat
-    bot.latest_external_post = Mock()
+    post = create_external_post()
+    bot.latest_external_post = PostHeader.from_post(post)
+    bot.post_db.get_post_by_gid.return_value = post
 
     with patch('cs2posts.bot.cs2.create_message') as mocked_factory:
         mocked_msg = Mock()
         mocked_factory.return_value = mocked_msg
         bot.send_message = AsyncMock()
         await bot.external(mocked_update, mocked_context)
-        mocked_factory.assert_called_once_with(bot.latest_external_post)
+        mocked_factory.assert_called_once_with(post, bot.document_cache)
         bot.send_message.assert_called_once_with(
             context=mocked_context, msg=mocked_msg, chat=chat)
 
@@ -944,19 +1428,35 @@ async def test_cs2_bot_async_init_seeds_when_post_db_empty(bot):
     bot.post_db.filepath.exists.return_value = True
     bot.chat_db.filepath.exists.return_value = True
     bot.post_db.is_empty = AsyncMock(return_value=True)
-    bot.crawler.crawl = AsyncMock(return_value=_crawl_payload_with_one_post_of_each_type())
+    bot.crawler.crawl_new = _crawled(*_crawl_payload_with_one_post_of_each_type()["appnews"]["newsitems"])
     bot.options.set_chat_db = Mock()
 
     await bot.async_init()
 
     bot.post_db.create_table.assert_awaited()
     bot.chat_db.create_table.assert_awaited()
-    bot.crawler.crawl.assert_awaited_once()
+    bot.crawler.crawl_new.assert_called_once_with(page_size=100, limit=100)
     # One save for each seeded post type (news, update, external).
     assert bot.post_db.save.await_count == 3
     bot.options.set_chat_db.assert_called_once_with(bot.chat_db)
 
 
+@pytest.mark.asyncio
+async def test_cs2_bot_async_init_seed_fails(bot):
+    bot.post_db.filepath = Mock()
+    bot.chat_db.filepath = Mock()
+    bot.post_db.filepath.exists.return_value = True
+    bot.chat_db.filepath.exists.return_value = True
+    bot.post_db.is_empty = AsyncMock(return_value=True)
+    bot.crawler.crawl_new = _crawled(error=RuntimeError("Steam API down"))
+    bot.options.set_chat_db = Mock()
+
+    await bot.async_init()
+
+    assert not bot.is_seeded
+    bot.post_db.save.assert_not_awaited()
+
+
 @pytest.mark.asyncio
 async def test_cs2_bot_async_init_skips_seed_when_not_empty(bot):
     bot.post_db.filepath = Mock()
@@ -964,12 +1464,12 @@ async def test_cs2_bot_async_init_skips_seed_when_not_empty(bot):
     bot.post_db.filepath.exists.return_value = True
     bot.chat_db.filepath.exists.return_value = True
     bot.post_db.is_empty = AsyncMock(return_value=False)
-    bot.crawler.crawl = AsyncMock()
+    bot.crawler.crawl_new = _crawled()
     bot.options.set_chat_db = Mock()
 
     await bot.async_init()
 
-    bot.crawler.crawl.assert_not_awaited()
+    bot.crawler.crawl_new.assert_not_called()
     bot.post_db.save.assert_not_awaited()
 
 
@@ -986,6 +1486,7 @@ async def test_cs2_bot_async_init_creates_missing_databases(bot):
 
     bot.post_db.create.assert_awaited_once()
     bot.chat_db.create.assert_awaited_once()
+    bot.delivery_db.create_table.assert_awaited_once()
 
 
 @pytest.mark.asyncio
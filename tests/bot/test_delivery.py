@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from cs2posts.bot.delivery import QueuedMessage
+from cs2posts.dto import Delivery
+from cs2posts.msg import TelegramMessage
+
+
+@pytest.mark.asyncio
+async def test_queued_message_sends_from_block_cursor():
+    msg = TelegramMessage("hello")
+    msg._TelegramMessage__messages = ["chunk1", "chunk2", "chunk3"]
+    delivery = Delivery("gid", 42, block=1)
+    delivery_db = AsyncMock()
+    bot = AsyncMock()
+
+    await QueuedMessage(msg, delivery, delivery_db).send(bot, chat_id=42)
+
+    assert [c.kwargs['text'] for c in bot.send_message.await_args_list] == ["chunk2", "chunk3"]
+    assert [c.args[1] for c in delivery_db.advance.await_args_list] == [2, 3]
+
+
+@pytest.mark.asyncio
+async def test_queued_message_keeps_progress_on_failure():
+    msg = TelegramMessage("hello")
+    msg._TelegramMessage__messages = ["chunk1", "chunk2"]
+    delivery = Delivery("gid", 42)
+    delivery_db = AsyncMock()
+    bot = AsyncMock()
+    bot.send_message.side_effect = [None, RuntimeError("network error")]
+
+    with pytest.raises(RuntimeError):
+        await QueuedMessage(msg, delivery, delivery_db).send(bot, chat_id=42)
+
+    delivery_db.advance.assert_awaited_once_with(delivery, 1)
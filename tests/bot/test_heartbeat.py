@@ -56,7 +56,7 @@ def test_write_heartbeat_swallows_oserror(tmp_path, caplog):
 def heartbeat_settings(tmp_path, monkeypatch):
     filepath = tmp_path / 'beat'
     monkeypatch.setattr(settings, 'HEARTBEAT_FILEPATH', str(filepath))
-    monkeypatch.setattr(settings, 'CS2_UPDATE_CHECK_INTERVAL', 900)
+    monkeypatch.setattr(settings, 'CS2_UPDATE_CHECK_MAX_INTERVAL', 900)
     return filepath
 
 
@@ -87,3 +87,14 @@ def test_healthcheck_fails_when_stale(heartbeat_settings, caplog):
 
     assert healthcheck.main() == 1
     assert 'stale' in caplog.text
+
+
+def test_healthcheck_uses_widened_max_interval(heartbeat_settings, monkeypatch):
+    # The scheduler widens the bounds to a longer configured interval, the
+    # heartbeat is refreshed less often then.
+    monkeypatch.setattr(settings, 'CS2_UPDATE_CHECK_INTERVAL', 3600)
+    write_heartbeat(str(heartbeat_settings))
+    stale = time.time() - 3600
+    os.utime(heartbeat_settings, (stale, stale))
+
+    assert healthcheck.main() == 0
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+
+import pytest
+
+from cs2posts.bot.scheduler import CrawlScheduler
+
+
+NOW = datetime(2025, 10, 1, 12, 0, tzinfo=timezone.utc)
+# Tuesday 01:00 UTC, the usual update window in these tests
+UPDATE_TIME = datetime(2025, 9, 30, 1, 15, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def scheduler():
+    return CrawlScheduler(interval=900, min_interval=30, max_interval=1800)
+
+
+def weekly_dates(when: datetime, weeks: int) -> dict[str, int]:
+    dates = [int((when - timedelta(weeks=i)).timestamp()) for i in range(weeks)]
+    return {str(date): date for date in dates}
+
+
+def test_scheduler_invalid_intervals():
+    with pytest.raises(ValueError):
+        CrawlScheduler(interval=900, min_interval=0, max_interval=1800)
+    with pytest.raises(ValueError):
+        CrawlScheduler(interval=0, min_interval=30, max_interval=1800)
+
+
+@pytest.mark.parametrize("interval, bounds", [
+    (3600, (30, 3600)),
+    (10, (10, 1800)),
+])
+def test_scheduler_widens_bounds_around_interval(interval, bounds):
+    scheduler = CrawlScheduler(interval=interval, min_interval=30, max_interval=1800)
+
+    assert (scheduler.min_interval, scheduler.max_interval) == bounds
+    assert scheduler.intervals == [interval] * CrawlScheduler.SLOTS
+
+
+def test_scheduler_without_history_uses_interval(scheduler):
+    scheduler.learn({}, now=NOW)
+    assert scheduler.intervals == [900] * CrawlScheduler.SLOTS
+    assert scheduler.interval == 900
+
+
+def test_scheduler_slot():
+    assert CrawlScheduler.slot(UPDATE_TIME) == 1 * 24 + 1
+    # Slots are computed in UTC
+    cest = timezone(timedelta(hours=2))
+    assert CrawlScheduler.slot(UPDATE_TIME.astimezone(cest)) == 1 * 24 + 1
+
+
+def test_scheduler_polls_fast_in_hot_window(scheduler):
+    scheduler.learn(weekly_dates(UPDATE_TIME, 20), now=NOW)
+
+    hot = scheduler.interval_at(UPDATE_TIME)
+    cold = scheduler.interval_at(UPDATE_TIME + timedelta(hours=12))
+
+    assert hot == scheduler.min_interval
+    assert cold == scheduler.max_interval
+    # The neighbouring hours are warm as well
+    assert hot < scheduler.interval_at(UPDATE_TIME + timedelta(hours=1)) < cold
+
+
+def test_scheduler_keeps_crawl_budget(scheduler):
+    scheduler.learn({**weekly_dates(UPDATE_TIME, 20), **weekly_dates(UPDATE_TIME + timedelta(days=2, hours=17), 5)}, now=NOW)
+
+    intervals = scheduler.intervals
+    crawls_per_week = sum(3600 / interval for interval in intervals)
+
+    assert all(30 <= interval <= 1800 for interval in intervals)
+    assert crawls_per_week == pytest.approx(7 * 24 * 3600 / 900)
+
+
+def test_scheduler_recent_posts_weigh_more(scheduler):
+    old = UPDATE_TIME - timedelta(weeks=52)
+    recent = UPDATE_TIME + timedelta(days=1)
+    scheduler.learn({**weekly_dates(old, 3), **weekly_dates(recent, 3)}, now=NOW)
+
+    assert scheduler.interval_at(recent) < scheduler.interval_at(old)
+
+
+def test_scheduler_observe(scheduler):
+    scheduler.observe("1", int(UPDATE_TIME.timestamp()))
+    assert scheduler.interval_at(UPDATE_TIME) < 900
+
+
+def test_scheduler_observe_counts_post_once(scheduler):
+    other = UPDATE_TIME + timedelta(hours=12)
+    scheduler.learn({"1": int(UPDATE_TIME.timestamp())}, now=NOW)
+    scheduler.observe("2", int(other.timestamp()))
+    intervals = scheduler.intervals
+
+    # Crawled again, e.g. a post published in the same second as the
+    # latest known one or a crawl that is retried.
+    scheduler.observe("1", int(UPDATE_TIME.timestamp()))
+    scheduler.observe("2", int(other.timestamp()))
+
+    assert scheduler.intervals == intervals
+
+
+def test_scheduler_next_delay_moves_up_before_hot_window(scheduler):
+    scheduler.learn(weekly_dates(UPDATE_TIME, 20), now=NOW)
+    before = UPDATE_TIME.replace(hour=0, minute=0) - timedelta(minutes=10)
+
+    delay = scheduler.next_delay(before)
+
+    # The cold interval would skip past the start of the hot window.
+    assert delay < scheduler.interval_at(before)
+    assert before + timedelta(seconds=delay) < UPDATE_TIME.replace(minute=5)
+
+
+def test_scheduler_next_delay_in_hot_window(scheduler):
+    scheduler.learn(weekly_dates(UPDATE_TIME, 20), now=NOW)
+    assert scheduler.next_delay(UPDATE_TIME) == scheduler.min_interval
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from cs2posts.resolver import UrlResolver
+
+
+# Redirects answered by the mocked resolver, every other URL answers 200
+# unless its path contains "invalid".
+REDIRECTS = {
+    "test.com": "https://www.test.com/news",
+}
+
+
+def resolver_handler(request: httpx.Request) -> httpx.Response:
+    location = REDIRECTS.get(request.url.host)
+    if location is not None:
+        return httpx.Response(301, headers={"Location": location})
+    if "invalid" in request.url.path:
+        return httpx.Response(404)
+    return httpx.Response(200)
+
+
+@pytest.fixture
+def mocked_resolver():
+    """Resolver answering from :func:`resolver_handler`, so resolving and
+    validating URLs never goes to the network."""
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(resolver_handler), follow_redirects=True)
+    resolver = UrlResolver(client)
+    with patch('cs2posts.resolver.get_resolver', return_value=resolver):
+        yield resolver
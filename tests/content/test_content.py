@@ -165,6 +165,57 @@ def test_textblock_empty_text():
         text=""
     )
     assert textblock.text == ""
+    assert textblock.is_empty()
+
+
+def test_textblock_from_span_strips_whitespace():
+    source = "[img][/img]\n  Hello World \n[img][/img]"
+    textblock = TextBlock.from_span(source, 11, 27)
+    assert textblock.text_pos_start == 11
+    assert textblock.text_pos_end == 27
+    assert textblock.is_heading is False
+    assert textblock.text == "Hello World"
+
+
+def test_textblock_from_span_whitespace_only():
+    textblock = TextBlock.from_span("a \n\t b", 1, 5)
+    assert textblock.is_empty()
+    assert textblock.text == ""
+
+
+def test_textblock_from_span_does_not_copy_source():
+    source = "Hello World"
+    textblock = TextBlock.from_span(source, 0, len(source))
+    assert textblock.text is source
+
+
+def test_textblock_prepend_append_extend():
+    source = "<a href='x'>|</a> more"
+    textblock = TextBlock.from_span(source, 0, 12)
+    textblock.prepend("Header\n\n")
+    textblock.append("\nImage Link")
+    textblock.extend(TextBlock.from_span(source, 13, len(source)))
+    assert textblock.text == "Header\n\n<a href='x'>\nImage Link</a> more"
+
+
+def test_textblock_startswith_endswith_contains():
+    textblock = TextBlock.from_span("xx<b>Hello</b>xx", 2, 14)
+    assert textblock.startswith("<b>")
+    assert textblock.endswith("</b>")
+    assert "Hello" in textblock
+    assert "xx" not in textblock
+    textblock.append("!")
+    textblock.prepend("<")
+    assert textblock.startswith("<<b>")
+    assert textblock.endswith("b>!")
+    assert "</b>!" in textblock
+
+
+def test_textblock_set_text():
+    textblock = TextBlock.from_span("Hello World", 0, 5)
+    textblock.text = "Bye"
+    assert textblock.text == "Bye"
+    assert textblock == TextBlock(0, 5, False, "Bye")
 
 
 # Tests for Youtube dataclass
@@ -199,3 +250,21 @@ def test_youtube_get_url_with_different_id():
         url="abc123XYZ"
     )
     assert youtube.get_url() == "https://www.youtube.com/watch?v=abc123XYZ"
+
+
+# Tests for Content serialization
+def test_content_to_dict_and_from_dict_round_trip():
+    image = Image(text_pos_start=0, text_pos_end=5, is_heading=False, url="https://example.com/a.png")
+    contents = [
+        TextBlock(text_pos_start=0, text_pos_end=5, is_heading=True, text="<b>Hello</b>"),
+        image,
+        Carousel(text_pos_start=5, text_pos_end=9, is_heading=False, images=[image, image]),
+        Video(text_pos_start=9, text_pos_end=12, is_heading=False, webm=None,
+              mp4="https://example.com/v.mp4", poster=None, autoplay=True, controls=None),
+        Youtube(text_pos_start=12, text_pos_end=15, is_heading=False, url="dQw4w9WgXcQ"),
+    ]
+
+    for content in contents:
+        data = content.to_dict()
+        assert data["type"] == type(content).__name__
+        assert Content.from_dict(data) == content
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import re
+
 import pytest
 
 from cs2posts.content.content import Content
+from cs2posts.content.extractor import combine_tags
 from cs2posts.content.extractor import Extractor
 
 
@@ -55,3 +58,18 @@ def test_extractor_cannot_instantiate_abstract():
     """Test that the abstract Extractor class cannot be instantiated directly."""
     with pytest.raises(TypeError):
         Extractor("test")
+
+
+def test_combine_tags_names_the_matched_tag():
+    pattern = combine_tags({
+        "bold": re.compile(r"\[b\](.*?)\[/b\]"),
+        "image": re.compile(r"\[img\](.*?)\[/img\]", re.I),
+    })
+    matches = list(pattern.finditer("[b]x[/b] [IMG]y[/IMG] [B]z[/B]"))
+    assert [match.lastgroup for match in matches] == ["bold", "image"]
+    assert matches[1].span() == (9, 21)
+
+
+def test_combine_tags_pattern_without_bracket():
+    with pytest.raises(ValueError):
+        combine_tags({"url": re.compile(r"https?://\S+")})
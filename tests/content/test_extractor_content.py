@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-from unittest.mock import patch
-
 from cs2posts.content.content import Carousel
 from cs2posts.content.content import Image
 from cs2posts.content.content import TextBlock
@@ -13,9 +11,7 @@ from cs2posts.content.extractor_content import ContentExtractor
 def test_content_extractor_extract_empty_string():
     text = ""
     extractor = ContentExtractor(text)
-    with patch("cs2posts.content.extractor_image.resolve_steam_clan_image_url") as mock_resolve:
-        mock_resolve.return_value = ""
-        content = extractor.extract()
+    content = extractor.extract()
     # Should return at least one content item (text block)
     assert len(content) >= 1
 
@@ -38,9 +34,7 @@ def test_content_extractor_first_item_is_heading():
 def test_content_extractor_extract_with_image():
     text = 'text [img src="https://example.com/image.png"][/img]'
     extractor = ContentExtractor(text)
-    with patch("cs2posts.content.extractor_image.resolve_steam_clan_image_url") as mock_resolve:
-        mock_resolve.return_value = "https://example.com/image.png"
-        content = extractor.extract()
+    content = extractor.extract()
     assert len(content) >= 1
     assert any(isinstance(c, Image) for c in content)
 
@@ -64,9 +58,7 @@ def test_content_extractor_extract_with_youtube():
 def test_content_extractor_extract_with_carousel():
     text = 'text [carousel][img src="https://example.com/image.png"][/img][/carousel]'
     extractor = ContentExtractor(text)
-    with patch("cs2posts.content.extractor_image.resolve_steam_clan_image_url") as mock_resolve:
-        mock_resolve.return_value = "https://example.com/image.png"
-        content = extractor.extract()
+    content = extractor.extract()
     assert len(content) >= 1
     assert any(isinstance(c, Carousel) for c in content)
 
@@ -83,9 +75,7 @@ def test_content_extractor_sorted_by_position():
 def test_content_extractor_removes_carousel_images():
     text = '[carousel][img src="https://example.com/image.png"][/img][/carousel] [img src="https://example.com/image.png"][/img]'
     extractor = ContentExtractor(text)
-    with patch("cs2posts.content.extractor_image.resolve_steam_clan_image_url") as mock_resolve:
-        mock_resolve.return_value = "https://example.com/image.png"
-        content = extractor.extract()
+    content = extractor.extract()
     # Images that are in carousel should be removed from standalone images
     standalone_images = [c for c in content if isinstance(c, Image)]
     carousel_items = [c for c in content if isinstance(c, Carousel)]
@@ -98,9 +88,7 @@ def test_content_extractor_removes_carousel_images():
 def test_content_extractor_extract_mixed_content():
     text = 'header text [img src="https://example.com/image.png"][/img] middle [previewyoutube=abc;full][/previewyoutube] end'
     extractor = ContentExtractor(text)
-    with patch("cs2posts.content.extractor_image.resolve_steam_clan_image_url") as mock_resolve:
-        mock_resolve.return_value = "https://example.com/image.png"
-        content = extractor.extract()
+    content = extractor.extract()
     assert len(content) >= 3  # At least text, image, and youtube
 
 
@@ -110,9 +98,7 @@ def test_content_extractor_extract_all_types():
     [carousel][img src="https://example.com/carousel.png"][/img][/carousel]
     [previewyoutube=vid123;full][/previewyoutube] end'''
     extractor = ContentExtractor(text)
-    with patch("cs2posts.content.extractor_image.resolve_steam_clan_image_url") as mock_resolve:
-        mock_resolve.side_effect = lambda x: x
-        content = extractor.extract()
+    content = extractor.extract()
 
     types_found = {type(c) for c in content}
     # Should have at least TextBlock and some media types
@@ -124,9 +110,7 @@ def test_content_extractor_carousel_removes_duplicate_images():
     carousel_img_url = "https://example.com/same_image.png"
     text = f'[carousel][img src="{carousel_img_url}"][/img][/carousel] [img src="{carousel_img_url}"][/img]'
     extractor = ContentExtractor(text)
-    with patch("cs2posts.content.extractor_image.resolve_steam_clan_image_url") as mock_resolve:
-        mock_resolve.return_value = carousel_img_url
-        content = extractor.extract()
+    content = extractor.extract()
 
     standalone_images = [c for c in content if isinstance(c, Image)]
     # The standalone image should be filtered out since it's in the carousel
@@ -136,9 +120,47 @@ def test_content_extractor_carousel_removes_duplicate_images():
 def test_content_extractor_no_carousel_keeps_images():
     text = '[img src="https://example.com/image1.png"][/img] [img src="https://example.com/image2.png"][/img]'
     extractor = ContentExtractor(text)
-    with patch("cs2posts.content.extractor_image.resolve_steam_clan_image_url") as mock_resolve:
-        mock_resolve.side_effect = ["https://example.com/image1.png", "https://example.com/image2.png"]
-        content = extractor.extract()
+    content = extractor.extract()
 
     images = [c for c in content if isinstance(c, Image)]
     assert len(images) == 2
+
+
+def test_content_extractor_text_between_content():
+    text = 'before [img]https://example.com/a.png[/img] after'
+    content = ContentExtractor(text).extract()
+    assert [type(c) for c in content] == [TextBlock, Image, TextBlock]
+    assert [c.text for c in content if isinstance(c, TextBlock)] == ["before", "after"]
+
+
+def test_content_extractor_combines_clickable_image_link():
+    text = '<a href="https://example.com">[img src="https://example.com/a.png"][/img]</a> after'
+    content = ContentExtractor(text).extract()
+    texts = [c for c in content if isinstance(c, TextBlock)]
+    assert len(texts) == 1
+    assert texts[0].text == '<a href="https://example.com">\nImage Link</a> after'
+
+
+def test_content_extractor_no_stray_carousel_tags():
+    inner = "[img]https://example.com/1.png[/img][img]https://example.com/2.png[/img]"
+    text = f"intro [carousel]{inner}[/carousel] middle [carousel]{inner}[/carousel] end"
+    content = ContentExtractor(text).extract()
+    texts = [c.text for c in content if isinstance(c, TextBlock)]
+    assert texts == ["intro", "middle", "end"]
+    assert len([c for c in content if isinstance(c, Carousel)]) == 2
+
+
+def test_content_extractor_tokenize_in_text_order():
+    text = ('[img]https://example.com/a.png[/img] [previewyoutube=abc;full][/previewyoutube]'
+            ' [img src="https://example.com/b.png"][/img]')
+    tokens = list(ContentExtractor(text).tokenize())
+    assert [type(token) for token in tokens] == [Image, Youtube, Image]
+    assert [token.text_pos_start for token in tokens] == [0, 37, 80]
+
+
+def test_content_extractor_tokenize_carousel_images_not_standalone():
+    text = '[carousel][img src="https://example.com/a.png"][/img][/carousel]'
+    tokens = list(ContentExtractor(text).tokenize())
+    assert len(tokens) == 1
+    assert isinstance(tokens[0], Carousel)
+    assert [img.url for img in tokens[0].images] == ["https://example.com/a.png"]
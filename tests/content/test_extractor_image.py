@@ -122,9 +122,7 @@ def image_extractor():
 def test_image_extractor_extract_single_image():
     text = '[img src="https://example.com/image.png"][/img]'
     extractor = ImageExtractor(text)
-    with patch("cs2posts.content.extractor_image.resolve_steam_clan_image_url") as mock_resolve:
-        mock_resolve.return_value = "https://example.com/image.png"
-        images = extractor.extract()
+    images = extractor.extract()
     assert len(images) == 1
     assert isinstance(images[0], Image)
     assert images[0].url == "https://example.com/image.png"
@@ -133,9 +131,7 @@ def test_image_extractor_extract_single_image():
 def test_image_extractor_extract_multiple_images():
     text = '[img src="https://example.com/image1.png"][/img] [img src="https://example.com/image2.png"][/img]'
     extractor = ImageExtractor(text)
-    with patch("cs2posts.content.extractor_image.resolve_steam_clan_image_url") as mock_resolve:
-        mock_resolve.side_effect = ["https://example.com/image1.png", "https://example.com/image2.png"]
-        images = extractor.extract()
+    images = extractor.extract()
     assert len(images) == 2
     assert images[0].url == "https://example.com/image1.png"
     assert images[1].url == "https://example.com/image2.png"
@@ -158,9 +154,7 @@ def test_image_extractor_extract_empty_string():
 def test_image_extractor_extract_deprecated_format():
     text = "[img]https://example.com/image.png[/img]"
     extractor = ImageExtractor(text)
-    with patch("cs2posts.content.extractor_image.resolve_steam_clan_image_url") as mock_resolve:
-        mock_resolve.return_value = "https://example.com/image.png"
-        images = extractor.extract()
+    images = extractor.extract()
     assert len(images) == 1
     assert images[0].url == "https://example.com/image.png"
 
@@ -168,36 +162,28 @@ def test_image_extractor_extract_deprecated_format():
 def test_image_extractor_extract_mixed_formats():
     text = '[img src="https://example.com/image1.png"][/img] [img]https://example.com/image2.png[/img]'
     extractor = ImageExtractor(text)
-    with patch("cs2posts.content.extractor_image.resolve_steam_clan_image_url") as mock_resolve:
-        mock_resolve.side_effect = ["https://example.com/image1.png", "https://example.com/image2.png"]
-        images = extractor.extract()
+    images = extractor.extract()
     assert len(images) == 2
 
 
 def test_image_extractor_extract_with_html_encoded_quot():
     text = '[img src="https://example.com/image.png&quot;"][/img]'
     extractor = ImageExtractor(text)
-    with patch("cs2posts.content.extractor_image.resolve_steam_clan_image_url") as mock_resolve:
-        mock_resolve.return_value = "https://example.com/image.png"
-        images = extractor.extract()
+    images = extractor.extract()
     assert len(images) == 1
 
 
 def test_image_extractor_extract_skips_empty_url():
-    text = '[img src="https://example.com/image.png"][/img]'
+    text = '[img src=""][/img] [img src="&quot;&quot;"][/img]'
     extractor = ImageExtractor(text)
-    with patch("cs2posts.content.extractor_image.resolve_steam_clan_image_url") as mock_resolve:
-        mock_resolve.return_value = ""
-        images = extractor.extract()
+    images = extractor.extract()
     assert len(images) == 0
 
 
 def test_image_extractor_extract_image_positions():
     text = '[img src="https://example.com/image.png"][/img]'
     extractor = ImageExtractor(text)
-    with patch("cs2posts.content.extractor_image.resolve_steam_clan_image_url") as mock_resolve:
-        mock_resolve.return_value = "https://example.com/image.png"
-        images = extractor.extract()
+    images = extractor.extract()
     assert images[0].text_pos_start == 0
     assert images[0].text_pos_end == len(text)
 
@@ -205,17 +191,16 @@ def test_image_extractor_extract_image_positions():
 def test_image_extractor_extract_is_heading_false():
     text = '[img src="https://example.com/image.png"][/img]'
     extractor = ImageExtractor(text)
-    with patch("cs2posts.content.extractor_image.resolve_steam_clan_image_url") as mock_resolve:
-        mock_resolve.return_value = "https://example.com/image.png"
-        images = extractor.extract()
+    images = extractor.extract()
     assert images[0].is_heading is False
 
 
-def test_image_extractor_extract_steam_clan_image():
+def test_image_extractor_extract_steam_clan_image_keeps_placeholder():
+    # Placeholders are resolved after extraction, see cs2posts.resolver.
     text = '[img src="{STEAM_CLAN_IMAGE}/foo/bar.png"][/img]'
     extractor = ImageExtractor(text)
-    with patch("cs2posts.content.extractor_image.resolve_steam_clan_image_url") as mock_resolve:
-        mock_resolve.return_value = "https://clan.akamai.steamstatic.com/images/foo/bar.png"
+    with patch("cs2posts.resolver.UrlResolver.probe") as mock_probe:
         images = extractor.extract()
+    mock_probe.assert_not_called()
     assert len(images) == 1
-    assert images[0].url == "https://clan.akamai.steamstatic.com/images/foo/bar.png"
+    assert images[0].url == "{STEAM_CLAN_IMAGE}/foo/bar.png"
@@ -8,6 +8,7 @@ import pytest_asyncio
 
 from cs2posts.db import ChatDatabase
 from cs2posts.dto import Chat
+from cs2posts.dto.post import PostType
 
 
 @pytest.fixture
@@ -27,6 +28,7 @@ async def chats_empty_database(tmp_path):
     db = ChatDatabase(filepath)
     await db.create_table()
     yield db
+    await db.close()
 
 
 @pytest_asyncio.fixture
@@ -159,35 +161,6 @@ async def test_chats_database_interested_in_external_news(chats_database):
     assert len(await chats_database.get_interested_in_external_news_chats()) == 1
 
 
-@pytest.mark.asyncio
-async def test_chats_database_get_running_and_interested_in_news_chats(chats_database):
-    assert len(await chats_database.get_running_and_interested_in_news_chats()) == 0
-    chat = await chats_database.get(1337)
-    chat.is_running = True
-    await chats_database.update(chat)
-    assert len(await chats_database.get_running_and_interested_in_news_chats()) == 1
-
-
-@pytest.mark.asyncio
-async def test_chats_database_get_running_and_interested_in_updates_chats(chats_database):
-    assert len(await chats_database.get_running_and_interested_in_updates_chats()) == 0
-    chat = await chats_database.get(1337)
-    chat.is_running = True
-    chat.is_update_interested = True
-    await chats_database.update(chat)
-    assert len(await chats_database.get_running_and_interested_in_updates_chats()) == 1
-
-
-@pytest.mark.asyncio
-async def test_chats_database_get_running_and_interested_in_external_news_chats(chats_database):
-    assert len(await chats_database.get_running_and_interested_in_external_news_chats()) == 0
-    chat = await chats_database.get(1337)
-    chat.is_running = True
-    chat.is_external_news_interested = True
-    await chats_database.update(chat)
-    assert len(await chats_database.get_running_and_interested_in_external_news_chats()) == 1
-
-
 @pytest.mark.asyncio
 async def test_chats_database_contains(chats_database):
     assert await chats_database.contains(Chat(1337))
@@ -217,3 +190,39 @@ async def test_chats_database_import_from_json_legacy_format(
 
     chats = await chats_empty_database.load()
     assert {chat.chat_id for chat in chats} == {1337, 42}
+
+
+@pytest.mark.asyncio
+async def test_chats_database_iter_subscriber_ids(chats_empty_database):
+    for chat_id in (-1001, 5, 3, 42, 7):
+        await chats_empty_database.save(Chat(chat_id, is_running=True))
+    await chats_empty_database.save(Chat(8, is_running=False))
+    await chats_empty_database.save(Chat(9, is_running=True, is_news_interested=False))
+
+    pages = [page async for page in chats_empty_database.iter_subscriber_ids(PostType.NEWS, page_size=2)]
+
+    assert pages == [[-1001, 3], [5, 7], [42]]
+    pages = [page async for page in chats_empty_database.iter_subscriber_ids(PostType.UPDATE)]
+    assert pages == [[-1001, 3, 5, 7, 9, 42]]
+
+
+@pytest.mark.asyncio
+async def test_chats_database_iter_subscriber_ids_empty(chats_empty_database):
+    pages = [page async for page in chats_empty_database.iter_subscriber_ids(PostType.EXTERNAL)]
+    assert pages == []
+
+
+@pytest.mark.asyncio
+async def test_chats_database_iter_subscriber_ids_unknown_type(chats_empty_database):
+    with pytest.raises(ValueError):
+        await anext(chats_empty_database.iter_subscriber_ids(PostType.UNKNOWN))
+
+
+@pytest.mark.asyncio
+async def test_chats_database_subscriber_query_uses_partial_index(chats_empty_database):
+    for post_type in (PostType.NEWS, PostType.UPDATE, PostType.EXTERNAL):
+        condition = chats_empty_database._subscriber_condition(post_type)
+        plan = await chats_empty_database._fetch_all(
+            f"EXPLAIN QUERY PLAN SELECT chat_id FROM chats WHERE ({condition})"
+            " AND chat_id > ? ORDER BY chat_id LIMIT ?", (0, 10))
+        assert f"idx_chats_{post_type}_subscribers" in plan[0]["detail"]
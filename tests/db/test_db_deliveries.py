@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import pytest
+import pytest_asyncio
+
+from cs2posts.db import DeliveryDatabase
+from cs2posts.dto import Delivery
+from cs2posts.dto import DeliveryStatus
+
+
+@pytest_asyncio.fixture
+async def deliveries_database(tmp_path):
+    db = DeliveryDatabase(tmp_path / "test_deliveries.db")
+    await db.create_table()
+    yield db
+    await db.close()
+
+
+@pytest.mark.asyncio
+async def test_delivery_database_is_empty(deliveries_database):
+    assert await deliveries_database.is_empty()
+    assert await deliveries_database.count_pending() == 0
+
+
+@pytest.mark.asyncio
+async def test_delivery_database_enqueue(deliveries_database):
+    await deliveries_database.enqueue("gid", [1, 2, 3])
+
+    assert await deliveries_database.count_pending() == 3
+    assert await deliveries_database.get("gid", 2) == Delivery("gid", 2)
+
+
+@pytest.mark.asyncio
+async def test_delivery_database_enqueue_is_idempotent(deliveries_database):
+    await deliveries_database.enqueue("gid", [1, 2])
+    delivery = await deliveries_database.get("gid", 1)
+    await deliveries_database.advance(delivery, 3)
+
+    # Enqueueing the same post again must keep the progress of queued chats.
+    await deliveries_database.enqueue("gid", [1, 2, 3])
+
+    assert await deliveries_database.count_pending() == 3
+    assert (await deliveries_database.get("gid", 1)).block == 3
+
+
+@pytest.mark.asyncio
+async def test_delivery_database_get_pending_in_batches(deliveries_database):
+    await deliveries_database.enqueue("gid", [3, 1, 2])
+    await deliveries_database.enqueue("other", [4])
+
+    batch = await deliveries_database.get_pending("gid", limit=2)
+
+    assert [d.chat_id for d in batch] == [1, 2]
+    assert sorted(await deliveries_database.get_pending_gids()) == ["gid", "other"]
+
+
+@pytest.mark.asyncio
+async def test_delivery_database_set_status(deliveries_database):
+    await deliveries_database.enqueue("gid", [1, 2])
+    delivery = await deliveries_database.get("gid", 1)
+
+    await deliveries_database.set_status(delivery, DeliveryStatus.SENT)
+
+    assert delivery.status == DeliveryStatus.SENT
+    assert (await deliveries_database.get("gid", 1)).status == DeliveryStatus.SENT
+    assert [d.chat_id for d in await deliveries_database.get_pending("gid", limit=10)] == [2]
+
+
+@pytest.mark.asyncio
+async def test_delivery_database_record_failure(deliveries_database):
+    await deliveries_database.enqueue("gid", [1])
+    delivery = await deliveries_database.get("gid", 1)
+
+    await deliveries_database.record_failure(delivery, max_attempts=2)
+    stored = await deliveries_database.get("gid", 1)
+    assert stored.attempts == 1
+    assert stored.status == DeliveryStatus.PENDING
+
+    await deliveries_database.record_failure(delivery, max_attempts=2)
+    stored = await deliveries_database.get("gid", 1)
+    assert stored.attempts == 2
+    assert stored.status == DeliveryStatus.FAILED
+
+
+@pytest.mark.asyncio
+async def test_delivery_database_remove_finished(deliveries_database):
+    await deliveries_database.enqueue("gid", [1, 2])
+    await deliveries_database.set_status(
+        await deliveries_database.get("gid", 1), DeliveryStatus.SENT)
+
+    await deliveries_database.remove_finished("gid")
+
+    assert await deliveries_database.get("gid", 1) is None
+    assert await deliveries_database.get("gid", 2) is not None
+
+
+@pytest.mark.asyncio
+async def test_delivery_database_remove(deliveries_database):
+    await deliveries_database.enqueue("gid", [1, 2])
+    await deliveries_database.remove("gid")
+    assert await deliveries_database.is_empty()
+
+
+@pytest.mark.asyncio
+async def test_delivery_database_iter_pending_allows_writes(deliveries_database):
+    await deliveries_database.enqueue("gid", range(10))
+
+    streamed = []
+    async for delivery in deliveries_database.iter_pending("gid", batch_size=3):
+        # Updating the streamed rows must neither skip nor repeat any of them.
+        await deliveries_database.set_status(delivery, DeliveryStatus.SENT)
+        streamed.append(delivery.chat_id)
+
+    assert streamed == list(range(10))
+    assert await deliveries_database.count_pending() == 0
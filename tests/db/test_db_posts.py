@@ -7,6 +7,8 @@ import pytest_asyncio
 
 from cs2posts.db import PostDatabase
 from cs2posts.dto import Post
+from cs2posts.dto import PostHeader
+from cs2posts.dto.post import PostType
 
 
 @pytest.fixture
@@ -65,6 +67,7 @@ async def post_empty_database(tmp_path):
     db = PostDatabase(filepath)
     await db.create_table()
     yield db
+    await db.close()
 
 
 @pytest_asyncio.fixture
@@ -153,6 +156,48 @@ async def test_post_database_get_latest_update_post(post_database, data_latest):
     assert actual_post == expected_post
 
 
+@pytest.mark.asyncio
+async def test_post_database_latest_of_type_uses_index(post_database):
+    rows = await post_database._fetch_all(
+        "EXPLAIN QUERY PLAN SELECT gid FROM posts WHERE type = ? ORDER BY date DESC LIMIT 1",
+        ("news",))
+    plan = " ".join(row["detail"] for row in rows)
+    assert "idx_posts_type_date" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.asyncio
+async def test_post_database_get_latest_posts(post_database, data_latest):
+    latest = await post_database.get_latest_posts()
+
+    assert len(latest) == 3
+    for post_type in (PostType.NEWS, PostType.UPDATE, PostType.EXTERNAL):
+        assert latest.get(post_type) == PostHeader.from_post(Post(**data_latest[str(post_type)]))
+    assert latest.latest == PostHeader.from_post(await post_database.get_latest_post())
+
+
+@pytest.mark.asyncio
+async def test_post_database_get_latest_posts_empty_db(post_empty_database):
+    latest = await post_empty_database.get_latest_posts()
+    assert len(latest) == 0
+    assert latest.latest is None
+
+
+@pytest.mark.asyncio
+async def test_post_database_latest_posts_follow_save(post_database, data_latest):
+    latest = await post_database.get_latest_posts()
+
+    newer = Post(**{**data_latest["news"], "gid": "1", "date": 1800000000})
+    older = Post(**{**data_latest["update"], "gid": "2", "date": 1000000000})
+    await post_database.save(newer)
+    await post_database.save(older)
+
+    assert await post_database.get_latest_posts() is latest
+    assert latest.get(PostType.NEWS) == PostHeader.from_post(newer)
+    assert latest.get(PostType.UPDATE).gid == data_latest["update"]["gid"]
+    assert latest.latest == PostHeader.from_post(newer)
+
+
 @pytest.mark.asyncio
 async def test_post_database_load(post_database, data_latest):
     actual_posts = await post_database.load()
@@ -178,6 +223,17 @@ async def test_post_database_get_post_by_gid_missing(post_empty_database):
     assert await post_empty_database.get_post_by_gid("does-not-exist") is None
 
 
+@pytest.mark.asyncio
+async def test_post_database_get_dates(post_database, data_latest):
+    dates = await post_database.get_dates()
+    assert dates == {post["gid"]: post["date"] for post in data_latest.values()}
+
+
+@pytest.mark.asyncio
+async def test_post_database_get_dates_empty(post_empty_database):
+    assert await post_empty_database.get_dates() == {}
+
+
 @pytest.mark.asyncio
 async def test_post_database_import_from_json_legacy_format(
         post_empty_database, data_latest, tmp_path):
@@ -193,3 +249,17 @@ async def test_post_database_import_from_json_legacy_format(
         data_latest["news"]["gid"],
         data_latest["external"]["gid"],
     }
+
+
+@pytest.mark.asyncio
+async def test_post_database_rendered_messages(post_empty_database):
+    assert await post_empty_database.get_rendered("gid", 1) is None
+
+    await post_empty_database.save_rendered("gid", 1, {"message": "hello", "messages": ["hello"]})
+    assert await post_empty_database.get_rendered("gid", 1) == {"message": "hello", "messages": ["hello"]}
+
+    # Renders of another renderer version are ignored.
+    assert await post_empty_database.get_rendered("gid", 2) is None
+    await post_empty_database.save_rendered("gid", 2, {"message": "new", "messages": ["new"]})
+    assert await post_empty_database.get_rendered("gid", 2) == {"message": "new", "messages": ["new"]}
+    assert await post_empty_database.get_rendered("gid", 1) is None
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import pytest
+
+from cs2posts.db import ChatDatabase
+from cs2posts.db import DeliveryDatabase
+from cs2posts.db import PostDatabase
+from cs2posts.db import PragmaProfile
+from cs2posts.db import SQLite
+
+
+def test_pragma_profile_defaults():
+    profile = PragmaProfile()
+    assert profile.is_wal
+    assert "PRAGMA journal_mode = WAL;" in profile.to_sql()
+    assert "PRAGMA synchronous = NORMAL;" in profile.to_sql()
+    assert "PRAGMA temp_store = MEMORY;" in profile.to_sql()
+
+
+def test_pragma_profile_normalizes_case():
+    profile = PragmaProfile(journal_mode='delete', synchronous='full', temp_store='file')
+    assert not profile.is_wal
+    assert profile.journal_mode == 'DELETE'
+    assert profile.synchronous == 'FULL'
+    assert profile.temp_store == 'FILE'
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"journal_mode": "WAL; DROP TABLE chats"},
+    {"synchronous": "SOMETIMES"},
+    {"temp_store": "DISK"},
+])
+def test_pragma_profile_rejects_invalid_values(kwargs):
+    with pytest.raises(ValueError):
+        PragmaProfile(**kwargs)
+
+
+async def _pragma(db: SQLite, name: str):
+    return await db._scalar(f"PRAGMA {name}")
+
+
+@pytest.mark.asyncio
+async def test_sqlite_applies_pragma_profile_on_connect(tmp_path):
+    db = SQLite(tmp_path / 'test.db', PragmaProfile(cache_size=-2048, busy_timeout_ms=1234))
+
+    assert await _pragma(db, 'journal_mode') == 'wal'
+    assert await _pragma(db, 'synchronous') == 1
+    assert await _pragma(db, 'temp_store') == 2
+    assert await _pragma(db, 'cache_size') == -2048
+    assert await _pragma(db, 'busy_timeout') == 1234
+    await db.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_optimize_checkpoints_wal(tmp_path):
+    db = SQLite(tmp_path / 'test.db')
+    await db._execute("CREATE TABLE t (x INTEGER)")
+    await db._execute_many("INSERT INTO t VALUES (?)", [(i,) for i in range(100)])
+
+    await db.optimize()
+
+    assert (tmp_path / 'test.db-wal').stat().st_size == 0
+    assert await db._scalar("SELECT COUNT(*) FROM t") == 100
+    await db.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_optimize_without_wal(tmp_path):
+    db = SQLite(tmp_path / 'test.db', PragmaProfile(journal_mode='DELETE'))
+    await db._execute("CREATE TABLE t (x INTEGER)")
+
+    await db.optimize()
+
+    assert await _pragma(db, 'journal_mode') == 'delete'
+    await db.close()
+
+
+@pytest.mark.parametrize("db_class", [ChatDatabase, PostDatabase, DeliveryDatabase])
+def test_databases_accept_pragma_profile(tmp_path, db_class):
+    profile = PragmaProfile(synchronous='FULL')
+    assert db_class(tmp_path / 'test.db', profile).pragmas is profile
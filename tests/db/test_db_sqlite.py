@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from pathlib import Path
 from unittest.mock import AsyncMock
 from unittest.mock import Mock
@@ -7,6 +8,7 @@ from unittest.mock import patch
 
 import pytest
 
+from cs2posts.db import PragmaProfile
 from cs2posts.db import SQLite
 
 
@@ -22,18 +24,16 @@ async def test_sqlite_class_create_db_exists(sqlite_mock):
 
 
 @pytest.mark.asyncio
-@patch('aiosqlite.connect')
+@patch('aiosqlite.connect', new_callable=AsyncMock)
 async def test_sqlite_class_create_db_exists_overwrite(sqlite_mock):
     mocked_path = Mock()
     mocked_path.exists.side_effect = [True, False]
     db = SQLite(mocked_path)
 
-    sqlite_mock.__aenter__.return_value.execute = AsyncMock()
-    sqlite_mock.__aexit__ = AsyncMock()
-
     await db.create(overwrite=True)
     mocked_path.unlink.assert_called_once()
-    sqlite_mock.assert_called_once_with(mocked_path)
+    sqlite_mock.assert_awaited_once_with(
+        mocked_path, cached_statements=SQLite.CACHED_STATEMENTS)
 
 
 @pytest.mark.asyncio
@@ -41,3 +41,69 @@ async def test_sqlite_class_backup(tmp_path):
     db = SQLite(tmp_path / 'test.db')
     await db.backup(tmp_path / 'test_backup.db')
     assert Path(tmp_path / 'test_backup.db').exists()
+    await db.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_class_reuses_connection(tmp_path):
+    db = SQLite(tmp_path / 'test.db')
+    await db._execute("CREATE TABLE t (x INTEGER)")
+
+    with patch('aiosqlite.connect') as sqlite_mock:
+        await db._execute("INSERT INTO t VALUES (?)", (1,))
+        assert await db._scalar("SELECT COUNT(*) FROM t") == 1
+        sqlite_mock.assert_not_called()
+
+    assert db.is_connected
+    await db.close()
+    assert not db.is_connected
+
+
+@pytest.mark.asyncio
+async def test_sqlite_class_concurrent_writes(tmp_path):
+    db = SQLite(tmp_path / 'test.db')
+    await db._execute("CREATE TABLE t (x INTEGER)")
+
+    await asyncio.gather(*(db._execute("INSERT INTO t VALUES (?)", (i,)) for i in range(50)))
+
+    assert await db._scalar("SELECT COUNT(*) FROM t") == 50
+    await db.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_class_reconnects_after_close(tmp_path):
+    db = SQLite(tmp_path / 'test.db')
+    await db._execute("CREATE TABLE t (x INTEGER)")
+    await db.close()
+
+    assert await db.is_empty('t')
+    await db.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("journal_mode", ["WAL", "DELETE"])
+async def test_sqlite_class_iter_rows_in_batches(tmp_path, journal_mode):
+    db = SQLite(tmp_path / 'test.db', PragmaProfile(journal_mode=journal_mode))
+    await db._execute("CREATE TABLE t (x INTEGER)")
+    await db._execute_many("INSERT INTO t VALUES (?)", [(i,) for i in range(5)])
+
+    batches = [[row['x'] for row in rows]
+               async for rows in db._iter_rows("SELECT x FROM t", "x", batch_size=2)]
+
+    assert batches == [[0, 1], [2, 3], [4]]
+    await db.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_class_iter_rows_does_not_block_checkpoint(tmp_path):
+    db = SQLite(tmp_path / 'test.db', PragmaProfile(journal_mode="WAL"))
+    await db._execute("CREATE TABLE t (x INTEGER)")
+    await db._execute_many("INSERT INTO t VALUES (?)", [(i,) for i in range(5)])
+
+    async for rows in db._iter_rows("SELECT x FROM t", "x", "x != ?", (3,), batch_size=2):
+        await db._execute("DELETE FROM t WHERE x = ?", (rows[0]['x'],))
+        busy, _, _ = await db._fetch_one("PRAGMA wal_checkpoint(TRUNCATE)")
+        assert busy == 0
+
+    assert [row['x'] for row in await db._fetch_all("SELECT x FROM t ORDER BY x")] == [1, 3, 4]
+    await db.close()
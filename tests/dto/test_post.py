@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+from unittest.mock import patch
+
 import pytest
 
 from cs2posts.dto.post import FeedType
+from cs2posts.dto.post import LatestPosts
 from cs2posts.dto.post import Post
+from cs2posts.dto.post import PostHeader
+from cs2posts.dto.post import PostType
 
 
 @pytest.fixture
@@ -131,3 +136,107 @@ def test_post_is_newer_than(post_fixture, post_fixture2):
 def test_post_is_older_eq_than(post_fixture, post_fixture2):
     assert not post_fixture.is_older_eq_than(None)
     assert post_fixture.is_older_eq_than(post_fixture2)
+
+
+def test_post_get_item_unknown_key(post_fixture):
+    with pytest.raises(KeyError):
+        post_fixture["_type"]
+    with pytest.raises(KeyError):
+        post_fixture["body"]
+
+
+def test_post_is_slotted(post_fixture):
+    assert not hasattr(post_fixture, "__dict__")
+    with pytest.raises(AttributeError):
+        post_fixture.body = "body"
+
+
+def test_post_to_dict_copies_tags(post_fixture):
+    data = post_fixture.to_dict()
+    data["tags"].append("other")
+    assert post_fixture.tags == ["patchnotes"]
+    assert "_type" not in data
+
+
+def test_post_equals_ignores_cached_type(post_fixture):
+    other = Post.from_dict(post_fixture.to_dict())
+    post_fixture.get_type()
+    assert post_fixture == other
+
+
+def test_post_get_type_is_cached(post_fixture2):
+    post_fixture2.get_type()
+    with patch.object(Post, "_Post__classify") as mocked_classify:
+        assert post_fixture2.get_type() == PostType.NEWS
+    mocked_classify.assert_not_called()
+
+
+def test_post_get_type_reset_on_assignment(post_fixture2):
+    assert post_fixture2.get_type() == PostType.NEWS
+    post_fixture2.feed_type = 0
+    assert post_fixture2.get_type() == PostType.EXTERNAL
+    post_fixture2.title = "Release Notes for 1/1/2024"
+    assert post_fixture2.get_type() == PostType.UPDATE
+    post_fixture2.title = "Test2"
+    post_fixture2.tags = ["patchnotes"]
+    assert post_fixture2.get_type() == PostType.UPDATE
+
+
+def test_post_get_type_reset_on_tags_mutation(post_fixture, post_fixture2):
+    assert post_fixture2.get_type() == PostType.NEWS
+    post_fixture2.tags.append("patchnotes")
+    assert post_fixture2.get_type() == PostType.UPDATE
+
+    assert post_fixture.get_type() == PostType.UPDATE
+    post_fixture.tags.clear()
+    assert post_fixture.get_type() == PostType.EXTERNAL
+
+
+def test_post_header_from_post(post_fixture):
+    header = PostHeader.from_post(post_fixture)
+    assert header.gid == post_fixture.gid
+    assert header.title == post_fixture.title
+    assert header.date == post_fixture.date
+    assert header.get_type() == PostType.UPDATE
+    assert header.is_update()
+    assert not header.is_news()
+    assert not header.is_external()
+
+
+def test_post_header_compares_with_posts(post_fixture, post_fixture2):
+    header = PostHeader.from_post(post_fixture)
+    assert post_fixture2.is_newer_than(header)
+    assert header.is_older_eq_than(post_fixture2)
+    assert not header.is_newer_than(None)
+    assert not header.is_older_eq_than(None)
+
+
+def test_latest_posts_keeps_newest_of_type(post_fixture, post_fixture2):
+    update = PostHeader.from_post(post_fixture)
+    news = PostHeader.from_post(post_fixture2)
+    older_news = PostHeader(gid="0", title="Old", date=news.date - 10, type=PostType.NEWS)
+
+    latest = LatestPosts([update, news, older_news])
+
+    assert len(latest) == 2
+    assert latest.get(PostType.UPDATE) == update
+    assert latest.get(PostType.NEWS) == news
+    assert latest.get(PostType.EXTERNAL) is None
+    assert latest.latest == news
+
+
+def test_latest_posts_update_replaces_same_date(post_fixture2):
+    news = PostHeader.from_post(post_fixture2)
+    latest = LatestPosts([news])
+    edited = PostHeader(gid=news.gid, title="Edited", date=news.date, type=news.type)
+
+    latest.update(edited)
+
+    assert latest.get(PostType.NEWS) == edited
+    assert latest.latest == edited
+
+
+def test_latest_posts_empty():
+    latest = LatestPosts()
+    assert len(latest) == 0
+    assert latest.latest is None
@@ -5,6 +5,11 @@ import pytest
 from cs2posts.dto.post import Post
 
 
+@pytest.fixture(autouse=True)
+def no_network(mocked_resolver):
+    yield mocked_resolver
+
+
 @pytest.fixture
 def mocked_cs2_update_post() -> Post:
     return Post(gid="1337",
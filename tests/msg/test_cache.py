@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import pytest
+
+from cs2posts.msg import CounterStrikeNewsMessage
+from cs2posts.msg import MessageCache
+
+
+def test_message_cache_rejects_invalid_size():
+    with pytest.raises(ValueError):
+        MessageCache(0)
+
+
+def test_message_cache_get_put(mocked_cs2_news_post, mocked_cs2_update_post):
+    cache = MessageCache(2)
+    msg = Mock()
+
+    assert cache.get(mocked_cs2_news_post) is None
+    cache.put(mocked_cs2_news_post, msg)
+
+    assert cache.get(mocked_cs2_news_post) is msg
+    assert mocked_cs2_news_post in cache
+    assert mocked_cs2_update_post not in cache
+    assert len(cache) == 1
+
+
+def test_message_cache_evicts_least_recently_used(
+        mocked_cs2_news_post, mocked_cs2_update_post, mocked_cs2_external_news):
+    cache = MessageCache(2)
+    cache.put(mocked_cs2_news_post, Mock())
+    cache.put(mocked_cs2_update_post, Mock())
+
+    # Touch the news post so the update post becomes the eviction candidate.
+    cache.get(mocked_cs2_news_post)
+    cache.put(mocked_cs2_external_news, Mock())
+
+    assert mocked_cs2_news_post in cache
+    assert mocked_cs2_update_post not in cache
+    assert mocked_cs2_external_news in cache
+
+
+def test_message_cache_key_includes_message_version(mocked_cs2_news_post):
+    cache = MessageCache(2)
+    cache.put(mocked_cs2_news_post, Mock())
+
+    with patch.object(CounterStrikeNewsMessage, 'VERSION', CounterStrikeNewsMessage.VERSION + 1):
+        assert cache.get(mocked_cs2_news_post) is None
+
+
+def test_message_cache_clear(mocked_cs2_news_post):
+    cache = MessageCache(2)
+    cache.put(mocked_cs2_news_post, Mock())
+    cache.clear()
+    assert len(cache) == 0
@@ -95,31 +95,22 @@ def mocked_news_post_with_carousel():
 
 
 def test_counter_strike_news_message_init(mocked_news_post):
-    with patch('requests.get') as mocked_get:
-        mocked_get.return_value.ok = True
-        mocked_get.return_value.url = "https://www.counter-strike.net/newsentry/1338"
-        msg = CounterStrikeNewsMessage(mocked_news_post)
-        assert msg.post == mocked_news_post
-        assert len(msg.content) >= 1
+    msg = CounterStrikeNewsMessage(mocked_news_post)
+    assert msg.post == mocked_news_post
+    assert len(msg.content) >= 1
 
 
 def test_counter_strike_news_message_get_header(mocked_news_post):
-    with patch('requests.get') as mocked_get:
-        mocked_get.return_value.ok = True
-        mocked_get.return_value.url = "https://www.counter-strike.net/newsentry/1338"
-        msg = CounterStrikeNewsMessage(mocked_news_post)
-        header = msg.get_header()
-        assert "<b>Some News</b>" in header
-        assert "2009-02-13" in header
+    msg = CounterStrikeNewsMessage(mocked_news_post)
+    header = msg.get_header()
+    assert "<b>Some News</b>" in header
+    assert "2009-02-13" in header
 
 
 def test_counter_strike_news_message_escapes_html_in_title_and_author(mocked_news_post):
     mocked_news_post.title = "Dust2 & Mirage <Update>"
     mocked_news_post.author = "Valve & Co <team>"
-    with patch('requests.get') as mocked_get:
-        mocked_get.return_value.ok = True
-        mocked_get.return_value.url = "https://www.counter-strike.net/newsentry/1338"
-        msg = CounterStrikeNewsMessage(mocked_news_post)
+    msg = CounterStrikeNewsMessage(mocked_news_post)
 
     header = msg.get_header()
     assert "Dust2 &amp; Mirage &lt;Update&gt;" in header
@@ -131,36 +122,25 @@ def test_counter_strike_news_message_escapes_html_in_title_and_author(mocked_new
 
 
 def test_counter_strike_news_message_add_header_text_block(mocked_news_post):
-    with patch('requests.get') as mocked_get:
-        mocked_get.return_value.ok = True
-        mocked_get.return_value.url = "https://www.counter-strike.net/newsentry/1338"
-        msg = CounterStrikeNewsMessage(mocked_news_post)
-        # First content should be a TextBlock with header
-        if isinstance(msg.content[0], TextBlock):
-            assert "<b>Some News</b>" in msg.content[0].text
+    msg = CounterStrikeNewsMessage(mocked_news_post)
+    # First content should be a TextBlock with header
+    if isinstance(msg.content[0], TextBlock):
+        assert "<b>Some News</b>" in msg.content[0].text
 
 
 def test_counter_strike_news_message_add_footer(mocked_news_post):
-    with patch('requests.get') as mocked_get:
-        mocked_get.return_value.ok = True
-        mocked_get.return_value.url = "https://www.counter-strike.net/newsentry/1338"
-        msg = CounterStrikeNewsMessage(mocked_news_post)
-        # Last content should contain footer
-        last_content = msg.content[-1]
-        if isinstance(last_content, TextBlock):
-            assert "(Author: Valve)" in last_content.text
-            assert "Source:" in last_content.text
+    msg = CounterStrikeNewsMessage(mocked_news_post)
+    # Last content should contain footer
+    last_content = msg.content[-1]
+    if isinstance(last_content, TextBlock):
+        assert "(Author: Valve)" in last_content.text
+        assert "Source:" in last_content.text
 
 
 def test_counter_strike_news_message_with_image_heading(mocked_news_post_with_image):
-    with patch('requests.get') as mocked_get:
-        mocked_get.return_value.ok = True
-        mocked_get.return_value.url = "https://www.counter-strike.net/newsentry/1338"
-        with patch('cs2posts.content.extractor_image.resolve_steam_clan_image_url') as mock_resolve:
-            mock_resolve.return_value = "https://example.com/image.jpg"
-            msg = CounterStrikeNewsMessage(mocked_news_post_with_image)
-            # Should have image as first content
-            assert any(isinstance(c, Image) for c in msg.content)
+    msg = CounterStrikeNewsMessage(mocked_news_post_with_image)
+    # Should have image as first content
+    assert any(isinstance(c, Image) for c in msg.content)
 
 
 @pytest.mark.asyncio
@@ -178,10 +158,7 @@ async def test_counter_strike_news_message_send_message():
         feed_type=1,
         appid=730)
 
-    with patch('requests.get') as mocked_get:
-        mocked_get.return_value.ok = True
-        mocked_get.return_value.url = "https://www.counter-strike.net/newsentry/1338"
-        msg = CounterStrikeNewsMessage(post)
+    msg = CounterStrikeNewsMessage(post)
 
     mocked_bot = AsyncMock()
     text_block = TextBlock(0, 10, False, "Test message")
@@ -204,10 +181,7 @@ async def test_counter_strike_news_message_send_message_long_text():
         feed_type=1,
         appid=730)
 
-    with patch('requests.get') as mocked_get:
-        mocked_get.return_value.ok = True
-        mocked_get.return_value.url = "https://www.counter-strike.net/newsentry/1338"
-        msg = CounterStrikeNewsMessage(post)
+    msg = CounterStrikeNewsMessage(post)
 
     mocked_bot = AsyncMock()
     text_block = TextBlock(0, 5000, False, "A" * 5000)
@@ -231,20 +205,17 @@ async def test_counter_strike_news_message_send_image_valid_url():
         feed_type=1,
         appid=730)
 
-    with patch('requests.get') as mocked_get:
-        mocked_get.return_value.ok = True
-        mocked_get.return_value.url = "https://www.counter-strike.net/newsentry/1338"
-        msg = CounterStrikeNewsMessage(post)
+    msg = CounterStrikeNewsMessage(post)
 
     mocked_bot = AsyncMock()
     image = Image(0, 50, False, "https://example.com/image.jpg")
 
     with patch('cs2posts.msg.cs_news_msg.extract_url') as mock_extract:
         mock_extract.return_value = "https://example.com/image.jpg"
-        with patch('cs2posts.msg.cs_news_msg.asyncio.to_thread', new=AsyncMock(return_value=True)) as mock_to_thread:
+        with patch('cs2posts.msg.cs_news_msg.is_valid_url', new=AsyncMock(return_value=True)) as mock_valid:
             await msg.send_image(mocked_bot, 42, image)
             mocked_bot.send_photo.assert_called_once()
-            mock_to_thread.assert_awaited_once()
+            mock_valid.assert_awaited_once_with("https://example.com/image.jpg")
 
 
 @pytest.mark.asyncio
@@ -262,10 +233,7 @@ async def test_counter_strike_news_message_send_image_invalid_url():
         feed_type=1,
         appid=730)
 
-    with patch('requests.get') as mocked_get:
-        mocked_get.return_value.ok = True
-        mocked_get.return_value.url = "https://www.counter-strike.net/newsentry/1338"
-        msg = CounterStrikeNewsMessage(post)
+    msg = CounterStrikeNewsMessage(post)
 
     mocked_bot = AsyncMock()
     image = Image(0, 50, False, "invalid-url")
@@ -293,10 +261,7 @@ async def test_counter_strike_news_message_send_image_with_heading():
         feed_type=1,
         appid=730)
 
-    with patch('requests.get') as mocked_get:
-        mocked_get.return_value.ok = True
-        mocked_get.return_value.url = "https://www.counter-strike.net/newsentry/1338"
-        msg = CounterStrikeNewsMessage(post)
+    msg = CounterStrikeNewsMessage(post)
 
     mocked_bot = AsyncMock()
     image = Image(0, 50, True, "https://example.com/image.jpg")
@@ -325,10 +290,7 @@ async def test_counter_strike_news_message_send_carousel():
         feed_type=1,
         appid=730)
 
-    with patch('requests.get') as mocked_get:
-        mocked_get.return_value.ok = True
-        mocked_get.return_value.url = "https://www.counter-strike.net/newsentry/1338"
-        msg = CounterStrikeNewsMessage(post)
+    msg = CounterStrikeNewsMessage(post)
 
     mocked_bot = AsyncMock()
     images = [
@@ -360,10 +322,7 @@ async def test_counter_strike_news_message_send_carousel_invalid_urls():
         feed_type=1,
         appid=730)
 
-    with patch('requests.get') as mocked_get:
-        mocked_get.return_value.ok = True
-        mocked_get.return_value.url = "https://www.counter-strike.net/newsentry/1338"
-        msg = CounterStrikeNewsMessage(post)
+    msg = CounterStrikeNewsMessage(post)
 
     mocked_bot = AsyncMock()
     images = [
@@ -396,10 +355,7 @@ async def test_counter_strike_news_message_send_video():
         feed_type=1,
         appid=730)
 
-    with patch('requests.get') as mocked_get:
-        mocked_get.return_value.ok = True
-        mocked_get.return_value.url = "https://www.counter-strike.net/newsentry/1338"
-        msg = CounterStrikeNewsMessage(post)
+    msg = CounterStrikeNewsMessage(post)
 
     mocked_bot = AsyncMock()
     video = Video(0, 50, False, webm="", mp4="https://example.com/video.mp4", poster="https://example.com/poster.jpg", autoplay=True, controls=True)
@@ -427,10 +383,7 @@ async def test_counter_strike_news_message_send_video_empty():
         feed_type=1,
         appid=730)
 
-    with patch('requests.get') as mocked_get:
-        mocked_get.return_value.ok = True
-        mocked_get.return_value.url = "https://www.counter-strike.net/newsentry/1338"
-        msg = CounterStrikeNewsMessage(post)
+    msg = CounterStrikeNewsMessage(post)
 
     mocked_bot = AsyncMock()
     video = Video(0, 50, False, webm="", mp4="", poster="", autoplay=False, controls=False)
@@ -454,10 +407,7 @@ async def test_counter_strike_news_message_send_video_invalid_url():
         feed_type=1,
         appid=730)
 
-    with patch('requests.get') as mocked_get:
-        mocked_get.return_value.ok = True
-        mocked_get.return_value.url = "https://www.counter-strike.net/newsentry/1338"
-        msg = CounterStrikeNewsMessage(post)
+    msg = CounterStrikeNewsMessage(post)
 
     mocked_bot = AsyncMock()
     video = Video(0, 50, False, webm="", mp4="invalid", poster="", autoplay=False, controls=False)
@@ -485,10 +435,7 @@ async def test_counter_strike_news_message_send_youtube_video():
         feed_type=1,
         appid=730)
 
-    with patch('requests.get') as mocked_get:
-        mocked_get.return_value.ok = True
-        mocked_get.return_value.url = "https://www.counter-strike.net/newsentry/1338"
-        msg = CounterStrikeNewsMessage(post)
+    msg = CounterStrikeNewsMessage(post)
 
     mocked_bot = AsyncMock()
     youtube = Youtube(0, 50, False, "dQw4w9WgXcQ")
@@ -515,10 +462,7 @@ async def test_counter_strike_news_message_send_youtube_video_with_heading():
         feed_type=1,
         appid=730)
 
-    with patch('requests.get') as mocked_get:
-        mocked_get.return_value.ok = True
-        mocked_get.return_value.url = "https://www.counter-strike.net/newsentry/1338"
-        msg = CounterStrikeNewsMessage(post)
+    msg = CounterStrikeNewsMessage(post)
 
     mocked_bot = AsyncMock()
     youtube = Youtube(0, 50, True, "dQw4w9WgXcQ")
@@ -543,10 +487,7 @@ async def test_counter_strike_news_message_send():
         feed_type=1,
         appid=730)
 
-    with patch('requests.get') as mocked_get:
-        mocked_get.return_value.ok = True
-        mocked_get.return_value.url = "https://www.counter-strike.net/newsentry/1338"
-        msg = CounterStrikeNewsMessage(post)
+    msg = CounterStrikeNewsMessage(post)
 
     mocked_bot = AsyncMock()
     await msg.send(mocked_bot, 42)
@@ -569,10 +510,7 @@ async def test_counter_strike_news_message_send_with_all_content_types():
         feed_type=1,
         appid=730)
 
-    with patch('requests.get') as mocked_get:
-        mocked_get.return_value.ok = True
-        mocked_get.return_value.url = "https://www.counter-strike.net/newsentry/1338"
-        msg = CounterStrikeNewsMessage(post)
+    msg = CounterStrikeNewsMessage(post)
 
     # Replace content with all types
     msg.content = [
@@ -585,12 +523,14 @@ async def test_counter_strike_news_message_send_with_all_content_types():
     ]
 
     mocked_bot = AsyncMock()
-    with patch.object(msg, 'send_message', new_callable=AsyncMock) as mock_send_msg:
-        with patch.object(msg, 'send_image', new_callable=AsyncMock) as mock_send_img:
-            with patch.object(msg, 'send_carousel', new_callable=AsyncMock) as mock_send_carousel:
-                with patch.object(msg, 'send_video', new_callable=AsyncMock) as mock_send_video:
-                    with patch.object(msg, 'send_youtube_video', new_callable=AsyncMock) as mock_send_yt:
+    with patch.object(msg, 'plan_message', new=AsyncMock(return_value=[])) as mock_send_msg:
+        with patch.object(msg, 'plan_image', new=AsyncMock(return_value=[])) as mock_send_img:
+            with patch.object(msg, 'plan_carousel', new=AsyncMock(return_value=[])) as mock_send_carousel:
+                with patch.object(msg, 'plan_video', new=AsyncMock(return_value=[])) as mock_send_video:
+                    with patch.object(msg, 'plan_youtube_video', new=AsyncMock(return_value=[])) as mock_send_yt:
+                        # The plan is built once and replayed for the second chat
                         await msg.send(mocked_bot, 42)
+                        await msg.send(mocked_bot, 43)
                         assert mock_send_msg.call_count == 2
                         mock_send_img.assert_called_once()
                         mock_send_carousel.assert_called_once()
@@ -612,15 +552,10 @@ def test_counter_strike_news_message_add_footer_to_non_textblock():
         feed_type=1,
         appid=730)
 
-    with patch('requests.get') as mocked_get:
-        mocked_get.return_value.ok = True
-        mocked_get.return_value.url = "https://www.counter-strike.net/newsentry/1338"
-        with patch('cs2posts.content.extractor_image.resolve_steam_clan_image_url') as mock_resolve:
-            mock_resolve.return_value = "https://example.com/image.jpg"
-            msg = CounterStrikeNewsMessage(post)
-            # Should append a TextBlock with footer
-            assert isinstance(msg.content[-1], TextBlock)
-            assert "(Author: Valve)" in msg.content[-1].text
+    msg = CounterStrikeNewsMessage(post)
+    # Should append a TextBlock with footer
+    assert isinstance(msg.content[-1], TextBlock)
+    assert "(Author: Valve)" in msg.content[-1].text
 
 
 @pytest.mark.asyncio
@@ -639,10 +574,7 @@ async def test_counter_strike_news_message_send_continues_after_block_failure():
         feed_type=1,
         appid=730)
 
-    with patch('requests.get') as mocked_get:
-        mocked_get.return_value.ok = True
-        mocked_get.return_value.url = "https://www.counter-strike.net/newsentry/1338"
-        msg = CounterStrikeNewsMessage(post)
+    msg = CounterStrikeNewsMessage(post)
 
     msg.content = [
         TextBlock(0, 10, False, "First block"),
@@ -679,10 +611,7 @@ async def test_counter_strike_news_message_send_all_blocks_attempted_on_multiple
         feed_type=1,
         appid=730)
 
-    with patch('requests.get') as mocked_get:
-        mocked_get.return_value.ok = True
-        mocked_get.return_value.url = "https://www.counter-strike.net/newsentry/1338"
-        msg = CounterStrikeNewsMessage(post)
+    msg = CounterStrikeNewsMessage(post)
 
     msg.content = [
         TextBlock(0, 10, False, "Block 1"),
@@ -702,3 +631,112 @@ async def test_counter_strike_news_message_send_all_blocks_attempted_on_multiple
     # 2 TextBlocks + 1 Youtube each call bot.send_message → 3 total
     assert mocked_bot.send_message.call_count == 3
     mocked_bot.send_photo.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_cs_news_message_checks_media_url_once(mocked_cs2_news_post):
+    msg = CounterStrikeNewsMessage(mocked_cs2_news_post)
+
+    with patch('cs2posts.msg.cs_news_msg.is_valid_url', return_value=True) as mock_valid:
+        assert await msg._is_valid_media_url("https://example.com/image.jpg")
+        assert await msg._is_valid_media_url("https://example.com/image.jpg")
+
+    mock_valid.assert_called_once_with("https://example.com/image.jpg")
+
+
+@pytest.mark.asyncio
+async def test_cs_news_message_does_not_persist_invalid_media_url(mocked_cs2_news_post):
+    msg = CounterStrikeNewsMessage(mocked_cs2_news_post)
+
+    # e.g. a timeout, the resolver does not cache it either
+    with patch('cs2posts.msg.cs_news_msg.is_valid_url', return_value=False):
+        assert not await msg._is_valid_media_url("https://example.com/image.jpg")
+    with patch('cs2posts.msg.cs_news_msg.is_valid_url', return_value=True):
+        assert await msg._is_valid_media_url("https://example.com/other.jpg")
+
+    data = msg.to_dict()
+    assert data["valid_media_urls"] == {"https://example.com/other.jpg": True}
+
+    restored = CounterStrikeNewsMessage.from_dict(data, mocked_cs2_news_post)
+    with patch('cs2posts.msg.cs_news_msg.is_valid_url', return_value=True) as mock_valid:
+        assert await restored._is_valid_media_url("https://example.com/image.jpg")
+        assert await restored._is_valid_media_url("https://example.com/other.jpg")
+
+    mock_valid.assert_called_once_with("https://example.com/image.jpg")
+
+
+def _news_message_with_media():
+    post = Post(
+        gid="1338",
+        title="Some News",
+        is_external_url=True,
+        url="https://www.counter-strike.net/newsentry/1338",
+        author="Valve",
+        contents="Test",
+        date=1234567890,
+        feedlabel="feedlabel",
+        feedname="feedname",
+        feed_type=1,
+        appid=730)
+
+    msg = CounterStrikeNewsMessage(post)
+
+    msg.content = [
+        TextBlock(0, 10, True, "Header text"),
+        Image(10, 20, False, "https://example.com/image.jpg"),
+        Carousel(20, 30, False, [Image(20, 25, False, "https://example.com/img.jpg"),
+                                 Image(25, 30, False, "https://example.com/invalid.jpg")]),
+        Video(30, 40, False, webm="", mp4="https://example.com/video.mp4", poster="", autoplay=False, controls=False),
+    ]
+    return msg
+
+
+@pytest.mark.asyncio
+async def test_counter_strike_news_message_plan():
+    msg = _news_message_with_media()
+
+    async def is_valid(url):
+        return url != "https://example.com/invalid.jpg"
+
+    with patch('cs2posts.msg.cs_news_msg.is_valid_url', side_effect=is_valid) as mock_valid:
+        plan = await msg.plan()
+        assert await msg.plan() is plan
+
+    assert mock_valid.call_count == 4
+    assert [[call.method for call in block] for block in plan] == [
+        ["send_message"], ["send_photo"], ["send_media_group"], ["send_video"]]
+    assert plan[0][0].kwargs["text"] == "Header text"
+    assert plan[1][0].kwargs["photo"] == "https://example.com/image.jpg"
+    assert [media.media for media in plan[2][0].kwargs["media"]] == ["https://example.com/img.jpg"]
+    assert plan[3][0].kwargs["video"] == "https://example.com/video.mp4"
+
+
+@pytest.mark.asyncio
+async def test_counter_strike_news_message_plan_replayed_for_every_chat():
+    msg = _news_message_with_media()
+    mocked_bot = AsyncMock()
+
+    with patch('cs2posts.msg.cs_news_msg.is_valid_url', new=AsyncMock(return_value=True)) as mock_valid, \
+            patch('cs2posts.msg.cs_news_msg.extract_url', side_effect=lambda url: url) as mock_extract:
+        await msg.send(mocked_bot, 42)
+        calls = (mock_valid.call_count, mock_extract.call_count)
+        await msg.send(mocked_bot, 43)
+        assert (mock_valid.call_count, mock_extract.call_count) == calls
+
+    assert mocked_bot.send_photo.call_count == 2
+    assert [c.kwargs["chat_id"] for c in mocked_bot.send_video.call_args_list] == [42, 43]
+
+
+@pytest.mark.asyncio
+async def test_counter_strike_news_message_plan_skips_failing_block():
+    msg = _news_message_with_media()
+    mocked_bot = AsyncMock()
+
+    with patch.object(msg, 'plan_image', new=AsyncMock(side_effect=RuntimeError("broken"))), \
+            patch('cs2posts.msg.cs_news_msg.is_valid_url', new=AsyncMock(return_value=True)):
+        plan = await msg.plan()
+        await msg.send(mocked_bot, 42)
+
+    assert plan[1] == ()
+    mocked_bot.send_photo.assert_not_called()
+    mocked_bot.send_video.assert_called_once()
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 from unittest.mock import AsyncMock
-from unittest.mock import patch
 
 import pytest
 from bs4 import BeautifulSoup
@@ -22,11 +21,7 @@ def test_counter_strike_external_message_uses_read_more_link_and_strips_media(mo
         "<a href='https://example.com/story'>Read more</a></p>"
     )
 
-    with patch('requests.get') as mocked_get:
-        mocked_get.return_value.ok = True
-        mocked_get.return_value.url = "https://test.com"
-
-        msg = CounterStrikeExternalMessage(post=mocked_cs2_external_news)
+    msg = CounterStrikeExternalMessage(post=mocked_cs2_external_news)
 
     assert "Read more" not in msg.message
     assert "<img" not in msg.message
@@ -93,10 +88,7 @@ def test_build_message_formats_external_message(mocked_cs2_external_news):
 
 @pytest.mark.asyncio
 async def test_telegram_message_send_external_raises_on_chunk_failure(mocked_cs2_external_news):
-    with patch('requests.get') as mocked_get:
-        mocked_get.return_value.ok = True
-        mocked_get.return_value.url = "https://test.com"
-        msg = await create_message(mocked_cs2_external_news)
+    msg = await create_message(mocked_cs2_external_news)
 
     msg._TelegramMessage__messages = ["chunk1", "chunk2"]
 
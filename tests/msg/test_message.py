@@ -1,17 +1,25 @@
 from __future__ import annotations
 
+import hashlib
+import json
+from dataclasses import fields
+from pathlib import Path
 from unittest.mock import AsyncMock
 from unittest.mock import patch
 
 import pytest
 
+from cs2posts.content.content import CONTENT_TYPES
+from cs2posts.dto.post import Post
 from cs2posts.msg import CounterStrikeExternalMessage
 from cs2posts.msg import CounterStrikeNewsMessage
 from cs2posts.msg import CounterStrikeUpdateMessage
 from cs2posts.msg import create_message
+from cs2posts.msg import restore_message
 from cs2posts.msg import TelegramMessage
 from cs2posts.msg.constants import TELEGRAM_MAX_MESSAGE_LENGTH
-from cs2posts.msg.constants import TELEGRAM_SEND_DELAY_SECONDS
+from cs2posts.msg.factory import build_message
+from cs2posts.parser import DocumentCache
 
 
 def test_telegram_message_msg_not_split():
@@ -39,33 +47,32 @@ def test_telegram_message_hard_splits_overlong_single_line():
 
 @pytest.mark.asyncio
 async def test_telegram_message_factory(mocked_cs2_news_post, mocked_cs2_update_post, mocked_cs2_external_news):
-    with patch('requests.get') as mocked_get:
-        mocked_get.return_value.ok = True
-        mocked_get.return_value.url = "https://test.com"
-        msg = await create_message(mocked_cs2_news_post)
-        assert isinstance(msg, CounterStrikeNewsMessage)
+    msg = await create_message(mocked_cs2_news_post)
+    assert isinstance(msg, CounterStrikeNewsMessage)
+    assert "href='https://www.counter-strike.net/newsentry/1338'" in msg.content[-1].text
 
-        msg = await create_message(mocked_cs2_update_post)
-        assert isinstance(msg, CounterStrikeUpdateMessage)
+    msg = await create_message(mocked_cs2_update_post)
+    assert isinstance(msg, CounterStrikeUpdateMessage)
+    # The source link is the URL the post redirects to.
+    assert "href='https://www.test.com/news'" in msg.message
 
-        msg = await create_message(mocked_cs2_external_news)
-        assert isinstance(msg, CounterStrikeExternalMessage)
+    msg = await create_message(mocked_cs2_external_news)
+    assert isinstance(msg, CounterStrikeExternalMessage)
 
 
 @pytest.mark.asyncio
 async def test_telegram_message_factory_raises_for_unknown_post_type(mocked_cs2_update_post):
-    with patch.object(mocked_cs2_update_post, 'is_news', return_value=False), \
-            patch.object(mocked_cs2_update_post, 'is_update', return_value=False), \
-            patch.object(mocked_cs2_update_post, 'is_external', return_value=False):
+    # Post is slotted, its methods can only be patched on the class.
+    with patch.object(Post, 'is_news', return_value=False), \
+            patch.object(Post, 'is_update', return_value=False), \
+            patch.object(Post, 'is_external', return_value=False):
         with pytest.raises(ValueError, match="Unknown post type"):
             await create_message(mocked_cs2_update_post)
 
 
 @pytest.mark.asyncio
 async def test_telegram_message_send_news(mocked_cs2_news_post):
-    with patch('requests.get') as mocked_get, \
-            patch('cs2posts.msg.cs_news_msg.is_valid_url', return_value=True):
-        mocked_get.return_value.ok = True
+    with patch('cs2posts.msg.cs_news_msg.is_valid_url', return_value=True):
         msg = await create_message(mocked_cs2_news_post)
 
         mocked_bot = AsyncMock()
@@ -90,14 +97,127 @@ async def test_telegram_message_send_raises_on_chunk_failure():
 
 
 @pytest.mark.asyncio
-async def test_telegram_message_send_uses_configured_delay_between_chunks():
+async def test_telegram_message_send_does_not_sleep_between_chunks():
+    # Pacing is left to the rate limited bot the message is sent with
     msg = TelegramMessage("hello")
     msg._TelegramMessage__messages = ["chunk1", "chunk2", "chunk3"]
 
     bot = AsyncMock()
 
-    with patch('cs2posts.msg.telegram.asyncio.sleep', new=AsyncMock()) as mocked_sleep:
+    with patch('asyncio.sleep', new=AsyncMock()) as mocked_sleep:
         await msg.send(bot=bot, chat_id=42)
 
-    assert mocked_sleep.await_count == 2
-    mocked_sleep.assert_any_await(TELEGRAM_SEND_DELAY_SECONDS)
+    assert bot.send_message.await_count == 3
+    mocked_sleep.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_telegram_message_send_from_start_block_reports_progress():
+    msg = TelegramMessage("hello")
+    msg._TelegramMessage__messages = ["chunk1", "chunk2", "chunk3"]
+
+    bot = AsyncMock()
+    progress = AsyncMock()
+
+    await msg.send(bot=bot, chat_id=42, start=1, progress=progress)
+
+    assert msg.block_count == 3
+    assert [c.kwargs['text'] for c in bot.send_message.await_args_list] == ["chunk2", "chunk3"]
+    assert [c.args[0] for c in progress.await_args_list] == [2, 3]
+
+
+def test_telegram_message_to_dict_and_from_dict():
+    msg = TelegramMessage("foo bar\n" * 600)
+
+    restored = TelegramMessage.from_dict(msg.to_dict())
+
+    assert restored.message == msg.message
+    assert restored.messages == msg.messages
+
+
+@pytest.mark.asyncio
+async def test_restore_news_message_without_rendering(mocked_cs2_news_post):
+    with patch('cs2posts.msg.cs_news_msg.is_valid_url', return_value=True):
+        msg = await create_message(mocked_cs2_news_post)
+        await msg.send(bot=AsyncMock(), chat_id=1337)
+
+    data = json.loads(json.dumps(msg.to_dict()))
+    with patch('cs2posts.msg.cs_news_msg.ParsedDocument') as mocked_parser, \
+            patch('cs2posts.msg.cs_news_msg.is_valid_url') as mocked_valid:
+        restored = restore_message(mocked_cs2_news_post, data)
+        mocked_bot = AsyncMock()
+        await restored.send(bot=mocked_bot, chat_id=1337)
+
+    mocked_parser.assert_not_called()
+    # Media URL checks are restored as well, sending needs no HTTP request.
+    mocked_valid.assert_not_called()
+    assert isinstance(restored, CounterStrikeNewsMessage)
+    assert restored.content == msg.content
+    assert mocked_bot.send_photo.called
+
+
+@pytest.mark.asyncio
+async def test_restore_update_message(mocked_cs2_update_post):
+    msg = await create_message(mocked_cs2_update_post)
+
+    restored = restore_message(mocked_cs2_update_post, msg.to_dict())
+
+    assert isinstance(restored, CounterStrikeUpdateMessage)
+    assert restored.messages == msg.messages
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("post_fixture", [
+    "mocked_cs2_update_post", "mocked_cs2_news_post", "mocked_cs2_external_news"])
+async def test_create_message_parses_post_once(post_fixture, request):
+    post = request.getfixturevalue(post_fixture)
+    documents = DocumentCache(maxsize=1)
+    msg = await create_message(post, documents)
+    with patch('cs2posts.parser.document.render_bbcode') as mocked_render, \
+            patch('cs2posts.msg.cs_external_msg.BeautifulSoup') as mocked_soup:
+        again = await create_message(post, documents)
+
+    mocked_render.assert_not_called()
+    mocked_soup.assert_not_called()
+    assert again.to_dict() == msg.to_dict()
+
+
+@pytest.mark.asyncio
+async def test_create_message_does_not_modify_post(mocked_cs2_update_post):
+    contents = mocked_cs2_update_post.contents
+    with patch('cs2posts.msg.factory.resolve_steam_clan_images',
+               new=AsyncMock(return_value="Resolved contents")):
+        msg = await create_message(mocked_cs2_update_post)
+
+    assert mocked_cs2_update_post.contents == contents
+    assert "Resolved contents" in msg.message
+
+
+# What a cached message of each VERSION looks like: the fields of its
+# content blocks and a digest of the messages rendered from tests/data.
+# A change of either must come with a new VERSION, add its entry here.
+MESSAGE_VERSIONS = {
+    3: (
+        {
+            "Carousel": ["images", "is_heading", "text_pos_end", "text_pos_start"],
+            "Image": ["is_heading", "text_pos_end", "text_pos_start", "url"],
+            "TextBlock": ["is_heading", "text_pos_end", "text_pos_start"],
+            "Video": ["autoplay", "controls", "is_heading", "mp4", "poster",
+                      "text_pos_end", "text_pos_start", "webm"],
+            "Youtube": ["is_heading", "text_pos_end", "text_pos_start", "url"],
+        },
+        "e842a35c6b03f836eafb160b6f67612670c0b3abfd6ff35d876b797f9b40e111",
+    ),
+}
+
+
+def test_message_version_matches_rendered_messages():
+    schema = {name: sorted(field.name for field in fields(content_type))
+              for name, content_type in sorted(CONTENT_TYPES.items())}
+    rendered = [
+        build_message(Post.from_dict(json.loads(path.read_text(encoding="utf-8"))),
+                      "https://example.com").to_dict()
+        for path in sorted(Path("tests/data").glob("*.json"))]
+    digest = hashlib.sha256(json.dumps(rendered, sort_keys=True).encode()).hexdigest()
+
+    assert (schema, digest) == MESSAGE_VERSIONS[TelegramMessage.VERSION]
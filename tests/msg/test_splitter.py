@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import html
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+from cs2posts.msg import CounterStrikeUpdateMessage
+from cs2posts.msg import MessageSplitter
+from cs2posts.msg import split_message
+from cs2posts.msg.constants import TELEGRAM_MAX_MESSAGE_LENGTH
+from cs2posts.msg.splitter import entity_len
+from cs2posts.msg.splitter import utf16_len
+from cs2posts.msg.splitter import utf16_prefix
+from cs2posts.parser import ParsedDocument
+
+
+TAG = re.compile(r"</?([a-z]+)[^>]*>")
+
+
+def visible_len(chunk: str) -> int:
+    return utf16_len(html.unescape(TAG.sub("", chunk)))
+
+
+def assert_balanced(chunk: str) -> None:
+    stack = []
+    for match in TAG.finditer(chunk):
+        if match.group().startswith("</"):
+            assert stack.pop() == match.group(1)
+        else:
+            stack.append(match.group(1))
+    assert stack == []
+
+
+def test_utf16_len():
+    assert utf16_len("abc") == 3
+    assert utf16_len("é") == 1
+    assert utf16_len("😀") == 2
+
+
+def test_utf16_prefix_does_not_cut_surrogate_pair():
+    assert utf16_prefix("a😀b", 2) == "a"
+    assert utf16_prefix("a😀b", 3) == "a😀"
+    assert utf16_prefix("abc", 2) == "ab"
+
+
+def test_entity_len():
+    assert entity_len("&amp;", "amp") == 1
+    assert entity_len("&#128512;", "#128512") == 2
+    assert entity_len("&#x41;", "#x41") == 1
+    assert entity_len("&nbsp;", "nbsp") == len("&nbsp;")
+
+
+def test_splitter_limit_must_be_positive():
+    with pytest.raises(ValueError):
+        MessageSplitter(0)
+
+
+def test_splitter_short_message_not_split():
+    assert split_message("<b>short</b>", 10) == ["<b>short</b>"]
+
+
+def test_splitter_counts_visible_text_only():
+    message = '<a href="https://example.com/a/very/long/url">link</a> &amp; text'
+    assert split_message(message, 11) == [message]
+
+
+def test_splitter_reopens_tags_in_next_chunk():
+    chunks = split_message('<b><a href="u">' + "word " * 10 + "</a></b>", 20)
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert chunk.startswith('<b><a href="u">')
+        assert chunk.endswith("</a></b>")
+        assert visible_len(chunk) <= 20
+
+
+def test_splitter_breaks_at_line_when_half_full():
+    chunks = split_message("aaaa\nbbbb\ncccccccc\n", 12)
+    assert chunks == ["aaaa\nbbbb\n", "cccccccc\n"]
+
+
+def test_splitter_fills_chunk_if_line_breaks_too_early():
+    chunks = split_message("a\nbb cc dd ee ff\n", 10)
+    assert chunks == ["a\nbb cc ", "dd ee ff\n"]
+
+
+def test_splitter_counts_utf16_code_units():
+    chunks = split_message("😀" * 5, 4)
+    assert chunks == ["😀😀", "😀😀", "😀"]
+
+
+def test_splitter_does_not_cut_entities():
+    chunks = split_message("ab&amp;cd", 3)
+    assert chunks == ["ab&amp;", "cd"]
+
+
+def test_splitter_keeps_text():
+    message = "<i>" + "lorem ipsum dolor " * 40 + "</i>\n" + "sit amet\n" * 30
+    chunks = split_message(message, 100)
+    assert TAG.sub("", "".join(chunks)) == TAG.sub("", message)
+
+
+@pytest.mark.parametrize("filepath", sorted(Path("tests/data").glob("*.json")))
+def test_splitter_on_posts(filepath):
+    document = ParsedDocument(json.loads(filepath.read_text(encoding="utf-8"))["contents"])
+    message = document.render(CounterStrikeUpdateMessage.PARSERS)
+    limit = 500
+
+    chunks = split_message(message, limit)
+
+    for chunk in chunks:
+        assert visible_len(chunk) <= limit
+        assert_balanced(chunk)
+    assert all(visible_len(chunk) * 2 >= limit for chunk in chunks[:-1])
+
+
+def test_splitter_default_limit():
+    assert MessageSplitter().limit == TELEGRAM_MAX_MESSAGE_LENGTH
+
+
+def test_splitter_can_be_reused():
+    splitter = MessageSplitter(10)
+    message = "<b>" + "word " * 10 + "</b>"
+
+    first = splitter.split(message)
+    splitter.split("<i>" + "other " * 10)
+
+    assert splitter.split(message) == first
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import bbcode
+import pytest
+
+from cs2posts.parser.document import DocumentCache
+from cs2posts.parser.document import ParsedDocument
+from cs2posts.parser.steam2telegram_html import Steam2TelegramHTML
+from cs2posts.parser.steam_list import SteamListParser
+from cs2posts.parser.steam_news_table import SteamNewsTableParser
+from cs2posts.parser.steam_update_heading import SteamUpdateHeadingParser
+
+
+PARSERS = (SteamListParser, SteamNewsTableParser, SteamUpdateHeadingParser)
+
+
+@pytest.mark.parametrize("filepath", sorted(Path("tests/data").glob("*.json")))
+def test_parsed_document_renders_like_steam2telegram_html(filepath):
+    contents = json.loads(filepath.read_text(encoding="utf-8"))["contents"]
+    parser = Steam2TelegramHTML(contents)
+    for priority, sub_parser in enumerate(PARSERS):
+        parser.add_parser(parser=sub_parser, priority=priority)
+    assert ParsedDocument(contents).render(PARSERS) == parser.parse()
+
+
+def test_parsed_document_renders_bbcode_once():
+    document = ParsedDocument("[h2]Heading[/h2][list][*]item[/list]")
+    with patch('bbcode.render_html', side_effect=bbcode.render_html) as mocked_render:
+        news = document.render(PARSERS[:2])
+        update = document.render(PARSERS)
+        assert document.render(PARSERS[:2]) is news
+        assert document.render(PARSERS) is update
+    mocked_render.assert_called_once_with(document.contents)
+
+
+def test_parsed_document_derive_once():
+    document = ParsedDocument("contents")
+    func = Mock(return_value="derived")
+    assert document.derive(func) == "derived"
+    assert document.derive(func) == "derived"
+    func.assert_called_once_with("contents")
+
+
+def test_document_cache_reuses_document():
+    cache = DocumentCache(maxsize=2)
+    document = cache.get("1", "contents")
+    assert cache.get("1", "contents") is document
+    assert "1" in cache
+    assert len(cache) == 1
+
+
+def test_document_cache_parses_changed_contents_again():
+    cache = DocumentCache(maxsize=2)
+    document = cache.get("1", "{STEAM_CLAN_IMAGE}/a.png")
+    resolved = cache.get("1", "https://clan.akamai.steamstatic.com/images/a.png")
+    assert resolved is not document
+    assert resolved.contents == "https://clan.akamai.steamstatic.com/images/a.png"
+    assert len(cache) == 1
+
+
+def test_document_cache_evicts_least_recently_used():
+    cache = DocumentCache(maxsize=2)
+    cache.get("1", "one")
+    cache.get("2", "two")
+    cache.get("1", "one")
+    cache.get("3", "three")
+    assert "1" in cache
+    assert "2" not in cache
+    assert "3" in cache
+
+
+def test_document_cache_clear():
+    cache = DocumentCache(maxsize=2)
+    cache.get("1", "one")
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_document_cache_invalid_maxsize():
+    with pytest.raises(ValueError):
+        DocumentCache(maxsize=0)
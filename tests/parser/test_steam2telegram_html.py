@@ -1,8 +1,15 @@
 from __future__ import annotations
 
+import json
+import re
+from pathlib import Path
+
 import pytest
 
+from cs2posts.parser.steam2telegram_html import HEADING_PASS
+from cs2posts.parser.steam2telegram_html import PARAGRAPH_PASS
 from cs2posts.parser.steam2telegram_html import Steam2TelegramHTML
+from cs2posts.parser.steam2telegram_html import TagPass
 
 
 @pytest.fixture
@@ -128,3 +135,67 @@ def test_steam2telegram_html_p_with_strike_tag(steam2telegram_html):
     steam2telegram_html.text = '[p][strike]text[/strike][/p]'
     expected = 'text'
     assert steam2telegram_html.parse() == expected
+
+
+def test_steam2telegram_html_strips_trailing_whitespace(steam2telegram_html):
+    steam2telegram_html.text = 'first \t\nsecond\xa0\n\n\n\nlast '
+    expected = 'first\nsecond\n\nlast '
+    assert steam2telegram_html.parse() == expected
+
+
+def _reference_paragraphs(text):
+    # PRE_PARSER_FORMAT before the paragraphs were rewritten in one scan
+    text = re.sub(r'\[p\]\[/p\]', '\n', text, flags=re.IGNORECASE)
+    return re.sub(r'\[p\](.*?)\[/p\]', r'\1', text, flags=re.IGNORECASE | re.DOTALL)
+
+
+def _reference_headings(text):
+    # STEAM_FORMAT before the headings were rewritten in one scan
+    for tag in ("h2", "h3", "h4", "h5"):
+        text = re.sub(rf'\[{tag}\](.*?)\[/{tag}\]', r'\n\n<b>\1</b>\n\n', text, flags=re.IGNORECASE | re.DOTALL)
+    return text
+
+
+TAG_CORPUS = [
+    '',
+    'no tags',
+    '[p]a[/p][p][/p][P]b[/p]',
+    '[p]a[p]b[/p]c[/p]',
+    '[p]unclosed [p]x',
+    '[/p]x[p]y',
+    '[p]x[p][/p]y[/p]',
+    '[p]multi\nline[/p]',
+    '[h2]a[/h2][h3]b[/H3][H4]c[/h4][h5]d[/h5]',
+    '[h2]a[h3]b[/h3]c[/h2]',
+    '[h3]a[h2]b[/h3]c[/h2]',
+    '[h2]a[h2]b[/h2]c[/h2]',
+    '[h2]open [h5]x[/h2]',
+    '[h6]not a heading[/h6] [h2 ]x[/h2]',
+]
+
+
+@pytest.mark.parametrize("text", TAG_CORPUS)
+def test_paragraph_pass_matches_reference(text):
+    assert PARAGRAPH_PASS.sub(text) == _reference_paragraphs(text)
+
+
+@pytest.mark.parametrize("text", TAG_CORPUS)
+def test_heading_pass_matches_reference(text):
+    assert HEADING_PASS.sub(text) == _reference_headings(text)
+
+
+@pytest.mark.parametrize("filepath", sorted(Path("tests/data").glob("*.json")))
+def test_tag_passes_match_reference_on_posts(filepath):
+    text = json.loads(filepath.read_text(encoding="utf-8"))["contents"]
+    assert PARAGRAPH_PASS.sub(text) == _reference_paragraphs(text)
+    assert HEADING_PASS.sub(text) == _reference_headings(text)
+
+
+def test_tag_pass_literal_wins_over_tag():
+    tag_pass = TagPass(tags={"b": ("<b>", "</b>")}, literals={"[b][/b]": ""})
+    assert tag_pass.sub("[b][/b][B]x[/b]") == "<b>x</b>"
+
+
+def test_tag_pass_literal_without_bracket():
+    with pytest.raises(ValueError):
+        TagPass(tags={"b": ("<b>", "</b>")}, literals={"&nbsp;": " "})
@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+import json
+import random
+from pathlib import Path
+
+import bbcode
 import pytest
 
 from cs2posts.parser.steam_list import SteamListParser
@@ -32,3 +37,71 @@ def test_steam_list_parser_empty_list_item(steam_list_parser):
     steam_list_parser.text = """<li></li>Inferno"""
     expected = "• Inferno"
     assert steam_list_parser.parse() == expected
+
+
+def _reference_parse(text):
+    # The character by character implementation the parser replaced.
+    i = 0
+    nested_lvl = 0
+    modified_str = ""
+    while i < len(text):
+        if text.startswith("<ul>", i):
+            modified_str += "" if nested_lvl > 0 else "\n"
+            i += len("<ul>")
+            nested_lvl += 1
+            continue
+        if text.startswith("<li>", i):
+            space = " " * (nested_lvl - 1) * 4 if nested_lvl > 1 else ""
+            tag = "◦" if nested_lvl > 1 else "•"
+            modified_str += f"{space}{tag} "
+            i += len("<li></li>") if text.startswith("<li></li>", i) else len("<li>")
+            continue
+        if text.startswith("</li>", i):
+            modified_str += "\n"
+            i += len("</li>")
+            continue
+        if text.startswith("</ul>", i):
+            modified_str += "" if nested_lvl > 1 else "\n"
+            nested_lvl -= 1
+            i += len("</ul>")
+            continue
+        modified_str += text[i]
+        i += 1
+    return modified_str
+
+
+PATCH_NOTES = [
+    "[ UI ]\n[list]\n[*]Fixed cases where there was a visible delay loading map images in the Play menu\n"
+    "[*]Fixed a bug where items that can't be equipped were visible in the Loadout menu\n"
+    "[*]Fixed a bug where loadout items couldn't be unequipped\n[/list]\n"
+    "[ MAPS ]\n[i]Ancient:[/i][list]\n"
+    "[*]Added simplified grenade collisions to corner trims and central pillar on B site\n[/list]\n"
+    "[i]Anubis:[/i][list]\n[*]Adjusted clipping at A site steps between Walkway and Heaven\n[/list]",
+    "[ GAMEPLAY ]\n[list]\n[*]Smokes\n[list]\n[*]Reduced the duration by 2 seconds\n"
+    "[*]Fixed a bug where smokes could be seen through\n[list][*]On Mirage[/list]\n[/list]\n"
+    "[*][/*]\n[*]Molotovs\n[list][*][/*][/list]\n[/list]",
+]
+
+
+def _corpus():
+    data_dir = Path(__file__).parent.parent / "data"
+    for filepath in sorted(data_dir.glob("*.json")):
+        contents = json.loads(filepath.read_text(encoding="utf-8"))["contents"]
+        yield filepath.name, contents
+        yield filepath.name, bbcode.render_html(contents)
+    for i, notes in enumerate(PATCH_NOTES):
+        yield f"patch notes {i}", bbcode.render_html(notes)
+
+
+def test_steam_list_parser_matches_reference_on_corpus():
+    for name, text in _corpus():
+        assert SteamListParser(text).parse() == _reference_parse(text), name
+
+
+def test_steam_list_parser_matches_reference_on_random_tags():
+    # Unbalanced and stray tags included, the nesting level may go negative.
+    rng = random.Random(730)
+    pieces = ["<ul>", "</ul>", "<li>", "</li>", "<li></li>", "<", "li>", "text", "\n", " "]
+    for _ in range(500):
+        text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 30)))
+        assert SteamListParser(text).parse() == _reference_parse(text), text
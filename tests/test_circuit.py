@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import pytest
+
+from cs2posts.circuit import CircuitBreaker
+from cs2posts.circuit import CircuitOpenError
+from cs2posts.circuit import CircuitState
+
+
+class FakeClock:
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker('test', failure_threshold=3, base_delay=5, max_delay=60, clock=clock, jitter=lambda: 1.0)
+
+
+def test_circuit_breaker_invalid_args():
+    with pytest.raises(ValueError):
+        CircuitBreaker(failure_threshold=0)
+    with pytest.raises(ValueError):
+        CircuitBreaker(base_delay=10, max_delay=5)
+
+
+def test_circuit_breaker_opens_after_threshold(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.allow()
+
+    breaker.record_failure()
+
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.failures == 3
+    assert breaker.opened_since == breaker.last_failure
+    assert breaker.retry_in == 5
+    assert not breaker.allow()
+    with pytest.raises(CircuitOpenError) as exc_info:
+        breaker.check()
+    assert exc_info.value.retry_in == 5
+
+
+def test_circuit_breaker_success_resets_failures(breaker):
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.failures == 1
+    assert breaker.last_success is not None
+
+
+def test_circuit_breaker_half_open_closes_on_success(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+
+    clock.now += 5
+    assert breaker.allow()
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert breaker.retry_in == 0
+
+    breaker.record_success()
+
+    assert breaker.is_closed
+    assert breaker.failures == 0
+    assert breaker.opened_since is None
+
+
+def test_circuit_breaker_half_open_reopens_with_backoff(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    opened_since = breaker.opened_since
+
+    delays = []
+    for _ in range(6):
+        delays.append(breaker.retry_in)
+        clock.now += breaker.retry_in
+        assert breaker.allow()
+        breaker.record_failure()
+
+    assert delays == [5, 10, 20, 40, 60, 60]
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.opened_since == opened_since
+
+
+def test_circuit_breaker_jitter(clock):
+    breaker = CircuitBreaker(failure_threshold=1, base_delay=10, clock=clock, jitter=lambda: 0.0)
+    breaker.record_failure()
+    assert breaker.retry_in == 5
@@ -1,24 +1,28 @@
 from __future__ import annotations
 
 import json
-from unittest.mock import patch
+from unittest.mock import Mock
 
+import httpx
 import pytest
 import pytest_asyncio
 
+from cs2posts.circuit import CircuitBreaker
+from cs2posts.circuit import CircuitOpenError
+from cs2posts.circuit import CircuitState
 from cs2posts.crawler import CounterStrike2Crawler
-from cs2posts.crawler import CRAWLER_REQUEST_TIMEOUT
+from cs2posts.dto.post import Post
 
 
-@pytest.fixture
-def crawler():
-    return CounterStrike2Crawler()
+def create_crawler(handler) -> CounterStrike2Crawler:
+    return CounterStrike2Crawler(httpx.AsyncClient(transport=httpx.MockTransport(handler)))
 
 
 @pytest_asyncio.fixture
-def mock_get():
-    with patch('requests.get') as mock_get:
-        yield mock_get
+async def crawler():
+    crawler = CounterStrike2Crawler()
+    yield crawler
+    await crawler.aclose()
 
 
 def test_crawler_input_args_not_valid(crawler):
@@ -27,42 +31,288 @@ def test_crawler_input_args_not_valid(crawler):
 
 
 @pytest.mark.asyncio
-async def test_crawler_input_args_valid(crawler, mock_get):
+async def test_crawler_input_args_valid():
     expected_count = 100
-    mock_get.return_value.ok = True
-    mock_get.return_value.text = '{"foo": "bar"}'
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"foo": "bar"})
+
+    crawler = create_crawler(handler)
     await crawler.crawl(count=expected_count)
-    mock_get.assert_called_once_with(
-        crawler.url % expected_count, timeout=CRAWLER_REQUEST_TIMEOUT)
+
+    assert len(requests) == 1
+    assert str(requests[0].url) == crawler.url % expected_count
+    await crawler.aclose()
 
 
 @pytest.mark.asyncio
-async def test_crawler_receives_data(crawler, mock_get):
-    mock_get.return_value.ok = True
-    mock_get.return_value.text = '{"foo": "bar"}'
+async def test_crawler_receives_data():
+    crawler = create_crawler(lambda request: httpx.Response(200, json={"foo": "bar"}))
     result = await crawler.crawl()
     assert result == {"foo": "bar"}
+    await crawler.aclose()
 
 
 @pytest.mark.asyncio
-async def test_crawler_raises_exception_on_timeout(crawler, mock_get):
-    mock_get.side_effect = TimeoutError
-    with pytest.raises(TimeoutError):
+async def test_crawler_raises_exception_on_timeout():
+    def handler(request):
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    crawler = create_crawler(handler)
+    with pytest.raises(httpx.TimeoutException):
         await crawler.crawl()
+    await crawler.aclose()
 
 
 @pytest.mark.asyncio
-async def test_crawler_raises_exception_on_bad_response(crawler, mock_get):
-    mock_get.return_value.ok = False
-    mock_get.return_value.status_code = 404
-    with pytest.raises(Exception):
+async def test_crawler_raises_exception_on_bad_response():
+    crawler = create_crawler(lambda request: httpx.Response(404))
+    with pytest.raises(RuntimeError):
         await crawler.crawl()
+    await crawler.aclose()
 
 
 @pytest.mark.asyncio
-async def test_crawler_raises_exception_on_invalid_json(crawler, mock_get):
-    mock_get.return_value.ok = True
-    mock_get.return_value.text = "not valid json"
-
+async def test_crawler_raises_exception_on_invalid_json():
+    crawler = create_crawler(lambda request: httpx.Response(200, text="not valid json"))
     with pytest.raises(json.JSONDecodeError):
         await crawler.crawl()
+    await crawler.aclose()
+
+
+@pytest.mark.asyncio
+async def test_crawler_sends_conditional_request():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200, json={"foo": "bar"},
+            headers={"etag": '"v1"', "last-modified": "Wed, 01 Oct 2025 10:00:00 GMT"})
+
+    crawler = create_crawler(handler)
+
+    assert await crawler.crawl(count=10) == {"foo": "bar"}
+    assert await crawler.crawl(count=10) is None
+
+    assert "if-none-match" not in requests[0].headers
+    assert requests[1].headers["if-none-match"] == '"v1"'
+    assert requests[1].headers["if-modified-since"] == "Wed, 01 Oct 2025 10:00:00 GMT"
+    await crawler.aclose()
+
+
+@pytest.mark.asyncio
+async def test_crawler_validators_are_per_count():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={}, headers={"etag": '"v1"'})
+
+    crawler = create_crawler(handler)
+
+    await crawler.crawl(count=10)
+    await crawler.crawl(count=100)
+
+    assert "if-none-match" not in requests[1].headers
+    await crawler.aclose()
+
+
+@pytest.mark.asyncio
+async def test_crawler_invalidate_fetches_full_feed():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if "if-none-match" in request.headers:
+            return httpx.Response(304)
+        return httpx.Response(200, json={"foo": "bar"}, headers={"etag": '"v1"'})
+
+    crawler = create_crawler(handler)
+
+    await crawler.crawl()
+    crawler.invalidate()
+
+    assert await crawler.crawl() == {"foo": "bar"}
+    assert "if-none-match" not in requests[1].headers
+    await crawler.aclose()
+
+
+@pytest.mark.asyncio
+async def test_crawler_reuses_client():
+    crawler = create_crawler(lambda request: httpx.Response(200, json={}))
+    client = crawler.client
+
+    await crawler.crawl()
+    await crawler.crawl()
+
+    assert crawler.client is client
+    await crawler.aclose()
+
+
+def create_feed(dates):
+    return [{"gid": str(i), "date": date} for i, date in enumerate(dates)]
+
+
+def feed_handler(feed, requests):
+    def handler(request):
+        requests.append(request)
+        count = int(request.url.params["count"])
+        enddate = request.url.params.get("enddate")
+        items = [item for item in feed if enddate is None or item["date"] <= int(enddate)]
+        return httpx.Response(200, json={"appnews": {"appid": 730, "newsitems": items[:count]}})
+    return handler
+
+
+def known_post(item):
+    return Mock(spec=Post, gid=item["gid"], date=item["date"])
+
+
+@pytest.mark.asyncio
+async def test_crawler_crawl_new_stops_at_known_post():
+    feed = create_feed(range(100, 0, -1))
+    requests = []
+    crawler = create_crawler(feed_handler(feed, requests))
+
+    items = [item async for item in crawler.crawl_new(known_post(feed[3]))]
+
+    assert items == feed[:3]
+    assert len(requests) == 1
+    await crawler.aclose()
+
+
+@pytest.mark.asyncio
+async def test_crawler_crawl_new_pages_back_after_outage():
+    feed = create_feed(range(100, 0, -1))
+    requests = []
+    crawler = create_crawler(feed_handler(feed, requests))
+
+    items = [item async for item in crawler.crawl_new(known_post(feed[42]), page_size=10)]
+
+    assert items == feed[:42]
+    assert len(requests) == 5
+    assert "enddate" not in requests[0].url.params
+    assert requests[1].url.params["enddate"] == str(feed[9]["date"])
+    await crawler.aclose()
+
+
+@pytest.mark.asyncio
+async def test_crawler_crawl_new_stops_at_older_post():
+    feed = create_feed([50, 40, 30, 20])
+    crawler = create_crawler(feed_handler(feed, []))
+
+    # The known post is not part of the feed anymore.
+    items = [item async for item in crawler.crawl_new(Mock(spec=Post, gid="deleted", date=35))]
+
+    assert items == feed[:2]
+    await crawler.aclose()
+
+
+@pytest.mark.asyncio
+async def test_crawler_crawl_new_skips_items_of_same_second():
+    feed = create_feed([50, 40, 40, 40, 40, 30])
+    requests = []
+    crawler = create_crawler(feed_handler(feed, requests))
+
+    items = [item async for item in crawler.crawl_new(page_size=2)]
+
+    assert items == feed
+    assert [request.url.params["count"] for request in requests] == ["2", "2", "4", "8"]
+    await crawler.aclose()
+
+
+@pytest.mark.asyncio
+async def test_crawler_crawl_new_limit():
+    feed = create_feed(range(100, 0, -1))
+    crawler = create_crawler(feed_handler(feed, []))
+
+    items = [item async for item in crawler.crawl_new(page_size=7, limit=20)]
+
+    assert items == feed[:20]
+    await crawler.aclose()
+
+
+@pytest.mark.asyncio
+async def test_crawler_crawl_new_not_modified():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if "if-none-match" in request.headers:
+            return httpx.Response(304)
+        return httpx.Response(200, json={"appnews": {"newsitems": []}}, headers={"etag": '"v1"'})
+
+    crawler = create_crawler(handler)
+
+    assert [item async for item in crawler.crawl_new()] == []
+    assert [item async for item in crawler.crawl_new()] == []
+    assert requests[1].headers["if-none-match"] == '"v1"'
+    await crawler.aclose()
+
+
+@pytest.mark.asyncio
+async def test_crawler_crawl_new_page_size_not_valid(crawler):
+    with pytest.raises(ValueError):
+        [item async for item in crawler.crawl_new(page_size=0)]
+
+
+@pytest.mark.asyncio
+async def test_crawler_open_circuit_skips_requests():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(503)
+
+    breaker = CircuitBreaker(failure_threshold=2)
+    crawler = CounterStrike2Crawler(httpx.AsyncClient(transport=httpx.MockTransport(handler)), breaker)
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            await crawler.crawl()
+    with pytest.raises(CircuitOpenError):
+        await crawler.crawl()
+    with pytest.raises(CircuitOpenError):
+        [item async for item in crawler.crawl_new()]
+
+    assert len(requests) == 2
+    assert breaker.state is CircuitState.OPEN
+    await crawler.aclose()
+
+
+@pytest.mark.asyncio
+async def test_crawler_half_open_circuit_probes_before_crawling():
+    requests = []
+    available = False
+
+    def handler(request):
+        requests.append(request)
+        if not available:
+            raise httpx.ConnectError("connection refused")
+        return httpx.Response(200, json={"foo": "bar"})
+
+    clock = Mock(return_value=0.0)
+    breaker = CircuitBreaker(failure_threshold=1, base_delay=5, clock=clock, jitter=lambda: 1.0)
+    crawler = CounterStrike2Crawler(httpx.AsyncClient(transport=httpx.MockTransport(handler)), breaker)
+
+    with pytest.raises(httpx.ConnectError):
+        await crawler.crawl()
+
+    # The probe fails, no crawl is attempted
+    clock.return_value = 5.0
+    with pytest.raises(httpx.ConnectError):
+        await crawler.crawl()
+    assert requests[-1].url == CounterStrike2Crawler.PROBE_URL
+    assert breaker.retry_in == 10
+
+    available = True
+    clock.return_value = 15.0
+    assert await crawler.crawl() == {"foo": "bar"}
+
+    assert [request.url.params["count"] for request in requests] == ["100", "1", "1", "100"]
+    assert breaker.is_closed
+    await crawler.aclose()
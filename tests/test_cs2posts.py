@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 from copy import deepcopy
+from unittest.mock import AsyncMock
 from unittest.mock import patch
 
 import pytest
 
 from cs2posts.cs2posts import CounterStrike2Posts
+from cs2posts.dto.post import Post
+from cs2posts.dto.post import PostType
 
 
 @pytest.fixture
@@ -134,9 +137,10 @@ def cs2_posts_with_unknown_feed_type(crawler_data_with_unknown_feed_type):
     return CounterStrike2Posts(crawler_data_with_unknown_feed_type)
 
 
-def test_cs2_validate_replace_steam_clan_image_url(cs2_posts_steam_clan_image):
-    with patch("cs2posts.utils.is_valid_url", return_value=True):
-        cs2_posts_steam_clan_image.validate()
+@pytest.mark.asyncio
+async def test_cs2_validate_replace_steam_clan_image_url(cs2_posts_steam_clan_image):
+    with patch("cs2posts.resolver.UrlResolver.is_valid", new_callable=AsyncMock, return_value=True):
+        await cs2_posts_steam_clan_image.validate()
     expected = "https://clan.akamai.steamstatic.com/images"
     assert cs2_posts_steam_clan_image.posts[0].contents == expected
 
@@ -263,3 +267,59 @@ def test_cs2_net_posts_json(cs2_posts):
             'tags': ['patchnotes']
         }
     ]
+
+
+def test_cs2_net_get_by_gid(cs2_posts):
+    post = cs2_posts.get("5124585319846885283")
+    assert post is cs2_posts.latest_update_post
+    assert cs2_posts.get("does-not-exist") is None
+
+    assert "5124585319846885283" in cs2_posts
+    assert post in cs2_posts
+    assert "does-not-exist" not in cs2_posts
+    assert None not in cs2_posts
+
+
+def test_cs2_net_posts_of_type(cs2_posts_with_external):
+    for post_type in (PostType.NEWS, PostType.UPDATE, PostType.EXTERNAL):
+        posts = cs2_posts_with_external.posts_of_type(post_type)
+        assert all(post.get_type() == post_type for post in posts)
+        assert cs2_posts_with_external.latest_of_type(post_type) is posts[0]
+        assert cs2_posts_with_external.oldest_of_type(post_type) is posts[-1]
+    assert cs2_posts_with_external.latest_of_type(PostType.UNKNOWN) is None
+
+
+def test_cs2_net_classifies_each_post_once(crawler_data_with_external):
+    with patch("cs2posts.cs2posts.Post.get_type", autospec=True, side_effect=Post.get_type) as mock_get_type:
+        cs2_posts = CounterStrike2Posts(crawler_data_with_external)
+        for _ in range(10):
+            cs2_posts.latest_news_post
+            cs2_posts.latest_update_post
+            cs2_posts.latest_external_post
+            cs2_posts.is_latest_post_external()
+
+    assert mock_get_type.call_count == len(cs2_posts)
+
+
+def test_cs2_net_posts_before_cs2_are_not_typed_views(crawler_data):
+    data = deepcopy(crawler_data)
+    data["appnews"]["newsitems"][0]["date"] = CounterStrike2Posts.INITIAL_EPOCH_TIME_CS2 - 1
+    cs2_posts = CounterStrike2Posts(data)
+
+    assert len(cs2_posts) == 2
+    assert cs2_posts.news_posts == []
+    assert cs2_posts.get(data["appnews"]["newsitems"][0]["gid"]) is not None
+
+
+def test_cs2_net_external_patchnotes_post_is_external_and_update(crawler_data):
+    data = deepcopy(crawler_data)
+    data["appnews"]["newsitems"][0]["feed_type"] = 0
+    data["appnews"]["newsitems"][1]["feed_type"] = 0
+    data["appnews"]["newsitems"][1]["date"] = 1693524158
+    cs2_posts = CounterStrike2Posts(data)
+
+    assert [post.gid for post in cs2_posts.external_posts] == ["5124585319846885283", "5141476355659151610"]
+    assert cs2_posts.latest_external_post.gid == "5124585319846885283"
+    assert cs2_posts.is_latest_post_external()
+    assert cs2_posts.latest_update_post.gid == "5124585319846885283"
+    assert cs2_posts.is_latest_post_update()
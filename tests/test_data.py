@@ -11,6 +11,9 @@ from cs2posts.content.content import TextBlock
 from cs2posts.content.content import Video
 from cs2posts.dto.post import Post
 from cs2posts.msg import create_message
+from cs2posts.msg.factory import build_message
+
+pytestmark = pytest.mark.usefixtures("mocked_resolver")
 
 
 def load_data(type: str, date: str) -> Post:
@@ -87,3 +90,10 @@ async def test_news_2024_11_13():
     assert actual_values[TextBlock.__name__] == expected_text_blocks
     assert actual_values[Image.__name__] == expected_image_blocks
     assert actual_values[Video.__name__] == expected_video_blocks
+
+
+def test_update_2024_04_16():
+    post = load_data("update", "2024-04-16")
+    msg = build_message(post, post.url)
+    assert "<b>[ MISC ]</b>\n\n• Fixed a bug where bomb can sometimes disappear from the radar\n" in msg.message
+    assert msg.message.count("• ") == 4
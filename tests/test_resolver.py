@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from cs2posts.resolver import close_resolver
+from cs2posts.resolver import get_resolver
+from cs2posts.resolver import TTLCache
+from cs2posts.resolver import UrlResolver
+
+
+def create_resolver(handler, **kwargs) -> UrlResolver:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler), follow_redirects=True)
+    return UrlResolver(client, **kwargs)
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert len(cache) == 2
+
+
+def test_ttl_cache_expires_entries():
+    cache = TTLCache(maxsize=2, ttl=10)
+    with patch('cs2posts.resolver.time.monotonic', return_value=100.0):
+        cache.put("a", 1)
+    with patch('cs2posts.resolver.time.monotonic', return_value=109.0):
+        assert cache.get("a") == 1
+    with patch('cs2posts.resolver.time.monotonic', return_value=110.0):
+        assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_rejects_invalid_size():
+    with pytest.raises(ValueError):
+        TTLCache(maxsize=0, ttl=10)
+
+
+@pytest.mark.asyncio
+async def test_url_resolver_is_valid():
+    def handler(request):
+        return httpx.Response(200 if request.url.path == "/ok" else 404)
+
+    resolver = create_resolver(handler)
+
+    assert await resolver.is_valid("https://example.com/ok")
+    assert not await resolver.is_valid("https://example.com/missing")
+    assert not await resolver.is_valid("example.com/ok")
+    assert not await resolver.is_valid(None)
+    await resolver.aclose()
+
+
+@pytest.mark.asyncio
+async def test_url_resolver_resolve_follows_redirects():
+    def handler(request):
+        if request.url.path == "/short":
+            return httpx.Response(301, headers={"location": "https://example.com/long"})
+        return httpx.Response(200)
+
+    resolver = create_resolver(handler)
+
+    assert await resolver.resolve("https://example.com/short") == "https://example.com/long"
+    await resolver.aclose()
+
+
+@pytest.mark.asyncio
+async def test_url_resolver_falls_back_to_get():
+    methods = []
+
+    def handler(request):
+        methods.append(request.method)
+        return httpx.Response(405 if request.method == "HEAD" else 200)
+
+    resolver = create_resolver(handler)
+
+    assert await resolver.is_valid("https://example.com")
+    assert methods == ["HEAD", "GET"]
+    await resolver.aclose()
+
+
+@pytest.mark.asyncio
+async def test_url_resolver_caches_positive_and_negative_results():
+    requests = []
+
+    def handler(request):
+        requests.append(request.url.path)
+        return httpx.Response(200 if request.url.path == "/ok" else 404)
+
+    resolver = create_resolver(handler)
+
+    for _ in range(3):
+        assert await resolver.is_valid("https://example.com/ok")
+        assert not await resolver.is_valid("https://example.com/missing")
+
+    assert requests == ["/ok", "/missing"]
+    await resolver.aclose()
+
+
+@pytest.mark.asyncio
+async def test_url_resolver_negative_entries_expire_first():
+    requests = []
+
+    def handler(request):
+        requests.append(request.url.path)
+        return httpx.Response(404)
+
+    resolver = create_resolver(handler, ttl=3600, negative_ttl=10)
+
+    with patch('cs2posts.resolver.time.monotonic', return_value=100.0):
+        assert not await resolver.is_valid("https://example.com/missing")
+    with patch('cs2posts.resolver.time.monotonic', return_value=111.0):
+        assert not await resolver.is_valid("https://example.com/missing")
+
+    assert len(requests) == 2
+    await resolver.aclose()
+
+
+@pytest.mark.asyncio
+async def test_url_resolver_does_not_cache_transient_failure():
+    calls = 0
+
+    def handler(request):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise httpx.ConnectError("connection refused")
+        return httpx.Response(200)
+
+    resolver = create_resolver(handler)
+
+    assert not await resolver.is_valid("https://example.com")
+    assert await resolver.is_valid("https://example.com")
+    await resolver.aclose()
+
+
+@pytest.mark.asyncio
+async def test_url_resolver_deduplicates_in_flight_lookups():
+    calls = 0
+
+    async def handler(request):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return httpx.Response(200)
+
+    resolver = create_resolver(handler)
+
+    results = await asyncio.gather(*(resolver.is_valid("https://example.com") for _ in range(10)))
+
+    assert all(results)
+    assert calls == 1
+    await resolver.aclose()
+
+
+@pytest.mark.asyncio
+async def test_url_resolver_validate_many_runs_in_parallel():
+    running = 0
+    max_running = 0
+
+    async def handler(request):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return httpx.Response(200)
+
+    resolver = create_resolver(handler)
+    urls = [f"https://example.com/{i}.png" for i in range(30)]
+
+    results = await resolver.validate_many(urls + [urls[0], None])
+
+    assert len(results) == 31
+    assert all(results[url] for url in urls)
+    assert results[None] is False
+    assert max_running == 30
+    await resolver.aclose()
+
+
+@pytest.mark.asyncio
+async def test_get_resolver_is_shared_per_event_loop():
+    resolver = get_resolver()
+    assert get_resolver() is resolver
+
+    await close_resolver()
+    assert get_resolver() is not resolver
+    await close_resolver()
+
+
+@pytest.mark.asyncio
+async def test_url_resolver_resolve_steam_clan_images_probes_host_once():
+    requests = []
+
+    def handler(request):
+        requests.append(str(request.url))
+        return httpx.Response(200)
+
+    resolver = create_resolver(handler)
+    text = "".join(f'[img src="{{STEAM_CLAN_IMAGE}}/{i}.png"][/img]' for i in range(40))
+
+    results = await asyncio.gather(
+        resolver.resolve_steam_clan_images(text),
+        resolver.resolve_steam_clan_images('[img]{STEAM_CLAN_IMAGE}/other.png[/img]'))
+
+    assert "{STEAM_CLAN_IMAGE}" not in "".join(results)
+    assert 'src="https://clan.akamai.steamstatic.com/images/39.png"' in results[0]
+    assert requests == ["https://clan.akamai.steamstatic.com/images/0.png"]
+    await resolver.aclose()
+
+
+@pytest.mark.asyncio
+async def test_url_resolver_resolve_steam_clan_images_falls_back_to_next_host():
+    def handler(request):
+        return httpx.Response(503 if "akamai" in request.url.host else 200)
+
+    resolver = create_resolver(handler)
+
+    text = await resolver.resolve_steam_clan_images("{STEAM_CLAN_IMAGE}/foo/bar.png")
+
+    assert text == "https://clan.fastly.steamstatic.com/images/foo/bar.png"
+    await resolver.aclose()
+
+
+@pytest.mark.asyncio
+async def test_url_resolver_resolve_steam_clan_images_skips_broken_image():
+    requests = []
+
+    def handler(request):
+        requests.append(str(request.url))
+        return httpx.Response(404 if request.url.path.endswith("/0.png") else 200)
+
+    resolver = create_resolver(handler)
+    text = "".join(f'[img src="{{STEAM_CLAN_IMAGE}}/{i}.png"][/img]' for i in range(3))
+
+    result = await resolver.resolve_steam_clan_images(text)
+
+    assert 'src="https://clan.akamai.steamstatic.com/images/0.png"' in result
+    assert requests == [
+        "https://clan.akamai.steamstatic.com/images/0.png",
+        "https://clan.fastly.steamstatic.com/images/0.png",
+        "https://clan.akamai.steamstatic.com/images/1.png",
+    ]
+    await resolver.aclose()
+
+
+@pytest.mark.asyncio
+async def test_url_resolver_resolve_steam_clan_images_no_healthy_host():
+    calls = 0
+
+    def handler(request):
+        nonlocal calls
+        calls += 1
+        if calls <= 2:
+            raise httpx.ConnectError("connection refused")
+        return httpx.Response(200)
+
+    resolver = create_resolver(handler)
+    text = "{STEAM_CLAN_IMAGE}/foo/bar.png"
+
+    assert await resolver.resolve_steam_clan_images(text) == text
+    # The failed host selection is not cached, the next post probes again.
+    assert await resolver.resolve_steam_clan_images(text) == "https://clan.akamai.steamstatic.com/images/foo/bar.png"
+    await resolver.aclose()
+
+
+@pytest.mark.asyncio
+async def test_url_resolver_resolve_steam_clan_images_without_placeholder():
+    def handler(request):
+        raise AssertionError("no request expected")
+
+    resolver = create_resolver(handler)
+
+    assert await resolver.resolve_steam_clan_images("plain text") == "plain text"
+    await resolver.aclose()